@@ -0,0 +1,592 @@
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+import copy
+import itertools as i
+import random
+import time
+from belief import HandBelief
+from bitcards import to_mask
+from budget import fit_memory
+from cache import DecisionCache, decision_key
+from determinization import (
+    confidence_z,
+    enumerate_hands,
+    sample_hands,
+    votes_separated,
+)
+from ponder import Ponderer
+from rules import greedy_move
+from settings import AISettings
+from stats import SearchStats
+from symmetry import ColorSymmetry
+import ismcts
+import search
+
+
+class ComputerAI:
+    """
+    Decision logic of the computer player over bitmask hands, independent of the game runner.
+
+    Attributes:
+        settings (AISettings): Settings of the computer player.
+        rng (random.Random): Random number generator of the computer player.
+        executor (ProcessPoolExecutor | None): Process pool for parallel search, created on first use.
+        stats (SearchStats | None): Statistics of the last computer turn, None unless settings.stats is on.
+        cache (DecisionCache | None): Decisions of earlier turns, opened on first use.
+        ponderer (Ponderer | None): Background search of the next turn, None unless settings.ponder is on.
+        memory_reductions (list[str]): Settings lowered to fit settings.max_memory, see budget.fit_memory.
+        searchers (list[search.Searcher]): Searchers of the last computer turn.
+        unseen (int | None): Bitmask of the human hand and the card pack of the last computer turn, see search.Searcher.unseen.
+        fallback (str | None): "best_so_far" or "greedy" if the last computer turn ran out of settings.max_nodes or time.
+        interrupted (bool): True if the deadline or the node budget cut the last computer turn short, its move depends on how far the search got.
+    """
+
+    def __init__(self, settings: AISettings | None = None) -> None:
+        """
+        Initialize the ComputerAI object.
+
+        Args:
+            settings (AISettings | None, optional): Settings of the computer player. Defaults to AISettings().
+        """
+        self.settings, self.memory_reductions = fit_memory(settings or AISettings())
+        self.rng = random.Random(self.settings.seed)
+        self.executor = None
+        self.stats = None
+        self.cache = None
+        self.ponderer = None
+        self.searchers = []
+        self.unseen = None
+        self.fallback = None
+        self.interrupted = False
+        if self.settings.ponder:
+            settings = copy.copy(self.settings)
+            # The thread searches alone, without processes, cache or statistics.
+            settings.ponder = False
+            settings.workers = 1
+            settings.cache_path = None
+            settings.stats = False
+            settings.stats_log = None
+            self.ponderer = Ponderer(self.settings, lambda: ComputerAI(settings))
+
+    def choose_move(
+        self,
+        comp_hand: int,
+        top: int,
+        is_active: bool,
+        human_hand: int | None = None,
+        unseen_cards: list[str] | None = None,
+        human_count: int = 0,
+        belief: HandBelief | None = None,
+        stacking: int = 0,
+    ) -> tuple[int, int] | None:
+        """
+        Decides the computer player's move.
+
+        With a known human hand (hard mode) that hand is searched, otherwise (easy mode)
+        the votes of hypothetical hands built from unseen_cards decide. Hard mode positions
+        with at most settings.solver_cards cards are searched to the end first and a
+        forced win or loss found there is played, other positions are searched as usual.
+        With settings.engine "ismcts" ISMCTS decides instead, see ismcts_move.
+
+        Without a time budget every hand is searched to settings.depth. With a time budget
+        all hands are searched at depth 1, 2, ... up to settings.max_depth and the votes of
+        the deepest completed pass decide, the first pass counts even when interrupted.
+        When settings.max_nodes run out, the best move found so far is played, the greedy
+        move if there is none, and fallback tells which.
+
+        Args:
+            comp_hand (int): Bitmask of computer player's cards.
+            top (int): Index of the top card.
+            is_active (bool): Was last card an active card? True if yes.
+            human_hand (int | None, optional): Bitmask of human player's cards if known. Defaults to None.
+            unseen_cards (list[str] | None, optional): Cards the human player could be holding or drawing, the human hand and the card pack. Hard mode only takes the card pack from them. Defaults to None.
+            human_count (int, optional): Amount of cards in human player's hand. Defaults to 0.
+            belief (HandBelief | None, optional): Observed constraints of human player's hand. Defaults to None.
+            stacking (int, optional): Cards to take against an active "*7". Defaults to 0.
+
+        Returns:
+            (tuple[int, int] | None): Move to be played, None to take a card or stand a round.
+        """
+        settings = self.settings
+        self.fallback = None
+        self.interrupted = False
+        if not settings.stats:
+            return self._choose_move(
+                comp_hand,
+                top,
+                is_active,
+                human_hand,
+                unseen_cards,
+                human_count,
+                belief,
+                stacking,
+            )
+        self.stats = SearchStats()
+        start = time.perf_counter()
+        move = self._choose_move(
+            comp_hand,
+            top,
+            is_active,
+            human_hand,
+            unseen_cards,
+            human_count,
+            belief,
+            stacking,
+        )
+        self.stats.seconds = time.perf_counter() - start
+        self.stats.fallback = self.fallback
+        if settings.stats_log is not None:
+            self.stats.write_log(settings.stats_log, move)
+        return move
+
+    def _choose_move(
+        self,
+        comp_hand: int,
+        top: int,
+        is_active: bool,
+        human_hand: int | None,
+        unseen_cards: list[str] | None,
+        human_count: int,
+        belief: HandBelief | None,
+        stacking: int = 0,
+    ) -> tuple[int, int] | None:
+        """Looks the decision up in pondered answers and the decision cache, searches on a miss."""
+        cache = self.get_cache()
+        ponderer = self.ponderer
+        if cache is None and ponderer is None:
+            return self._search_move(
+                comp_hand,
+                top,
+                is_active,
+                human_hand,
+                unseen_cards,
+                human_count,
+                belief,
+                stacking,
+            )
+        key = decision_key(
+            self.settings,
+            comp_hand,
+            top,
+            is_active,
+            human_hand,
+            unseen_cards,
+            human_count,
+            belief,
+            stacking,
+        )
+        move = None if ponderer is None else ponderer.answer(key)
+        if move is not None:
+            if self.stats is not None:
+                self.stats.ponder_hits += 1
+            if cache is not None:
+                cache.put(key, move or None)
+            return move or None
+        if cache is not None:
+            move = cache.get(key)
+            if move is not None:
+                if self.stats is not None:
+                    self.stats.cache_hits += 1
+                return move or None
+        move = self._search_move(
+            comp_hand,
+            top,
+            is_active,
+            human_hand,
+            unseen_cards,
+            human_count,
+            belief,
+            stacking,
+        )
+        # Moves of a cut search depend on the deadline or the node count, not the position.
+        if cache is not None and self.fallback is None and not self.interrupted:
+            cache.put(key, move)
+        return move
+
+    def _search_move(
+        self,
+        comp_hand: int,
+        top: int,
+        is_active: bool,
+        human_hand: int | None,
+        unseen_cards: list[str] | None,
+        human_count: int,
+        belief: HandBelief | None,
+        stacking: int = 0,
+    ) -> tuple[int, int] | None:
+        """Searches the computer player's move, see choose_move."""
+        settings = self.settings
+        self.searchers = []
+        self.unseen = None if unseen_cards is None else to_mask(unseen_cards)
+        deadline = None
+        if settings.time_budget is not None:
+            deadline = time.time() + settings.time_budget
+        if settings.engine == "ismcts":
+            return self.ismcts_move(
+                comp_hand,
+                top,
+                is_active,
+                human_hand,
+                unseen_cards,
+                human_count,
+                belief,
+                stacking,
+                deadline,
+            )
+        if (
+            human_hand is not None
+            and comp_hand.bit_count() + human_hand.bit_count() <= settings.solver_cards
+        ):
+            # Timed out or inexact solutions fall back to the search below.
+            searcher = self.searcher(deadline)
+            try:
+                score, move = searcher.solve(
+                    comp_hand, human_hand, top, is_active, stacking
+                )
+                if search.is_solved(score):
+                    return move
+            except search.SearchTimeout:
+                if searcher.exhausted:
+                    return self.best_move(Counter(), comp_hand, top, is_active)
+
+        if deadline is None:
+            votes = self.vote(
+                comp_hand,
+                self.human_hands(human_hand, unseen_cards, human_count, belief),
+                top,
+                is_active,
+                settings.depth,
+                stacking=stacking,
+            )
+            return self.best_move(votes, comp_hand, top, is_active)
+
+        if human_hand is not None:
+            human_count = human_hand.bit_count()
+        max_depth = max(
+            1,
+            min(
+                settings.max_depth,
+                search.max_useful_depth(comp_hand.bit_count() + human_count),
+            ),
+        )
+        if human_hand is not None:
+            searcher = self.searcher(deadline)
+            _, move, completed = searcher.iterative_deepening(
+                comp_hand, human_hand, top, is_active, max_depth, stacking
+            )
+            self.interrupted = completed < max_depth
+            if searcher.exhausted:
+                self.fallback = "best_so_far"
+            return move
+
+        # One table for all passes, deeper passes find the best moves of shallower ones there.
+        searcher = self.searcher(deadline)
+        best_votes = None
+        for depth in range(1, max_depth + 1):
+            votes = self.vote(
+                comp_hand,
+                self.human_hands(human_hand, unseen_cards, human_count, belief),
+                top,
+                is_active,
+                depth,
+                deadline,
+                searcher,
+                stacking,
+            )
+            interrupted = searcher.exhausted or time.time() >= deadline
+            self.interrupted = self.interrupted or interrupted
+            if best_votes is not None and interrupted:
+                # The pass was interrupted, its votes are incomplete.
+                break
+            best_votes = votes
+            if interrupted:
+                break
+        return self.best_move(best_votes, comp_hand, top, is_active)
+
+    def searcher(self, deadline: float | None = None) -> search.Searcher:
+        """
+        Creates a searcher of the current computer turn.
+
+        Searchers of one turn share settings.max_nodes, a new one gets the nodes the
+        earlier ones left.
+
+        Args:
+            deadline (float | None, optional): time.time() after which the search stops. Defaults to None.
+
+        Returns:
+            search.Searcher: New searcher configured by the settings.
+        """
+        searcher = search.Searcher.from_settings(self.settings, deadline, self.stats)
+        searcher.unseen = self.unseen
+        if searcher.max_nodes is not None:
+            searcher.max_nodes -= sum(other.nodes for other in self.searchers)
+        self.searchers.append(searcher)
+        return searcher
+
+    def best_move(
+        self, votes: Counter, comp_hand: int, top: int, is_active: bool
+    ) -> tuple[int, int] | None:
+        """
+        Returns the most voted move, the greedy move if no hand was searched.
+
+        Sets fallback when a searcher of the turn ran out of nodes, or when the node
+        budget or the deadline was spent before the first vote.
+
+        Args:
+            votes (Counter): Votes for each move.
+            comp_hand (int): Bitmask of computer player's cards.
+            top (int): Index of the top card.
+            is_active (bool): Was last card an active card? True if yes.
+
+        Returns:
+            (tuple[int, int] | None): Move to be played, None to take a card or stand a round.
+        """
+        if votes:
+            if any(searcher.exhausted for searcher in self.searchers):
+                self.fallback = "best_so_far"
+            return votes.most_common(1)[0][0]
+        self.fallback = "greedy"
+        return greedy_move(comp_hand, top, is_active, True)
+
+    def ismcts_move(
+        self,
+        comp_hand: int,
+        top: int,
+        is_active: bool,
+        human_hand: int | None,
+        unseen_cards: list[str] | None,
+        human_count: int,
+        belief: HandBelief | None = None,
+        stacking: int = 0,
+        deadline: float | None = None,
+    ) -> tuple[int, int] | None:
+        """
+        Chooses the most visited move of ISMCTS, with settings.workers trees in parallel.
+
+        Sets fallback to "best_so_far" when settings.max_nodes stopped the iterations.
+
+        Args:
+            comp_hand (int): Bitmask of computer player's cards.
+            top (int): Index of the top card.
+            is_active (bool): Was last card an active card? True if yes.
+            human_hand (int | None): Bitmask of human player's cards if known.
+            unseen_cards (list[str] | None): Cards the human player could be holding.
+            human_count (int): Amount of cards in human player's hand.
+            belief (HandBelief | None, optional): Observed constraints of human player's hand. Defaults to None.
+            stacking (int, optional): Cards to take against an active "*7". Defaults to 0.
+            deadline (float | None, optional): time.time() after which the search stops. Defaults to None.
+
+        Returns:
+            (tuple[int, int] | None): Move to be played, None to take a card or stand a round.
+        """
+        settings = self.settings
+        if settings.workers > 1:
+            visits, exhausted = ismcts.ismcts_parallel(
+                self.get_executor(),
+                settings.workers,
+                self.rng,
+                settings,
+                comp_hand,
+                top,
+                is_active,
+                human_hand,
+                unseen_cards,
+                human_count,
+                belief,
+                stacking,
+                deadline,
+                self.stats,
+            )
+        else:
+            tree = ismcts.ISMCTS(settings, self.rng, self.stats)
+            visits = tree.search(
+                comp_hand,
+                top,
+                is_active,
+                human_hand,
+                unseen_cards,
+                human_count,
+                belief,
+                stacking,
+                deadline=deadline,
+            )
+            exhausted = tree.exhausted
+        if exhausted:
+            self.fallback = "best_so_far"
+        self.interrupted = sum(visits.values()) < settings.iterations
+        return visits.most_common(1)[0][0] if visits else None
+
+    def human_hands(
+        self,
+        human_hand: int | None,
+        unseen_cards: list[str] | None,
+        human_count: int,
+        belief: HandBelief | None = None,
+    ):
+        """
+        Returns the human hands to be searched, generated lazily.
+
+        When a time or node budget can cut the search short, exhaustive enumeration
+        runs in a random order, otherwise the searched hands would share the first
+        unseen cards.
+
+        Args:
+            human_hand (int | None): Bitmask of human player's cards if known.
+            unseen_cards (list[str] | None): Cards the human player could be holding.
+            human_count (int): Amount of cards in human player's hand.
+            belief (HandBelief | None, optional): Observed constraints of human player's hand. Defaults to None.
+
+        Returns:
+            Iterator[int]: Bitmasks of human hands.
+        """
+        if human_hand is not None:
+            return iter([human_hand])
+        if self.settings.sampling == "monte_carlo":
+            return i.islice(
+                sample_hands(
+                    unseen_cards,
+                    human_count,
+                    self.rng,
+                    self.settings.sample_weights,
+                    belief,
+                ),
+                self.settings.max_samples,
+            )
+        settings = self.settings
+        budgeted = settings.time_budget is not None or settings.max_nodes is not None
+        return enumerate_hands(
+            unseen_cards, human_count, belief, self.rng if budgeted else None
+        )
+
+    def vote(
+        self,
+        comp_hand: int,
+        human_hands,
+        top: int,
+        is_active: bool,
+        depth: int,
+        deadline: float | None = None,
+        searcher: search.Searcher | None = None,
+        stacking: int = 0,
+    ) -> Counter:
+        """
+        Searches human hands and counts the suggested moves.
+
+        Monte Carlo sampling stops as soon as the leading move is statistically separated.
+        Hands equal up to swapping colors are searched once, each of them still votes,
+        see ColorSymmetry.
+
+        Args:
+            comp_hand (int): Bitmask of computer player's cards.
+            human_hands (Iterable[int]): Bitmasks of human hands.
+            top (int): Index of the top card.
+            is_active (bool): Was last card an active card? True if yes.
+            depth (int): How deep should the minimax go.
+            deadline (float | None, optional): time.time() after which voting stops. Defaults to None.
+            searcher (search.Searcher | None, optional): Searcher to use in this process, with workers > 1 it keeps the node budget of the chunks. Defaults to a new one.
+            stacking (int, optional): Cards to take against an active "*7". Defaults to 0.
+
+        Returns:
+            Counter: Votes for each move.
+        """
+        settings = self.settings
+        sampling = settings.sampling == "monte_carlo"
+        z = confidence_z(settings.confidence)
+        votes = Counter()
+        # One table for all hypothetical human hands, their subtrees overlap heavily.
+        if searcher is None:
+            searcher = self.searcher(deadline)
+        if settings.workers > 1:
+            for chunk_votes in search.vote_hands_parallel(
+                self.get_executor(),
+                comp_hand,
+                human_hands,
+                top,
+                is_active,
+                depth,
+                settings.chunk_size,
+                2 * settings.workers,
+                settings,
+                deadline,
+                self.stats,
+                stacking,
+                self.unseen,
+                searcher,
+            ):
+                votes.update(chunk_votes)
+                if sampling and votes_separated(votes, z):
+                    break
+            return votes
+
+        symmetry = None
+        if ColorSymmetry.usable(settings):
+            symmetry = ColorSymmetry.of(comp_hand, top)
+        try:
+            for human_hand in human_hands:
+                if deadline is not None and time.time() >= deadline:
+                    break
+                if symmetry is not None:
+                    canonical = symmetry.canonical(human_hand)
+                    if canonical in symmetry.moves:
+                        votes[symmetry.moves[canonical]] += 1
+                        if sampling and votes_separated(votes, z):
+                            break
+                        continue
+                _, move = searcher.search_root(
+                    comp_hand, human_hand, top, is_active, depth, stacking=stacking
+                )
+                votes[move] += 1
+                if symmetry is not None:
+                    symmetry.remember(canonical, move)
+                if self.stats is not None:
+                    self.stats.determinizations += 1
+                if sampling and votes_separated(votes, z):
+                    break
+        except search.SearchTimeout:
+            pass
+        return votes
+
+    def get_executor(self) -> ProcessPoolExecutor:
+        """
+        Returns the process pool of the computer player, it is created on first use.
+
+        Returns:
+            ProcessPoolExecutor: Process pool with settings.workers workers.
+        """
+        if self.executor is None:
+            self.executor = ProcessPoolExecutor(self.settings.workers)
+        return self.executor
+
+    def get_cache(self) -> DecisionCache | None:
+        """
+        Returns the decision cache of the computer player, it is opened on first use.
+
+        Returns:
+            (DecisionCache | None): The cache, None if settings.cache_path is not set.
+        """
+        if self.cache is None and self.settings.cache_path is not None:
+            self.cache = DecisionCache(
+                self.settings.cache_path, self.settings.cache_entries
+            )
+        return self.cache
+
+    def ponder(self, positions) -> None:
+        """
+        Starts searching likely next positions in the background, if settings.ponder is on.
+
+        Args:
+            positions (Iterable[tuple]): Arguments of choose_move, most likely first.
+        """
+        if self.ponderer is not None:
+            self.ponderer.ponder(positions)
+
+    def close(self) -> None:
+        """Shuts down the process pool and closes the decision cache if they were created."""
+        if self.ponderer is not None:
+            self.ponderer.cancel()
+        if self.executor is not None:
+            self.executor.shutdown(cancel_futures=True)
+            self.executor = None
+        if self.cache is not None:
+            self.cache.close()
+            self.cache = None
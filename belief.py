@@ -0,0 +1,186 @@
+import random
+from bitcards import CARD_BITS, FULL_MASK, iter_indices
+
+
+class HandBelief:
+    """
+    What the computer player knows about the cards in human player's hand.
+
+    Every card in the hand has a slot with the cards it can still be. Taking a card or
+    standing a round instead of playing excludes every playable card from all slots,
+    a newly taken card gets a slot which can be any card. Older slots were restricted
+    by more observations, so every slot allows a subset of the cards of the next one.
+
+    Attributes:
+        slots (list[int]): Bitmask of possible cards for every card in hand, oldest first.
+    """
+
+    def __init__(self, count: int = 0) -> None:
+        """
+        Initialize the HandBelief object knowing nothing about the hand.
+
+        Args:
+            count (int, optional): Amount of cards in human player's hand. Defaults to 0.
+        """
+        self.slots = [FULL_MASK] * count
+
+    @property
+    def constrained(self) -> bool:
+        """True if any card of the hand is known not to be some card."""
+        return any(slot != FULL_MASK for slot in self.slots)
+
+    def exclude(self, mask: int) -> None:
+        """
+        Records that the hand holds none of the cards, e.g. the playable ones before taking a card.
+
+        Args:
+            mask (int): Bitmask of the excluded cards.
+        """
+        self.slots = [slot & ~mask for slot in self.slots]
+
+    def draw(self, count: int = 1) -> None:
+        """
+        Records cards taken from the card pack, they can be any card.
+
+        Args:
+            count (int, optional): Amount of taken cards. Defaults to 1.
+        """
+        self.slots.extend([FULL_MASK] * count)
+
+    def play(self, card: int) -> None:
+        """
+        Records a played card, it leaves the most restricted slot which allows it.
+
+        If no slot allows the card, the human player took a card while holding a playable
+        one and all exclusions are dropped.
+
+        Args:
+            card (int): Index of the played card.
+        """
+        bit = CARD_BITS[card]
+        for index, slot in enumerate(self.slots):
+            if slot & bit:
+                del self.slots[index]
+                return
+        self.slots = [FULL_MASK] * (len(self.slots) - 1)
+
+    def consistent(self, hand: int) -> bool:
+        """
+        Checks if the human player can be holding a hand.
+
+        Args:
+            hand (int): Bitmask of a hypothetical human hand.
+
+        Returns:
+            bool: True if the cards of the hand can be assigned to the slots.
+        """
+        # The slots are nested, so the k oldest slots need k cards they all allow.
+        for needed, slot in enumerate(self.slots, 1):
+            if (hand & slot).bit_count() < needed:
+                return False
+        return True
+
+    def sample(self, cards: int, rng: random.Random, weights=None) -> int:
+        """
+        Samples a consistent hand, every consistent hand equally likely.
+
+        The nested slots split the cards into layers, the oldest slot allows the first
+        layer and every next slot adds a layer. A hand is consistent if it takes at
+        least k cards from the first k layers, so the amount of cards of each layer is
+        drawn by how many hands complete it before the cards themselves. With weights a
+        hand is as likely as the product of the weights of its cards.
+
+        Args:
+            cards (int): Bitmask of the cards the human player could be holding.
+            rng (random.Random): Random number generator.
+            weights (list[float] | None, optional): Weight of every card index. Defaults to None.
+
+        Returns:
+            int: Bitmask of a hypothetical human hand, 0 if no hand is consistent.
+        """
+        count = len(self.slots)
+        layers = []
+        allowed = 0
+        for slot in self.slots:
+            layers.append(list(iter_indices(slot & cards & ~allowed)))
+            allowed |= slot & cards
+        layer_weights = [
+            [1.0 if weights is None else weights[card] for card in layer]
+            for layer in layers
+        ]
+        subsets = [_subset_weights(weight, count)[-1] for weight in layer_weights]
+        # ways[k][taken] is the weight of taking cards from the first k layers.
+        ways = [[1.0] + [0.0] * count]
+        for layer, subset in enumerate(subsets, 1):
+            previous = ways[-1]
+            ways.append(
+                [
+                    sum(previous[taken - c] * subset[c] for c in range(taken + 1))
+                    if taken >= layer
+                    else 0.0
+                    for taken in range(count + 1)
+                ]
+            )
+        if not ways[-1][count]:
+            return 0 if weights is None else self.sample(cards, rng)
+        hand = 0
+        taken = count
+        for layer in range(count, 0, -1):
+            amounts = range(taken + 1)
+            chances = [
+                ways[layer - 1][taken - c] * subsets[layer - 1][c] for c in amounts
+            ]
+            amount = rng.choices(amounts, chances)[0]
+            hand |= _sample_subset(
+                layers[layer - 1], layer_weights[layer - 1], amount, rng
+            )
+            taken -= amount
+        return hand
+
+
+def _subset_weights(weights: list[float], limit: int) -> list[list[float]]:
+    """
+    Sums the weights of the subsets of every prefix of the cards.
+
+    Args:
+        weights (list[float]): Weight of every card.
+        limit (int): Largest subset.
+
+    Returns:
+        list[list[float]]: [k][c] is the sum over subsets of c of the first k cards of the product of their weights.
+    """
+    table = [[1.0] + [0.0] * limit]
+    for weight in weights:
+        previous = table[-1]
+        table.append(
+            [previous[0]]
+            + [previous[c] + weight * previous[c - 1] for c in range(1, limit + 1)]
+        )
+    return table
+
+
+def _sample_subset(
+    cards: list[int], weights: list[float], count: int, rng: random.Random
+) -> int:
+    """
+    Samples count of the cards, a subset as likely as the product of its weights.
+
+    Args:
+        cards (list[int]): Indexes of the cards.
+        weights (list[float]): Weight of every card.
+        count (int): Amount of sampled cards.
+        rng (random.Random): Random number generator.
+
+    Returns:
+        int: Bitmask of the sampled cards.
+    """
+    table = _subset_weights(weights, count)
+    hand = 0
+    for position in range(len(cards), 0, -1):
+        if not count:
+            break
+        chance = weights[position - 1] * table[position - 1][count - 1]
+        if rng.random() * table[position][count] < chance:
+            hand |= CARD_BITS[cards[position - 1]]
+            count -= 1
+    return hand
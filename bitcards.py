@@ -0,0 +1,102 @@
+COLORS = ("l", "k", "c", "z")
+NUMBERS = ("a", "7", "8", "9", "10", "k", "m", "s")
+
+CARDS = tuple(f"{c}{n}" for c in COLORS for n in NUMBERS)
+CARD_INDEX = {card: index for index, card in enumerate(CARDS)}
+CARD_BITS = tuple(1 << index for index in range(len(CARDS)))
+FULL_MASK = (1 << len(CARDS)) - 1
+
+COLOR_MASKS = {
+    color: sum(CARD_BITS[CARD_INDEX[f"{color}{n}"]] for n in NUMBERS)
+    for color in COLORS
+}
+NUMBER_MASKS = {
+    number: sum(CARD_BITS[CARD_INDEX[f"{c}{number}"]] for c in COLORS)
+    for number in NUMBERS
+}
+ACTIVE_MASK = NUMBER_MASKS["7"] | NUMBER_MASKS["a"]
+
+# Every move a card can produce as (card index, index of the resulting top card).
+# A color changer played with a chosen color leaves the "m" card of that color on
+# top, which follows exactly the same rules as the ("color", "m") tuple used by the
+# string based search.
+MOVES = tuple(
+    tuple((index, CARD_INDEX[f"{c}m"]) for c in COLORS)
+    if card[1:] == "m"
+    else ((index, index),)
+    for index, card in enumerate(CARDS)
+)
+
+
+def to_mask(cards) -> int:
+    """
+    Encodes cards as a bitmask.
+
+    Args:
+        cards (Iterable[str]): Cards to be encoded.
+
+    Returns:
+        int: Bitmask with one bit set for every card.
+    """
+    mask = 0
+    for card in cards:
+        mask |= CARD_BITS[CARD_INDEX[card]]
+    return mask
+
+
+def to_cards(mask: int) -> list[str]:
+    """
+    Decodes a bitmask back to cards.
+
+    Args:
+        mask (int): Bitmask of cards.
+
+    Returns:
+        list[str]: Cards in the bitmask ordered by their index.
+    """
+    return [CARDS[index] for index in iter_indices(mask)]
+
+
+def iter_indices(mask: int):
+    """
+    Iterates over indices of all set bits of a bitmask.
+
+    Args:
+        mask (int): Bitmask of cards.
+
+    Yields:
+        int: Card index, lowest first.
+    """
+    while mask:
+        low = mask & -mask
+        yield low.bit_length() - 1
+        mask ^= low
+
+
+def top_index(last_card) -> int:
+    """
+    Converts the last played card of the string API to a card index.
+
+    Args:
+        last_card (str | tuple[str, str]): Last played card, or (color, "m") after a color change.
+
+    Returns:
+        int: Index of the card that behaves the same way on top of the pack.
+    """
+    if isinstance(last_card, tuple):
+        return CARD_INDEX[f"{last_card[0]}m"]
+    return CARD_INDEX[last_card]
+
+
+def move_to_str(move: tuple[int, int]) -> tuple[str, str | None]:
+    """
+    Converts a bitmask move to the (card, color_choice) tuple of the string API.
+
+    Args:
+        move (tuple[int, int]): Move as (card index, resulting top card index).
+
+    Returns:
+        tuple[str, str | None]: Played card and the chosen color for "*m" cards.
+    """
+    card = CARDS[move[0]]
+    return card, CARDS[move[1]][0] if card[1:] == "m" else None
@@ -0,0 +1,124 @@
+import copy
+import os
+from search import DRAW_ENTRIES
+from settings import AISettings
+from symmetry import MEMO_ENTRIES, ColorSymmetry
+
+# Resident bytes of one entry in CPython 3.11, measured with tracemalloc.
+TT_ENTRY_BYTES = 96
+ISMCTS_NODE_BYTES = 288
+ROLLOUT_ENTRY_BYTES = 200
+# A cached chance node is about 200 bytes and 40 more for every searched draw.
+DRAW_ENTRY_BYTES = 200
+DRAW_BYTES = 40
+MEMO_ENTRY_BYTES = 128
+# The in-process layer of DecisionCache keeps 4096 decisions of about 200 bytes.
+DECISION_CACHE_BYTES = 4096 * 200
+
+
+def memory_estimate(settings: AISettings) -> int:
+    """
+    Estimates the bytes the tables of one computer player can grow to.
+
+    Every worker process, the main process and the pondering thread have their own
+    searcher tables, the files are mapped once per process.
+
+    Args:
+        settings (AISettings): Settings of the computer player.
+
+    Returns:
+        int: Bytes of the transposition tables, ISMCTS trees, rollout caches, draw caches, symmetry memos, decision cache, tablebase and hand strength table.
+    """
+    size = _scalable_bytes(settings) + _fixed_bytes(settings)
+    if settings.cache_path is not None:
+        size += DECISION_CACHE_BYTES
+    if settings.tablebase:
+        size += _tablebase_bytes(settings.tablebase)
+    if settings.strength_table:
+        size += _tablebase_bytes(settings.strength_table)
+    return size
+
+
+def fit_memory(settings: AISettings) -> tuple[AISettings, list[str]]:
+    """
+    Shrinks the tables of the computer player to settings.max_memory bytes.
+
+    The small hand strength table, the draw caches and the symmetry memos are always
+    kept. A tablebase larger than half of the budget is not loaded, the transposition
+    tables, the ISMCTS trees and the rollout caches are shrunk by the same factor to fit
+    the rest. A smaller ISMCTS tree means fewer iterations.
+
+    Args:
+        settings (AISettings): Settings of the computer player.
+
+    Returns:
+        tuple[AISettings, list[str]]: Settings within the budget, the same object if nothing changed, and the names of the lowered settings.
+    """
+    budget = settings.max_memory
+    if budget is None or memory_estimate(settings) <= budget:
+        return settings, []
+    settings = copy.copy(settings)
+    reduced = []
+    budget -= _fixed_bytes(settings)
+    if settings.cache_path is not None:
+        budget -= DECISION_CACHE_BYTES
+    if settings.strength_table:
+        budget -= _tablebase_bytes(settings.strength_table)
+    if settings.tablebase:
+        size = _tablebase_bytes(settings.tablebase)
+        if 2 * size > settings.max_memory:
+            settings.tablebase = None
+            reduced.append("tablebase")
+        else:
+            budget -= size
+    scalable = _scalable_bytes(settings)
+    if scalable > budget:
+        factor = max(budget, 0) / scalable
+        names = ["tt_size"]
+        if settings.engine == "ismcts":
+            names.append("iterations")
+        if settings.rollouts:
+            names.append("rollout_entries")
+        for name in names:
+            if getattr(settings, name):
+                setattr(settings, name, int(getattr(settings, name) * factor))
+                reduced.append(name)
+        # ISMCTS needs one iteration to choose a move.
+        settings.iterations = max(settings.iterations, 1)
+    return settings, reduced
+
+
+def _searcher_copies(settings: AISettings) -> int:
+    """Searchers alive at once, one per worker process, the main process and the pondering thread."""
+    copies = settings.workers + (settings.workers > 1)
+    return copies + settings.ponder
+
+
+def _scalable_bytes(settings: AISettings) -> int:
+    """Bytes of the tables fit_memory can shrink."""
+    size = settings.tt_size * TT_ENTRY_BYTES
+    if settings.rollouts:
+        size += settings.rollout_entries * ROLLOUT_ENTRY_BYTES
+    size *= _searcher_copies(settings)
+    if settings.engine == "ismcts":
+        # The iterations are split between the trees of the workers.
+        size += (1 + settings.ponder) * settings.iterations * ISMCTS_NODE_BYTES
+    return size
+
+
+def _fixed_bytes(settings: AISettings) -> int:
+    """Bytes of the bounded caches of the searchers, fit_memory keeps them."""
+    size = 0
+    if settings.chance_samples:
+        size += DRAW_ENTRIES * (DRAW_ENTRY_BYTES + settings.chance_samples * DRAW_BYTES)
+    if ColorSymmetry.usable(settings):
+        size += MEMO_ENTRIES * MEMO_ENTRY_BYTES
+    return size * _searcher_copies(settings)
+
+
+def _tablebase_bytes(path: str) -> int:
+    """Size of a tablebase or hand strength table file, its pages become resident as they are read."""
+    try:
+        return os.path.getsize(path)
+    except OSError:
+        return 0
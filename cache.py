@@ -0,0 +1,196 @@
+from collections import OrderedDict
+import hashlib
+import sqlite3
+from bitcards import to_mask
+from determinization import usable
+from settings import AISettings
+
+# Settings which change the decision, the rest only change how fast it is found.
+DECISION_SETTINGS = (
+    "depth",
+    "sampling",
+    "confidence",
+    "max_samples",
+    "sample_weights",
+    "time_budget",
+    "max_depth",
+    "belief_tracking",
+    "solver_cards",
+    "tablebase",
+    "engine",
+    "iterations",
+    "exploration",
+    "rollouts",
+    "chance_samples",
+    "strength_table",
+    "max_nodes",
+)
+
+
+def decision_key(
+    settings: AISettings,
+    comp_hand: int,
+    top: int,
+    is_active: bool,
+    human_hand: int | None,
+    unseen_cards: list[str] | None,
+    human_count: int,
+    belief=None,
+    stacking: int = 0,
+) -> str:
+    """
+    Hashes everything a decision of the computer player depends on.
+
+    Args:
+        settings (AISettings): Settings of the computer player.
+        comp_hand (int): Bitmask of computer player's cards.
+        top (int): Index of the top card.
+        is_active (bool): Was last card an active card? True if yes.
+        human_hand (int | None): Bitmask of human player's cards if known (hard mode).
+        unseen_cards (list[str] | None): Cards the human player could be holding.
+        human_count (int): Amount of cards in human player's hand.
+        belief (HandBelief | None, optional): Observed constraints of human player's hand. Defaults to None.
+        stacking (int, optional): Cards to take against an active "*7". Defaults to 0.
+
+    Returns:
+        str: Hex digest identifying the decision.
+    """
+    if human_hand is not None:
+        state = ("hard", comp_hand, top, is_active, stacking, human_hand)
+    else:
+        slots = tuple(belief.slots) if usable(belief, human_count) else ()
+        unseen = to_mask(unseen_cards or ())
+        state = (
+            "easy",
+            comp_hand,
+            top,
+            is_active,
+            stacking,
+            unseen,
+            human_count,
+            slots,
+        )
+    parameters = tuple(
+        sorted(value.items()) if isinstance(value, dict) else value
+        for value in (getattr(settings, name) for name in DECISION_SETTINGS)
+    )
+    return hashlib.sha256(repr((state, parameters)).encode()).hexdigest()
+
+
+class DecisionCache:
+    """
+    Decisions of the computer player stored in SQLite, with an in-process layer on top.
+
+    The database keeps at most max_entries decisions and evicts the least recently used
+    ones. Hits in the in-process layer do not write to the database, so its recency is
+    only refreshed when a decision falls out of memory and is read again.
+
+    Attributes:
+        connection (sqlite3.Connection): Connection to the database.
+        max_entries (int): Maximum amount of decisions in the database.
+        memory (OrderedDict): Most recently used decisions, oldest first.
+        memory_size (int): Maximum amount of decisions in memory.
+        clock (int): Counter ordering the uses of decisions.
+        entries (int): Amount of decisions in the database, as far as this process knows.
+    """
+
+    def __init__(
+        self, path: str, max_entries: int = 100_000, memory_size: int = 4096
+    ) -> None:
+        """
+        Initialize the DecisionCache object, the database is created if missing.
+
+        Args:
+            path (str): Path of the SQLite database, ":memory:" keeps it in memory.
+            max_entries (int, optional): Maximum amount of decisions in the database. Defaults to 100_000.
+            memory_size (int, optional): Maximum amount of decisions in memory. Defaults to 4096.
+        """
+        self.connection = sqlite3.connect(path, timeout=5)
+        self.connection.execute("PRAGMA journal_mode=WAL")
+        self.connection.execute(
+            "CREATE TABLE IF NOT EXISTS decisions ("
+            "key TEXT PRIMARY KEY, card INTEGER, top INTEGER, used INTEGER NOT NULL)"
+        )
+        self.connection.execute(
+            "CREATE INDEX IF NOT EXISTS decisions_used ON decisions (used)"
+        )
+        self.connection.commit()
+        self.max_entries = max_entries
+        self.memory = OrderedDict()
+        self.memory_size = memory_size
+        row = self.connection.execute(
+            "SELECT MAX(used), COUNT(*) FROM decisions"
+        ).fetchone()
+        self.clock = row[0] or 0
+        self.entries = row[1]
+
+    def get(self, key: str) -> tuple | None:
+        """
+        Looks up a decision.
+
+        Args:
+            key (str): Key of the decision, see decision_key.
+
+        Returns:
+            (tuple | None): The stored move, () for taking a card or standing a round, None if unknown.
+        """
+        memory = self.memory
+        if key in memory:
+            memory.move_to_end(key)
+            return memory[key]
+        row = self.connection.execute(
+            "SELECT card, top FROM decisions WHERE key = ?", (key,)
+        ).fetchone()
+        if row is None:
+            return None
+        self.clock += 1
+        self.connection.execute(
+            "UPDATE decisions SET used = ? WHERE key = ?", (self.clock, key)
+        )
+        self.connection.commit()
+        move = () if row[0] is None else tuple(row)
+        self._remember(key, move)
+        return move
+
+    def put(self, key: str, move: tuple[int, int] | None) -> None:
+        """
+        Stores a decision and evicts the least recently used ones above max_entries.
+
+        Args:
+            key (str): Key of the decision, see decision_key.
+            move (tuple[int, int] | None): Decided move, None to take a card or stand a round.
+        """
+        self.clock += 1
+        card, top = move if move else (None, None)
+        connection = self.connection
+        inserted = connection.execute(
+            "INSERT OR IGNORE INTO decisions VALUES (?, ?, ?, ?)",
+            (key, card, top, self.clock),
+        ).rowcount
+        if inserted:
+            self.entries += 1
+        else:
+            connection.execute(
+                "UPDATE decisions SET card = ?, top = ?, used = ? WHERE key = ?",
+                (card, top, self.clock, key),
+            )
+        if self.entries > self.max_entries:
+            connection.execute(
+                "DELETE FROM decisions WHERE key IN "
+                "(SELECT key FROM decisions ORDER BY used LIMIT ?)",
+                (self.entries - self.max_entries,),
+            )
+            self.entries = self.max_entries
+        connection.commit()
+        self._remember(key, move or ())
+
+    def _remember(self, key: str, move: tuple) -> None:
+        """Adds a decision to the in-process layer, forgetting the oldest one when full."""
+        self.memory[key] = move
+        self.memory.move_to_end(key)
+        if len(self.memory) > self.memory_size:
+            self.memory.popitem(last=False)
+
+    def close(self) -> None:
+        """Closes the database connection."""
+        self.connection.close()
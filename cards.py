@@ -1,6 +1,7 @@
 from collections import deque
 import random
 from typing import Literal
+from bitcards import to_mask
 
 colors = {"z", "l", "c", "k"}
 numbers = {"a", "7", "8", "9", "10", "k", "m", "s"}
@@ -153,3 +154,11 @@ class CardHand:
             int: Card count.
         """
         return len(self.cards)
+
+    def to_mask(self) -> int:
+        """Returns the hand encoded as a bitmask.
+
+        Returns:
+            int: Bitmask with one bit set for every card in hand.
+        """
+        return to_mask(self.cards)
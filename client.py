@@ -0,0 +1,110 @@
+import argparse
+import asyncio
+
+END_LINES = ("OK", "ERR", "BYE", "TIMEOUT")
+
+
+class PrsiClient:
+    """
+    Asyncio client of the Prsi server line protocol.
+
+    Attributes:
+        reader (asyncio.StreamReader): Lines from the server.
+        writer (asyncio.StreamWriter): Lines to the server.
+        greeting (str): First line sent by the server.
+    """
+
+    def __init__(
+        self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter
+    ) -> None:
+        """Initialize the PrsiClient object over an open connection, see connect."""
+        self.reader = reader
+        self.writer = writer
+        self.greeting = ""
+
+    @staticmethod
+    async def connect(
+        host: str = "127.0.0.1", port: int = 8765, path: str | None = None
+    ):
+        """
+        Connects to a server over TCP, or over a Unix socket if path is given.
+
+        Args:
+            host (str, optional): Address of the server. Defaults to "127.0.0.1".
+            port (int, optional): TCP port of the server. Defaults to 8765.
+            path (str | None, optional): Path of a Unix socket. Defaults to None.
+
+        Returns:
+            PrsiClient: Connected client which already read the greeting.
+        """
+        if path is not None:
+            reader, writer = await asyncio.open_unix_connection(path)
+        else:
+            reader, writer = await asyncio.open_connection(host, port)
+        client = PrsiClient(reader, writer)
+        client.greeting = await client.read_line()
+        return client
+
+    async def read_line(self) -> str:
+        """Reads one line, an empty string once the server disconnected."""
+        return (await self.reader.readline()).decode().rstrip("\n")
+
+    async def read_reply(self) -> list[str]:
+        """
+        Reads lines up to and including the line which ends a reply.
+
+        Returns:
+            list[str]: Lines of the reply, the last one starts with OK, ERR, BYE or TIMEOUT.
+        """
+        lines = []
+        while True:
+            line = await self.read_line()
+            if not line:
+                return lines
+            lines.append(line)
+            if line.split()[0] in END_LINES:
+                return lines
+
+    async def command(self, line: str) -> list[str]:
+        """
+        Sends a command and waits for its reply.
+
+        Args:
+            line (str): Command, e.g. "PLAY lk".
+
+        Returns:
+            list[str]: Lines of the reply.
+        """
+        self.writer.write(f"{line}\n".encode())
+        await self.writer.drain()
+        return await self.read_reply()
+
+    async def close(self) -> None:
+        """Closes the connection."""
+        self.writer.close()
+        await self.writer.wait_closed()
+
+
+async def play(host: str, port: int, path: str | None) -> None:
+    """Plays on a server from the terminal, commands are typed as in the protocol."""
+    client = await PrsiClient.connect(host, port, path)
+    print(client.greeting)
+    loop = asyncio.get_running_loop()
+    try:
+        while True:
+            line = await loop.run_in_executor(None, input, "-> ")
+            reply = await client.command(line)
+            print("\n".join(reply))
+            if not reply or reply[-1] in ("BYE", "TIMEOUT"):
+                break
+    finally:
+        await client.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Prsi server client.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--unix", help="connect to this Unix socket instead")
+    args = parser.parse_args()
+    asyncio.run(play(args.host, args.port, args.unix))
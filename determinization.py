@@ -0,0 +1,187 @@
+from collections import Counter
+import heapq
+import itertools as i
+from math import comb, gcd, sqrt
+import random
+from statistics import NormalDist
+from bitcards import CARD_BITS, CARD_INDEX, CARDS
+
+
+def enumerate_hands(cards, count: int, belief=None, rng: random.Random | None = None):
+    """
+    Lazily enumerates every hand the human player could be holding.
+
+    Only one hand exists at a time, so memory stays constant no matter how many
+    combinations there are. With a belief only consistent hands are enumerated, all
+    hands if none is consistent. Without rng the hands come in lexicographic order of
+    cards, so a search cut short by a deadline or node budget only sees hands of the
+    first cards. With rng they come in a random order, see shuffled_ranks.
+
+    Args:
+        cards (Iterable[str]): Cards the human player could be holding.
+        count (int): Amount of cards in human player's hand.
+        belief (HandBelief | None, optional): Observed constraints of human player's hand. Defaults to None.
+        rng (random.Random | None, optional): Random number generator ordering the hands. Defaults to None.
+
+    Yields:
+        int: Bitmask of a hypothetical human hand.
+    """
+    bits = [CARD_BITS[CARD_INDEX[card]] for card in cards]
+    if rng is None:
+        hands = (sum(combination) for combination in i.combinations(bits, count))
+    else:
+        hands = (
+            unrank_hand(bits, count, rank)
+            for rank in shuffled_ranks(comb(len(bits), count), rng)
+        )
+    if not usable(belief, count):
+        yield from hands
+        return
+    found = False
+    for hand in hands:
+        if belief.consistent(hand):
+            found = True
+            yield hand
+    if not found:
+        yield from enumerate_hands(cards, count, rng=rng)
+
+
+def shuffled_ranks(total: int, rng: random.Random):
+    """
+    Lazily yields range(total) in a random order, with constant memory.
+
+    The order is the affine permutation rank = (offset + j * step) % total with a random
+    offset and a random step coprime to total.
+
+    Args:
+        total (int): Amount of ranks.
+        rng (random.Random): Random number generator.
+
+    Yields:
+        int: Every rank below total exactly once.
+    """
+    if total <= 0:
+        return
+    step = rng.randrange(1, total) if total > 2 else 1
+    while gcd(step, total) != 1:
+        step = rng.randrange(1, total)
+    offset = rng.randrange(total)
+    for j in range(total):
+        yield (offset + j * step) % total
+
+
+def unrank_hand(bits: list[int], count: int, rank: int) -> int:
+    """
+    Returns the hand of the given rank in the combinatorial number system.
+
+    Args:
+        bits (list[int]): Bitmasks of the cards the hand is drawn from.
+        count (int): Amount of cards in the hand.
+        rank (int): Rank of the hand, below comb(len(bits), count).
+
+    Returns:
+        int: Bitmask of the hand.
+    """
+    hand = 0
+    position = len(bits)
+    for k in range(count, 0, -1):
+        position -= 1
+        while comb(position, k) > rank:
+            position -= 1
+        rank -= comb(position, k)
+        hand |= bits[position]
+    return hand
+
+
+def sample_hands(cards, count: int, rng: random.Random, weights=None, belief=None):
+    """
+    Endlessly samples hands the human player could be holding.
+
+    Without weights every hand is equally likely. With weights, cards are drawn without
+    replacement with probability proportional to their weight. With a belief only
+    consistent hands are sampled, each as likely as the product of its card weights.
+
+    Args:
+        cards (Iterable[str]): Cards the human player could be holding.
+        count (int): Amount of cards in human player's hand.
+        rng (random.Random): Random number generator.
+        weights (dict[str, float] | None, optional): Weight of each card. Defaults to None.
+        belief (HandBelief | None, optional): Observed constraints of human player's hand. Defaults to None.
+
+    Yields:
+        int: Bitmask of a hypothetical human hand.
+    """
+    cards = list(cards)
+    bits = [CARD_BITS[CARD_INDEX[card]] for card in cards]
+    if usable(belief, count):
+        mask = sum(bits)
+        card_weights = None
+        if weights is not None:
+            card_weights = [weights.get(card, 1.0) for card in CARDS]
+        hand = belief.sample(mask, rng, card_weights)
+        if hand.bit_count() == count:
+            while True:
+                yield hand
+                hand = belief.sample(mask, rng, card_weights)
+    if weights is None:
+        while True:
+            yield sum(rng.sample(bits, count))
+    card_weights = [weights.get(card, 1.0) for card in cards]
+    while True:
+        # Efraimidis-Spirakis: the count largest keys form a weighted sample without replacement.
+        keys = [
+            rng.random() ** (1 / weight) if weight > 0 else 0.0
+            for weight in card_weights
+        ]
+        chosen = heapq.nlargest(count, range(len(bits)), key=keys.__getitem__)
+        yield sum(bits[index] for index in chosen)
+
+
+def usable(belief, count: int) -> bool:
+    """
+    Checks if a belief restricts the hands and matches the amount of cards.
+
+    Args:
+        belief (HandBelief | None): Observed constraints of human player's hand.
+        count (int): Amount of cards in human player's hand.
+
+    Returns:
+        bool: True if the hands should be checked against the belief.
+    """
+    return belief is not None and belief.constrained and len(belief.slots) == count
+
+
+def confidence_z(confidence: float) -> float:
+    """
+    Returns the one-sided critical value of the normal distribution.
+
+    Args:
+        confidence (float): Confidence level, e.g. 0.95.
+
+    Returns:
+        float: Critical z value.
+    """
+    return NormalDist().inv_cdf(confidence)
+
+
+def votes_separated(votes: Counter, z: float) -> bool:
+    """
+    Checks whether the leading move is statistically ahead of the runner-up.
+
+    Among the votes for the two best moves, each vote would go to either of them with
+    probability 1/2 if they were equally good. The leader is separated once its lead is
+    larger than z standard deviations of that distribution.
+
+    Args:
+        votes (Counter): Votes for each move.
+        z (float): Critical value, see confidence_z.
+
+    Returns:
+        bool: True if sampling can stop.
+    """
+    top_two = votes.most_common(2)
+    if not top_two:
+        return False
+    leader = top_two[0][1]
+    runner_up = top_two[1][1] if len(top_two) > 1 else 0
+    return leader - runner_up > z * sqrt(leader + runner_up)
@@ -0,0 +1,40 @@
+from typing import NamedTuple
+
+HUMAN = "human"
+COMPUTER = "computer"
+
+
+class Action(NamedTuple):
+    """
+    Turn of the human player, see GameRunner.apply.
+
+    Attributes:
+        kind (str): "play", "take" or "stand".
+        card (str | None): Card to be played.
+        color (str | None): Color to switch to when playing an "*m" card.
+    """
+
+    kind: str
+    card: str | None = None
+    color: str | None = None
+
+
+class Event(NamedTuple):
+    """
+    Something which happened in the game, returned instead of printed.
+
+    Attributes:
+        kind (str): "played", "took", "stood", "rejected" or "won".
+        player (str): HUMAN or COMPUTER.
+        card (str | None): Played card.
+        color (str | None): Color switched to with an "*m" card.
+        count (int): Amount of taken cards.
+        message (str): Why an action was rejected.
+    """
+
+    kind: str
+    player: str
+    card: str | None = None
+    color: str | None = None
+    count: int = 0
+    message: str = ""
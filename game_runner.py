@@ -1,13 +1,31 @@
-from collections import Counter
-import itertools as i
+import copy
 from player import Player, HumanPlayer, ComputerPlayer
 from cards import GiveCardPack, PlayedCardPack
+from ai import ComputerAI
+from belief import HandBelief
+from bitcards import (
+    CARD_BITS,
+    CARD_INDEX,
+    COLORS,
+    move_to_str,
+    to_cards,
+    to_mask,
+    top_index,
+)
+from events import COMPUTER, HUMAN, Action, Event
+from rules import game_playable_mask, playable_mask, valid_moves
+from settings import AISettings
+from state import GameState
+import search
 
 
 class GameRunner:
     """
     Class for managing the game run.
 
+    The game is driven by apply, human_turn and computer_turn, which return events
+    instead of printing. run_game and manage_command are the command line on top.
+
     Attributes:
         human_player (HumanPlayer)
         computer_player (ComputerPlayer)
@@ -17,10 +35,25 @@ class GameRunner:
         active_card (bool): True if the last card played was active and the effect is affecting the current player else False.
         desired_color (str | None): The color the player switched to with an "*m" card.
         stacking (int): The stacking of taking cards after "*7" cards were played.
+        settings (AISettings): Settings of the computer player.
+        ai (ComputerAI): Decision logic of the computer player.
+        human_belief (HandBelief): What the computer player learned about human player's hand.
+        easy (bool): True if the computer player does not see the human player's hand.
+        winner (str | None): HUMAN or COMPUTER once the game is over, None while it runs.
     """
 
-    def __init__(self) -> None:
-        """Initializes the GameRunner object with all its attributes and gives the starting amount of cards to players."""
+    def __init__(self, settings: AISettings | None = None, easy: bool = False) -> None:
+        """
+        Initializes the GameRunner object with all its attributes and gives the starting amount of cards to players.
+
+        Args:
+            settings (AISettings | None, optional): Settings of the computer player. Defaults to AISettings().
+            easy (bool, optional): Difficulty, select_difficulty asks for it on the command line. Defaults to False.
+        """
+        self.settings = settings or AISettings()
+        self.easy = easy
+        self.winner = None
+        self.ai = ComputerAI(self.settings.for_difficulty(easy))
         self.human_player = HumanPlayer()
         self.computer_player = ComputerPlayer()
         self.give_card_pack = GiveCardPack()
@@ -35,6 +68,7 @@ class GameRunner:
             for _ in range(2):
                 self.take_card(self.computer_player)
         self.played_card_pack.add_card(self.give_card_pack.give_card())
+        self.human_belief = HandBelief(self.human_player.get_card_count())
 
     def select_difficulty(self) -> None:
         """Selects the game difficulty."""
@@ -47,6 +81,10 @@ class GameRunner:
             self.easy = True
         else:
             self.easy = False
+        if self.settings.budgets:
+            # The computer player gets the budget of the chosen difficulty.
+            self.ai.close()
+            self.ai = ComputerAI(self.settings.for_difficulty(self.easy))
         print()
 
     def run_game(self):
@@ -55,26 +93,24 @@ class GameRunner:
               Prsi Card Game
               """)
         self.select_difficulty()
-        while True:
-            while not self.played:
-                self.print_current_game_state()
-                command = input("-> ")
-                if command != "exit":
-                    self.manage_command(command)
-                else:
-                    exit(0)
-            if not self.human_player.get_card_count():
-                print("Victory")
-                break
-            self.computer_play()
-            self.played = False
-            if not self.computer_player.get_card_count():
-                print("Defeat")
-                break
+        try:
+            while self.winner is None:
+                while not self.played:
+                    self.print_current_game_state()
+                    command = input("-> ")
+                    if command != "exit":
+                        self.manage_command(command)
+                    else:
+                        exit(0)
+                if self.winner is None:
+                    self.computer_play()
+                self.played = False
+        finally:
+            self.close()
 
     def manage_command(self, command: str):
         """
-        Manages command logic.
+        Manages command logic, turns are passed on to human_turn.
 
         Args:
             command (str): Inputed command.
@@ -85,17 +121,18 @@ class GameRunner:
                     self.human_player.list_cards()
 
                 case "play_card" | "pc":
-                    if self.play_card(self.human_player, command.split()[1]):
-                        self.played = True
-                        self.active_card = True
+                    card, *color = command.split()[1:]
+                    color = color[0] if color else None
+                    if (
+                        card[1] == "m"
+                        and color is None
+                        and self.check_play(self.human_player, card) is None
+                    ):
+                        color = self.ask_color()
+                    self.print_events(self.human_turn(Action("play", card, color)))
 
                 case "take_card" | "tc":
-                    if self.active_card and self.played_card_pack.last_card()[1] == "a":
-                        print("\nYou cannot take a card right now.\n")
-                        return
-                    self.take_card(self.human_player)
-                    self.played = True
-                    self.active_card = False
+                    self.print_events(self.human_turn(Action("take")))
 
                 case "help" | "h":
                     print("""
@@ -110,13 +147,7 @@ Available commands:
                       """)
 
                 case "stand_round" | "sr":
-                    if self.active_card and self.played_card_pack.last_card()[1] == "a":
-                        self.played = True
-                        self.active_card = False
-                    else:
-                        print(
-                            "You are not playing against an active ace so you cannot stand a round."
-                        )
+                    self.print_events(self.human_turn(Action("stand")))
 
                 case "card_info" | "ci":
                     print("""
@@ -140,6 +171,135 @@ Card values:
             pass
         print()
 
+    def ask_color(self) -> str:
+        """Asks the human player for the color of a played "*m" card."""
+        while True:
+            desired = input("Select the color you want to switch to: ")
+            if desired in COLORS:
+                return desired
+            print("Incorrect color, try again.")
+
+    def print_events(self, events: list[Event]) -> None:
+        """Prints the events of a turn for the command line."""
+        for event in events:
+            if event.kind == "rejected":
+                print(event.message)
+            elif event.kind == "won":
+                print("Victory" if event.player == HUMAN else "Defeat")
+            elif event.player == HUMAN:
+                continue
+            elif event.kind == "played" and event.color:
+                print(f"Computer plays {event.card} and changes color to {event.color}")
+            elif event.kind == "played":
+                print(f"Computer plays {event.card}")
+            elif event.kind == "stood":
+                print("Computer stands a round\n")
+            else:
+                print("Computer takes a card.")
+
+    def apply(self, action: Action) -> list[Event]:
+        """
+        Plays a turn of the human player followed by the computer player's answer.
+
+        Nothing is printed or read, so the game can run inside a service or a simulator.
+
+        Args:
+            action (Action): Turn of the human player.
+
+        Returns:
+            list[Event]: What happened, a single "rejected" event if the action is not allowed.
+        """
+        events = self.human_turn(action)
+        if self.played and self.winner is None:
+            events += self.computer_turn()
+            self.played = False
+        return events
+
+    def human_turn(self, action: Action) -> list[Event]:
+        """
+        Plays a turn of the human player, sets played if the action was allowed.
+
+        Args:
+            action (Action): Turn of the human player.
+
+        Returns:
+            list[Event]: What happened.
+        """
+        ace = self.active_card and self.played_card_pack.last_card()[1] == "a"
+        match action:
+            case Action(kind="play", card=card, color=color):
+                reason = self.check_play(self.human_player, card)
+                if reason is None and card[1] == "m" and color not in COLORS:
+                    reason = "Select the color you want to switch to: l, k, c or z."
+                if reason is not None:
+                    return [Event("rejected", HUMAN, card, message=reason)]
+                self.human_belief.play(CARD_INDEX[card])
+                self.put_card(self.human_player, card, color)
+                events = [Event("played", HUMAN, card, self.desired_color)]
+            case Action(kind="take"):
+                if ace:
+                    return [
+                        Event("rejected", HUMAN, message="You cannot take a card right now.")
+                    ]
+                # Taking instead of playing means no card was playable.
+                self.human_belief.exclude(self.playable_mask())
+                count = self.human_player.get_card_count()
+                self.take_card(self.human_player)
+                taken = self.human_player.get_card_count() - count
+                self.human_belief.draw(taken)
+                self.active_card = False
+                events = [Event("took", HUMAN, count=taken)]
+            case Action(kind="stand"):
+                if not ace:
+                    return [
+                        Event(
+                            "rejected",
+                            HUMAN,
+                            message="You are not playing against an active ace so you cannot stand a round.",
+                        )
+                    ]
+                self.human_belief.exclude(self.playable_mask())
+                self.active_card = False
+                events = [Event("stood", HUMAN)]
+            case _:
+                return [Event("rejected", HUMAN, message=f"Unknown action {action.kind}.")]
+        self.played = True
+        if not self.human_player.get_card_count():
+            self.winner = HUMAN
+            events.append(Event("won", HUMAN))
+        return events
+
+    def computer_turn(self) -> list[Event]:
+        """
+        Decides and plays a turn of the computer player.
+
+        With settings.ponder the answers to the human player's next turn are searched in
+        the background afterwards.
+
+        Returns:
+            list[Event]: What happened.
+        """
+        move = self.choose_move()
+        if move:
+            card, color_choice = move
+            self.put_card(self.computer_player, card, color_choice)
+            events = [Event("played", COMPUTER, card, color_choice)]
+            if not self.computer_player.get_card_count():
+                self.winner = COMPUTER
+                events.append(Event("won", COMPUTER))
+        elif self.played_card_pack.last_card()[1] == "a" and self.active_card:
+            self.active_card = False
+            events = [Event("stood", COMPUTER)]
+        else:
+            count = self.computer_player.get_card_count()
+            self.take_card(self.computer_player)
+            self.active_card = False
+            taken = self.computer_player.get_card_count() - count
+            events = [Event("took", COMPUTER, count=taken)]
+        if self.settings.ponder and self.winner is None:
+            self.ponder()
+        return events
+
     def take_card(self, player: Player, recursive=False) -> None:
         """
         Takes a card from give_card_pack and gives it to the player
@@ -162,60 +322,70 @@ Card values:
             self.active_card = False
         player.add_card(card)
 
-    def play_card(self, player: Player, card: str) -> bool:
+    def play_card(self, player: Player, card: str, color: str | None = None) -> bool:
         """
-        Plays a card.
+        Plays a card, asks the human player for the color of an "*m" card if not given.
 
         Args:
             player (Player): Player that is playing the card
             card (str): The card to be played.
+            color (str | None, optional): Color to switch to with an "*m" card. Defaults to None.
 
         Returns:
             bool: Succes.
         """
-        if player.check_for_card(card):
-            if not self.check_card_playable(card):
-                print("You cannot play this card now.")
-                return False
-            player.play_card(card)
-            self.desired_color = None
-            if card[1] == "m" and type(player) is not ComputerPlayer:
-                while True:
-                    desired = input("Select the color you want to switch to: ")
-                    if desired in ["l", "k", "c", "z"]:
-                        self.desired_color = desired
-                        break
-                    else:
-                        print("Incorrect color, try again.")
-            elif card[1] == "7":
-                self.stacking += 2
-            self.played_card_pack.add_card(card)
-            return True
-        print(
-            "You dont have the card you want to play. Play a different card or take a card."
-        )
-        return False
+        reason = self.check_play(player, card)
+        if reason is not None:
+            print(reason)
+            return False
+        if card[1] == "m" and color is None and type(player) is not ComputerPlayer:
+            color = self.ask_color()
+        self.put_card(player, card, color)
+        return True
+
+    def check_play(self, player: Player, card: str) -> str | None:
+        """
+        Checks if the player may play a card.
+
+        Args:
+            player (Player): Player that wants to play the card.
+            card (str): The card to be played.
+
+        Returns:
+            (str | None): Why the card cannot be played, None if it can.
+        """
+        if not player.check_for_card(card):
+            return "You dont have the card you want to play. Play a different card or take a card."
+        if not self.check_card_playable(card):
+            return "You cannot play this card now."
+        return None
+
+    def put_card(self, player: Player, card: str, color: str | None = None) -> None:
+        """
+        Moves an allowed card from the player's hand onto the played card pack.
+
+        Args:
+            player (Player): Player that is playing the card.
+            card (str): The card to be played.
+            color (str | None, optional): Color to switch to with an "*m" card. Defaults to None.
+        """
+        player.play_card(card)
+        self.desired_color = color if card[1] == "m" else None
+        if card[1] == "7":
+            self.stacking += 2
+        self.active_card = card[1] in ["a", "7"]
+        self.played_card_pack.add_card(card)
 
     def check_card_playable(self, card) -> bool:
         """Checks if card is playable. Returns True if playable."""
-        last_card = self.played_card_pack.last_card()
-
-        if self.active_card:
-            match last_card[1]:
-                case "7" | "a":
-                    return last_card[1] == card[1]
-                case "m":
-                    if card[0] == self.desired_color or card[1] == "m":
-                        return True
-                    else:
-                        return False
-        return (
-            (
-                (last_card[0] == card[0] or last_card[1] == card[1])
-                and self.desired_color is None
-            )
-            or (card[0] == self.desired_color and self.desired_color is not None)
-            or card[1] == "m"
+        return bool(CARD_BITS[CARD_INDEX[card]] & self.playable_mask())
+
+    def playable_mask(self) -> int:
+        """Returns the bitmask of cards playable in the current game state."""
+        return game_playable_mask(
+            self.played_card_pack.last_card(),
+            self.desired_color,
+            self.active_card,
         )
 
     def print_current_game_state(self):
@@ -229,73 +399,118 @@ Card values:
     def computer_play(self):
         """Main method of computer player turn logic."""
         print("Robot turn:")
+        self.print_events(self.computer_turn())
+        print()
 
-        comp_hand = self.computer_player.card_hand.cards[:]
-        human_hands = (
-            list(
-                [
-                    list(c)
-                    for c in i.combinations(
-                        self.human_player.card_hand.cards[:]
-                        + list(self.give_card_pack.cards)[:],
-                        self.human_player.get_card_count(),
-                    )
-                ]
-            )
-            if self.easy
-            else [self.human_player.card_hand.cards[:]]
+    def choose_move(self) -> tuple[str, str | None] | None:
+        """
+        Decides the computer player's move without changing the game state.
+
+        Returns:
+            (tuple[str, str | None] | None): (card, color_choice) to be played, None to take a card or stand a round.
+        """
+        move = self.ai.choose_move(*self.decision_arguments())
+        return move_to_str(move) if move else None
+
+    def unseen_cards(self) -> list[str]:
+        """
+        Returns the cards the computer player cannot see, the human hand and the card pack.
+
+        Returns:
+            list[str]: The cards ordered by their index, so the order tells nothing about the human hand.
+        """
+        return to_cards(
+            self.human_player.card_hand.to_mask() | to_mask(self.give_card_pack.cards)
         )
-        print(len(human_hands))
-        suggested_moves = []
-        for human_hand in human_hands:
-            physical_card = self.played_card_pack.last_card()
 
-            if physical_card[1] == "m" and self.desired_color:
-                current_card = (self.desired_color, "m")
-            else:
-                current_card = physical_card
-
-            is_active = self.active_card
-
-            _, move = self.minimax(
-                comp_hand,
-                human_hand,
-                current_card,
-                is_active,
-                depth=4,
-                is_maximizing=True,
-            )
-            suggested_moves.append(move)
-        move = None
-        if suggested_moves:
-            vote_counts = Counter(suggested_moves)
-            best_move_tuple = vote_counts.most_common(1)[0]
-            move = best_move_tuple[0]
-        if move:
-            card, color_choice = move
-            if card[1] == "m":
-                print(f"Computer plays {card} and changes color to {color_choice}")
-            else:
-                print(f"Computer plays {card}")
+    def decision_arguments(self) -> tuple:
+        """
+        Returns what the computer player's decision depends on.
 
-            self.play_card(self.computer_player, card)
+        Returns:
+            tuple: Arguments of ComputerAI.choose_move for the current position.
+        """
+        state = self.game_state()
+        return (
+            state.comp_hand,
+            state.top,
+            state.active,
+            None if self.easy else state.human_hand,
+            self.unseen_cards(),
+            self.human_player.get_card_count(),
+            self.human_belief if self.settings.belief_tracking else None,
+            state.stacking,
+        )
 
-            if color_choice:
-                self.desired_color = color_choice
+    def preview(self, action: Action):
+        """
+        Plays a human turn on a copy of the game, the computer player is shared.
 
-            self.played = True
-            self.active_card = True if card[1] in ["a", "7"] else False
+        Args:
+            action (Action): Turn of the human player.
+
+        Returns:
+            (GameRunner | None): The copy after the turn, None if the action is not allowed.
+        """
+        runner = copy.copy(self)
+        for name in (
+            "human_player",
+            "computer_player",
+            "give_card_pack",
+            "played_card_pack",
+            "human_belief",
+        ):
+            setattr(runner, name, copy.deepcopy(getattr(self, name)))
+        if runner.human_turn(action)[0].kind == "rejected":
+            return None
+        return runner
+
+    def human_actions(self) -> list[Action]:
+        """Returns the allowed turns of the human player, playing cards first."""
+        actions = []
+        for card in self.human_player.card_hand.cards:
+            if self.check_play(self.human_player, card) is not None:
+                continue
+            if card[1] == "m":
+                actions.extend(Action("play", card, color) for color in COLORS)
+            else:
+                actions.append(Action("play", card))
+        if self.active_card and self.played_card_pack.last_card()[1] == "a":
+            actions.append(Action("stand"))
         else:
-            if current_card[1] == "a" and is_active:
-                print("Computer stands a round\n")
-                self.active_card = False
-                return
+            actions.append(Action("take"))
+        return actions
+
+    def ponder(self) -> None:
+        """Lets the computer player search its answers to every human turn in the background."""
+        positions = []
+        for action in self.human_actions():
+            runner = self.preview(action)
+            if runner is not None and runner.winner is None:
+                positions.append(runner.decision_arguments())
+        self.ai.ponder(positions)
+
+    def game_state(self) -> GameState:
+        """
+        Returns the position the way the search sees it, the computer player to move.
 
-            print("Computer takes a card.")
-            self.take_card(self.computer_player)
-            self.played = True
-            self.active_card = False
-        print()
+        Returns:
+            GameState: Hands, top card with the desired color, active flag and stacking.
+        """
+        top = self.played_card_pack.last_card()
+        if top[1] == "m" and self.desired_color:
+            top = (self.desired_color, "m")
+        return GameState(
+            self.computer_player.card_hand.to_mask(),
+            self.human_player.card_hand.to_mask(),
+            top_index(top),
+            self.active_card,
+            self.stacking,
+        )
+
+    def close(self) -> None:
+        """Releases resources of the computer player, such as its process pool."""
+        self.ai.close()
 
     def minimax(
         self,
@@ -307,111 +522,44 @@ Card values:
         is_maximizing: bool,
         alpha=float("-inf"),
         beta=float("inf"),
+        stacking: int = 0,
     ):
         """
         Minimax implementation for Computer play with Alpha-Beta pruning.
 
+        Card lists are converted to bitmasks and searched by search.minimax, so both
+        APIs score positions the same way, stacking included.
+
         Args:
-            comp_hand (list[str]): Cards in computer player's hand.
-            human_hand (list[str]): Cards in human players's hand.
+            comp_hand (list[str] | int): Cards in computer player's hand.
+            human_hand (list[str] | int): Cards in human players's hand.
             last_card (str): Last played card.
             is_active (bool): Was last card an active card? True if yes.
             depth (int): How deep should the minimax go.
             is_maximizing (bool): Who is currently playing. True if computer.
             alpha (_type_, optional): Maximum pruning value. Defaults to float("-inf").
             beta (_type_, optional): Minimum pruning value. Defaults to float("inf").
+            stacking (int, optional): Cards to take against an active "*7". Defaults to 0.
 
         Returns:
             (score, best_move_tuple)
         """
-        if not comp_hand:
-            return 100, None
-        if not human_hand:
-            return -100, None
-        if depth == 0:
-            return self.evaluate_state(comp_hand, human_hand), None
-
-        current_hand = comp_hand if is_maximizing else human_hand
-
-        moves = self._get_valid_moves(current_hand, last_card, is_active, is_maximizing)
-
-        if not moves:
-            if is_active and last_card[1] == "a":
-                val, _ = self.minimax(
-                    comp_hand,
-                    human_hand,
-                    last_card,
-                    False,
-                    depth - 1,
-                    not is_maximizing,
-                    alpha,
-                    beta,
-                )
-                return val, None
-            else:
-                penalty = -10 if is_maximizing else 10
-                return self.evaluate_state(comp_hand, human_hand) + penalty, None
-
-        best_move = None
-
-        if is_maximizing:
-            max_eval = float("-inf")
-            for card, color_choice in moves:
-                new_hand = [c for c in comp_hand if c != card]
-                next_card = (color_choice, "m") if card[1] == "m" else card
-                next_active = True if card[1] in ["a", "7"] else False
-
-                eval_score, _ = self.minimax(
-                    new_hand,
-                    human_hand,
-                    next_card,
-                    next_active,
-                    depth - 1,
-                    False,
-                    alpha,
-                    beta,
-                )
-
-                if eval_score > max_eval:
-                    max_eval = eval_score
-                    best_move = (card, color_choice)
-
-                alpha = max(alpha, eval_score)
-                if beta <= alpha:
-                    break
-            return max_eval, best_move
-
-        else:
-            min_eval = float("inf")
-            for card, color_choice in moves:
-                new_hand = [c for c in human_hand if c != card]
-
-                next_card = (color_choice, "m") if card[1] == "m" else card
-                next_active = True if card[1] in ["a", "7"] else False
-
-                eval_score, _ = self.minimax(
-                    comp_hand,
-                    new_hand,
-                    next_card,
-                    next_active,
-                    depth - 1,
-                    True,
-                    alpha,
-                    beta,
-                )
-
-                if eval_score < min_eval:
-                    min_eval = eval_score
-                    best_move = (card, color_choice)
-
-                beta = min(beta, eval_score)
-                if beta <= alpha:
-                    break
-            return min_eval, best_move
-
-    def evaluate_state(self, comp_hand: list[str], human_hand: list[str]):
-        """Heuristic: Robot wants small hand, Human wants large hand."""
-        return len(human_hand) - len(comp_hand)
+        if not isinstance(comp_hand, int):
+            comp_hand = to_mask(comp_hand)
+        if not isinstance(human_hand, int):
+            human_hand = to_mask(human_hand)
+        score, move = search.minimax(
+            comp_hand,
+            human_hand,
+            top_index(last_card),
+            is_active,
+            depth,
+            is_maximizing,
+            alpha,
+            beta,
+            stacking,
+        )
+        return score, move_to_str(move) if move else None
 
     def _get_valid_moves(
         self,
@@ -420,40 +568,16 @@ Card values:
         is_active: bool,
         computer_turn: bool = False,
     ):
-        """Generates all possible moves. Returns list of tuples (card, color_choice)."""
-        valid_moves = []
-
-        if is_active and last_card[1] == "7":
-            playable = [c for c in hand if c.endswith("7")]
-
-        elif is_active and last_card[1] == "a":
-            playable = [c for c in hand if c.endswith("a")]
-
-        else:
-            playable = [c for c in hand if self._is_playable_sim(c, last_card)]
-
-        for card in playable:
-            if card[1] == "m":
-                # If playing 'm', try all suitable colors
-                valid_colors = ["l", "k", "c", "z"]
-                suitable_colors = []
-                if computer_turn:
-                    suitable_colors = {c[0] for c in hand if c != card and c[1] != "m"}
-
-                if suitable_colors:
-                    valid_colors = list(suitable_colors)
-
-                for color in valid_colors:
-                    valid_moves.append((card, color))
-            else:
-                valid_moves.append((card, None))
-
-        return valid_moves
+        """Generates all possible moves. Returns list of tuples (card, color_choice). Hand can be a bitmask."""
+        if not isinstance(hand, int):
+            hand = to_mask(hand)
+        return [
+            move_to_str(move)
+            for move in valid_moves(hand, top_index(last_card), is_active, computer_turn)
+        ]
 
     def _is_playable_sim(self, card, last_card):
-        """Lightweight version of card-play rules, without state changes."""
-
-        if last_card[1] == "m":
-            return card[0] == last_card[0] or card[1] == "m"
-
-        return card[0] == last_card[0] or card[1] == last_card[1] or card[1] == "m"
+        """Lightweight version of card-play rules, without state changes. Card can be a card bitmask."""
+        if not isinstance(card, int):
+            card = CARD_BITS[CARD_INDEX[card]]
+        return bool(card & playable_mask(top_index(last_card), False))
@@ -0,0 +1,379 @@
+from collections import Counter
+from math import log, sqrt
+import random
+import time
+from bitcards import CARD_BITS, FULL_MASK, iter_indices, to_mask
+from determinization import sample_hands
+from rules import valid_moves
+from settings import AISettings
+from state import ACTIVE_CARDS, NUMBERS, SEVENS, STACKED, GameState
+from stats import SearchStats
+
+# Random playouts longer than this are scored by the amount of cards in hand.
+ROLLOUT_PLIES = 100
+
+
+class Node:
+    """
+    Node of the information set tree, shared by every determinization.
+
+    Attributes:
+        computer (bool): Who played the move leading to the node. True if computer.
+        children (dict[tuple | None, Node]): Child nodes by move, None takes cards or stands a round.
+        visits (int): Amount of iterations which went through the node.
+        reward (float): Sum of the rewards of the player who played the move.
+        available (int): Amount of iterations in which the move was legal.
+    """
+
+    __slots__ = ("computer", "children", "visits", "reward", "available")
+
+    def __init__(self, computer: bool) -> None:
+        """
+        Initialize the Node object.
+
+        Args:
+            computer (bool): Who played the move leading to the node. True if computer.
+        """
+        self.computer = computer
+        self.children = {}
+        self.visits = 0
+        self.reward = 0.0
+        self.available = 1
+
+    def uct(self, exploration: float) -> float:
+        """
+        Returns the upper confidence bound of the node, exploring by availability.
+
+        Args:
+            exploration (float): Weight of the exploration term.
+
+        Returns:
+            float: Mean reward plus the exploration bonus.
+        """
+        visits = self.visits
+        return self.reward / visits + exploration * sqrt(log(self.available) / visits)
+
+
+class ISMCTS:
+    """
+    Information Set Monte Carlo Tree Search of the computer player's move.
+
+    Every iteration deals one determinization, the human hand is sampled from the unseen
+    cards and the rest of them is shuffled into the card pack, and walks a single tree
+    with UCT, counting how often each move was available. Moves are chosen by visits,
+    so strategies are not fused across hands like in minimax voting. Played cards are
+    not reshuffled when the card pack runs out. Every ply of the tree and the playouts
+    counts as a node of settings.max_nodes.
+
+    Attributes:
+        settings (AISettings): Settings of the computer player.
+        rng (random.Random): Random number generator of determinizations and playouts.
+        stats (SearchStats | None): Statistics to be collected.
+        max_nodes (int | None): Plies after which no new iteration starts, None for no limit.
+        nodes (int): Plies of the iterations so far.
+        exhausted (bool): True once the node budget stopped a search.
+    """
+
+    def __init__(
+        self,
+        settings: AISettings | None = None,
+        rng: random.Random | None = None,
+        stats: SearchStats | None = None,
+    ) -> None:
+        """
+        Initialize the ISMCTS object.
+
+        Args:
+            settings (AISettings | None, optional): Settings of the computer player. Defaults to AISettings().
+            rng (random.Random | None, optional): Random number generator. Defaults to one seeded by settings.seed.
+            stats (SearchStats | None, optional): Statistics to be collected. Defaults to None.
+        """
+        self.settings = settings or AISettings()
+        self.rng = rng or random.Random(self.settings.seed)
+        self.stats = stats
+        self.max_nodes = self.settings.max_nodes
+        self.nodes = 0
+        self.exhausted = False
+
+    def search(
+        self,
+        comp_hand: int,
+        top: int,
+        is_active: bool,
+        human_hand: int | None,
+        unseen_cards: list[str] | None,
+        human_count: int,
+        belief=None,
+        stacking: int = 0,
+        iterations: int | None = None,
+        deadline: float | None = None,
+    ) -> Counter:
+        """
+        Runs iterations until the iteration, node or time budget is spent, at least one.
+
+        Args:
+            comp_hand (int): Bitmask of computer player's cards.
+            top (int): Index of the top card.
+            is_active (bool): Was last card an active card? True if yes.
+            human_hand (int | None): Bitmask of human player's cards if known.
+            unseen_cards (list[str] | None): Cards the human player could be holding or drawing, the rest of them is the card pack. None with a known human hand takes every card in neither hand nor on top.
+            human_count (int): Amount of cards in human player's hand.
+            belief (HandBelief | None, optional): Observed constraints of human player's hand. Defaults to None.
+            stacking (int, optional): Cards to take against an active "*7". Defaults to 0.
+            iterations (int | None, optional): Amount of iterations. Defaults to settings.iterations.
+            deadline (float | None, optional): time.time() after which the search stops. Defaults to None.
+
+        Returns:
+            Counter: Visits of each root move, None stands for taking a card or standing a round.
+        """
+        settings = self.settings
+        if iterations is None:
+            iterations = settings.iterations
+        state = GameState(comp_hand, 0, top, is_active, stacking)
+        if unseen_cards is None:
+            # Played cards cannot be told apart from the card pack, all of them are drawn.
+            cards = list(iter_indices(FULL_MASK & ~comp_hand & ~CARD_BITS[top]))
+        else:
+            cards = list(iter_indices(to_mask(unseen_cards)))
+        if human_hand is not None:
+            hands = None
+        else:
+            hands = sample_hands(
+                unseen_cards,
+                human_count,
+                self.rng,
+                settings.sample_weights,
+                belief,
+            )
+        root = Node(False)
+        for iteration in range(iterations):
+            if iteration and deadline is not None and time.time() >= deadline:
+                break
+            spent = self.max_nodes is not None and self.nodes >= self.max_nodes
+            if iteration and spent:
+                self.exhausted = True
+                break
+            hand = human_hand if hands is None else next(hands)
+            deck = [card for card in cards if not hand & CARD_BITS[card]]
+            self.rng.shuffle(deck)
+            self.nodes += self._iterate(
+                root, comp_hand, hand, deck, state.top, state.active, state.stacking
+            )
+            if self.stats is not None:
+                self.stats.determinizations += 1
+        return Counter(
+            {move: child.visits for move, child in root.children.items()}
+        )
+
+    def _iterate(
+        self,
+        root: Node,
+        comp_hand: int,
+        human_hand: int,
+        deck: list[int],
+        top: int,
+        active: bool,
+        stacking: int,
+    ) -> int:
+        """Selects and expands one path of the tree in a determinization, plays it out, backs up the result and returns its plies."""
+        rng = self.rng
+        stats = self.stats
+        exploration = self.settings.exploration
+        # Indexed by the computer flag, hands[True] is the computer player's hand.
+        hands = [human_hand, comp_hand]
+        computer = True
+        node = root
+        path = []
+        tree = True
+        plies = 0
+        winner = None
+        while True:
+            moves = valid_moves(hands[computer], top, active, computer) or [None]
+            if tree:
+                children = node.children
+                untried = []
+                for move in moves:
+                    child = children.get(move)
+                    if child is None:
+                        untried.append(move)
+                    else:
+                        child.available += 1
+                if untried:
+                    move = rng.choice(untried)
+                    node = children[move] = Node(computer)
+                    tree = False
+                else:
+                    move = max(
+                        moves, key=lambda move: children[move].uct(exploration)
+                    )
+                    node = children[move]
+                path.append(node)
+                if stats is not None:
+                    stats.add_node(len(path))
+            elif plies >= ROLLOUT_PLIES:
+                break
+            else:
+                move = rng.choice(moves)
+
+            if move is None:
+                if active and NUMBERS[top] == "a":
+                    active = False
+                else:
+                    for _ in range(stacking or 1):
+                        if deck:
+                            hands[computer] |= CARD_BITS[deck.pop()]
+                    active = False
+                    stacking = 0
+            else:
+                card, top = move
+                hands[computer] &= ~CARD_BITS[card]
+                if not hands[computer]:
+                    winner = computer
+                    break
+                if SEVENS[card]:
+                    stacking = STACKED[stacking >> 1]
+                    active = True
+                else:
+                    active = ACTIVE_CARDS[card]
+                    stacking = 0
+            computer = not computer
+            plies += 1
+
+        if winner is None:
+            # Unfinished playouts are won by the player with fewer cards.
+            difference = hands[False].bit_count() - hands[True].bit_count()
+            reward = 0.5 if difference == 0 else float(difference > 0)
+        else:
+            reward = float(winner)
+        root.visits += 1
+        for node in path:
+            node.visits += 1
+            node.reward += reward if node.computer else 1.0 - reward
+        return plies + 1
+
+
+def run_ismcts(
+    settings: AISettings,
+    seed: int,
+    iterations: int,
+    comp_hand: int,
+    top: int,
+    is_active: bool,
+    human_hand: int | None,
+    unseen_cards: list[str] | None,
+    human_count: int,
+    belief=None,
+    stacking: int = 0,
+    deadline: float | None = None,
+    max_nodes: int | None = None,
+) -> tuple[Counter, SearchStats | None, bool]:
+    """
+    Runs one ISMCTS tree, module level so it can run in worker processes.
+
+    Args:
+        settings (AISettings): Settings of the computer player.
+        seed (int): Seed of the tree's random number generator.
+        iterations (int): Amount of iterations.
+        comp_hand (int): Bitmask of computer player's cards.
+        top (int): Index of the top card.
+        is_active (bool): Was last card an active card? True if yes.
+        human_hand (int | None): Bitmask of human player's cards if known.
+        unseen_cards (list[str] | None): Cards the human player could be holding.
+        human_count (int): Amount of cards in human player's hand.
+        belief (HandBelief | None, optional): Observed constraints of human player's hand. Defaults to None.
+        stacking (int, optional): Cards to take against an active "*7". Defaults to 0.
+        deadline (float | None, optional): time.time() after which the search stops. Defaults to None.
+        max_nodes (int | None, optional): Node budget of the tree, None for no limit. Defaults to None.
+
+    Returns:
+        tuple[Counter, SearchStats | None, bool]: Visits of each root move, the statistics if settings.stats is on and True if the nodes ran out.
+    """
+    stats = SearchStats() if settings.stats else None
+    tree = ISMCTS(settings, random.Random(seed), stats)
+    tree.max_nodes = max_nodes
+    visits = tree.search(
+        comp_hand,
+        top,
+        is_active,
+        human_hand,
+        unseen_cards,
+        human_count,
+        belief,
+        stacking,
+        iterations,
+        deadline,
+    )
+    return visits, stats, tree.exhausted
+
+
+def ismcts_parallel(
+    executor,
+    workers: int,
+    rng: random.Random,
+    settings: AISettings,
+    comp_hand: int,
+    top: int,
+    is_active: bool,
+    human_hand: int | None,
+    unseen_cards: list[str] | None,
+    human_count: int,
+    belief=None,
+    stacking: int = 0,
+    deadline: float | None = None,
+    stats: SearchStats | None = None,
+) -> tuple[Counter, bool]:
+    """
+    Root parallel ISMCTS, every worker grows its own tree and the root visits are summed.
+
+    Args:
+        executor (concurrent.futures.Executor): Executor running run_ismcts.
+        workers (int): Amount of trees, settings.iterations and settings.max_nodes are split between them.
+        rng (random.Random): Random number generator seeding the trees.
+        settings (AISettings): Settings of the computer player.
+        comp_hand (int): Bitmask of computer player's cards.
+        top (int): Index of the top card.
+        is_active (bool): Was last card an active card? True if yes.
+        human_hand (int | None): Bitmask of human player's cards if known.
+        unseen_cards (list[str] | None): Cards the human player could be holding.
+        human_count (int): Amount of cards in human player's hand.
+        belief (HandBelief | None, optional): Observed constraints of human player's hand. Defaults to None.
+        stacking (int, optional): Cards to take against an active "*7". Defaults to 0.
+        deadline (float | None, optional): time.time() after which the search stops. Defaults to None.
+        stats (SearchStats | None, optional): Statistics the workers' statistics are merged into. Defaults to None.
+
+    Returns:
+        tuple[Counter, bool]: Visits of each root move summed over all trees, True if a tree ran out of nodes.
+    """
+    workers = max(1, min(workers, settings.iterations))
+    share, rest = divmod(settings.iterations, workers)
+    max_nodes = settings.max_nodes
+    if max_nodes is not None:
+        max_nodes = max(1, max_nodes // workers)
+    futures = [
+        executor.submit(
+            run_ismcts,
+            settings,
+            rng.getrandbits(64),
+            share + (worker < rest),
+            comp_hand,
+            top,
+            is_active,
+            human_hand,
+            unseen_cards,
+            human_count,
+            belief,
+            stacking,
+            deadline,
+            max_nodes,
+        )
+        for worker in range(workers)
+    ]
+    visits = Counter()
+    exhausted = False
+    for future in futures:
+        tree_visits, tree_stats, tree_exhausted = future.result()
+        visits.update(tree_visits)
+        exhausted = exhausted or tree_exhausted
+        if stats is not None and tree_stats is not None:
+            stats.merge(tree_stats)
+    return visits, exhausted
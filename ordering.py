@@ -0,0 +1,94 @@
+from bitcards import ACTIVE_MASK, CARD_BITS, CARDS
+from strength import MAX_STRENGTH, HandStrength
+
+TT_MOVE_SCORE = 1 << 30
+ACTIVE_SCORE = 1 << 29
+KILLER_SCORE = 1 << 28
+
+
+class MoveOrdering:
+    """
+    Move ordering heuristics for the Alpha-Beta search.
+
+    Moves are tried in this order: the transposition table (or previous iteration) move,
+    active cards ("*7" and "*a"), killer moves of the ply, then by history score.
+    With a hand strength table, moves of equal score leaving the stronger hand go first.
+
+    Attributes:
+        killers (list[list]): Two most recent moves which caused a cutoff, for every ply.
+        history (list[list[int]]): History score of every card, history[is_maximizing][card index].
+        strength (HandStrength | None): Strengths of the hands left after a move.
+    """
+
+    def __init__(self, strength: HandStrength | None = None) -> None:
+        """
+        Initialize the MoveOrdering object with empty killers and history.
+
+        Args:
+            strength (HandStrength | None, optional): Strengths of the hands left after a move. Defaults to None.
+        """
+        self.killers = []
+        self.history = [[0] * len(CARDS), [0] * len(CARDS)]
+        self.strength = strength
+
+    def order(
+        self, moves: list, ply: int, tt_move, is_maximizing: bool, hand: int = 0
+    ) -> list[tuple[int, int]]:
+        """
+        Sorts moves so that the most promising ones are searched first.
+
+        Args:
+            moves (list[tuple[int, int]]): Moves to be sorted.
+            ply (int): Distance from the root of the search.
+            tt_move (tuple[int, int] | None): Best move from the transposition table.
+            is_maximizing (bool): Who is currently playing. True if computer.
+            hand (int, optional): Bitmask of the moving player's cards, 0 ignores hand strength. Defaults to 0.
+
+        Returns:
+            list[tuple[int, int]]: Sorted moves.
+        """
+        if len(moves) < 2:
+            return moves
+        killers = self.killers[ply] if ply < len(self.killers) else ()
+        history = self.history[is_maximizing]
+
+        def score(move):
+            card = move[0]
+            value = history[card]
+            if move == tt_move:
+                value += TT_MOVE_SCORE
+            if CARD_BITS[card] & ACTIVE_MASK:
+                value += ACTIVE_SCORE
+            if move in killers:
+                value += KILLER_SCORE
+            return value
+
+        strength = self.strength
+        # Every hand left after a move has one card less.
+        if strength is not None and hand and strength.covers(hand & (hand - 1)):
+
+            def score_with_strength(move):
+                # The other heuristics stay first, strength only breaks their ties.
+                left = hand & ~CARD_BITS[move[0]]
+                return score(move) * (MAX_STRENGTH + 1) + strength.strength(left)
+
+            return sorted(moves, key=score_with_strength, reverse=True)
+        return sorted(moves, key=score, reverse=True)
+
+    def record_cutoff(self, move, ply: int, depth: int, is_maximizing: bool) -> None:
+        """
+        Remembers a move which caused a beta cutoff.
+
+        Args:
+            move (tuple[int, int]): Move which caused the cutoff.
+            ply (int): Distance from the root of the search.
+            depth (int): Remaining depth of the search.
+            is_maximizing (bool): Who is currently playing. True if computer.
+        """
+        while len(self.killers) <= ply:
+            self.killers.append([None, None])
+        killers = self.killers[ply]
+        if killers[0] != move:
+            killers[1] = killers[0]
+            killers[0] = move
+        self.history[is_maximizing][move[0]] += depth * depth
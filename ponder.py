@@ -0,0 +1,124 @@
+import threading
+from cache import decision_key
+from settings import AISettings
+
+
+class Ponderer:
+    """
+    Searches the computer player's answers to likely human moves in a background thread.
+
+    Answers are keyed by decision_key, so an answer is only used for exactly the position
+    it was searched for. A search already running when pondering is cancelled still
+    completes, searches are not interrupted halfway.
+
+    Attributes:
+        settings (AISettings): Settings of the computer player.
+        create_ai (Callable[[], ComputerAI]): Creates the computer player searching in the thread.
+        answers (dict[str, tuple]): Searched moves by decision key, () for taking a card or standing a round. Moves of searches cut short by the deadline or the node budget are left out.
+        searching (str | None): Key of the position being searched.
+        hits (int): Amount of decisions answered by pondering.
+    """
+
+    def __init__(self, settings: AISettings, create_ai) -> None:
+        """
+        Initialize the Ponderer object, nothing is searched until ponder is called.
+
+        Args:
+            settings (AISettings): Settings of the computer player.
+            create_ai (Callable[[], ComputerAI]): Creates the computer player searching in the thread.
+        """
+        self.settings = settings
+        self.create_ai = create_ai
+        self.answers = {}
+        self.searching = None
+        self.hits = 0
+        self._condition = threading.Condition()
+        self._stop = threading.Event()
+        self._thread = None
+
+    def ponder(self, positions) -> None:
+        """
+        Starts searching positions in the background, earlier answers are forgotten.
+
+        Args:
+            positions (Iterable[tuple]): Arguments of ComputerAI.choose_move, most likely first.
+        """
+        self.cancel()
+        self._stop = threading.Event()
+        with self._condition:
+            self.answers = {}
+            self.searching = None
+        self._thread = threading.Thread(
+            target=self._run,
+            args=(list(positions), self.answers, self._stop),
+            daemon=True,
+        )
+        self._thread.start()
+
+    def _run(self, positions: list[tuple], answers: dict, stop: threading.Event) -> None:
+        """Searches the positions until all are answered or pondering is cancelled."""
+        ai = self.create_ai()
+        try:
+            for arguments in positions:
+                key = decision_key(self.settings, *arguments)
+                with self._condition:
+                    if stop.is_set():
+                        break
+                    if key in answers:
+                        continue
+                    self.searching = key
+                move = ai.choose_move(*arguments)
+                with self._condition:
+                    # Answers of a cut search are searched again on the computer turn.
+                    if ai.fallback is None and not ai.interrupted:
+                        answers[key] = move or ()
+                    if self.answers is answers:
+                        self.searching = None
+                    self._condition.notify_all()
+        finally:
+            with self._condition:
+                if self.answers is answers:
+                    self.searching = None
+                self._condition.notify_all()
+            ai.close()
+
+    def answer(self, key: str) -> tuple | None:
+        """
+        Returns the pondered move of a position and stops pondering.
+
+        Waits if the position is being searched right now.
+
+        Args:
+            key (str): Key of the decision, see decision_key.
+
+        Returns:
+            (tuple | None): The move, () for taking a card or standing a round, None if not pondered.
+        """
+        with self._condition:
+            self._condition.wait_for(
+                lambda: key in self.answers or self.searching != key
+            )
+            move = self.answers.get(key)
+        self.cancel()
+        if move is not None:
+            self.hits += 1
+        return move
+
+    def wait(self, timeout: float | None = None) -> bool:
+        """
+        Waits until every position is searched or pondering is cancelled.
+
+        Args:
+            timeout (float | None, optional): Maximum seconds to wait. Defaults to None.
+
+        Returns:
+            bool: True if the thread finished.
+        """
+        if self._thread is not None:
+            self._thread.join(timeout)
+            return not self._thread.is_alive()
+        return True
+
+    def cancel(self) -> None:
+        """Stops pondering after the running search."""
+        self._stop.set()
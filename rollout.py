@@ -0,0 +1,229 @@
+from bitcards import CARD_BITS, CARDS, FULL_MASK, NUMBERS
+from rules import SEARCH_PLAYABLE
+from state import MAX_STACKING, GameState
+
+try:
+    import numpy as np
+except ImportError:  # NumPy is optional, only rollouts need it.
+    np = None
+
+ACE = NUMBERS.index("a")
+SEVEN = NUMBERS.index("7")
+CHANGER = NUMBERS.index("m")
+
+
+class RolloutEvaluator:
+    """
+    Scores positions by the win rate of random playouts, all of them played at once.
+
+    The playouts are NumPy arrays with one row per game: hands are 64-bit bitmasks,
+    the card pack is a shuffled row of card indices, and the legal cards of every game
+    come from one lookup in the playable table. Every step plays one turn in all games
+    which are not finished, a random legal card or taking cards. Played cards are not
+    reshuffled when the card pack runs out.
+
+    Attributes:
+        games (int): Amount of playouts per position.
+        max_plies (int): Turns after which a playout is won by the player with fewer cards.
+        max_entries (int): Scored positions kept in the cache, it is cleared when full.
+        rng (numpy.random.Generator): Random number generator of the playouts.
+        cache (dict[tuple, float]): Win rates of scored positions.
+    """
+
+    def __init__(
+        self,
+        games: int = 256,
+        seed: int | None = None,
+        max_plies: int = 100,
+        max_entries: int = 1 << 16,
+    ) -> None:
+        """
+        Initialize the RolloutEvaluator object.
+
+        Args:
+            games (int, optional): Amount of playouts per position. Defaults to 256.
+            seed (int | None, optional): Seed of the playouts. Defaults to None.
+            max_plies (int, optional): Turns after which a playout is stopped. Defaults to 100.
+            max_entries (int, optional): Scored positions kept in the cache. Defaults to 65536.
+
+        Raises:
+            ImportError: If NumPy is not installed.
+        """
+        if np is None:
+            raise ImportError("rollouts need NumPy, install it with: pip install numpy")
+        self.games = games
+        self.max_plies = max_plies
+        self.max_entries = max_entries
+        self.rng = np.random.default_rng(seed)
+        self.cache = {}
+        self._playable = np.array(SEARCH_PLAYABLE, dtype=np.uint64)
+        self._bits = np.array(CARD_BITS, dtype=np.uint64)
+        self._shifts = np.arange(len(CARDS), dtype=np.uint64)
+
+    def equity(
+        self,
+        comp_hand: int,
+        human_hand: int,
+        top: int,
+        is_active: bool = False,
+        stacking: int = 0,
+        computer: bool = True,
+        pack: int | None = None,
+    ) -> float:
+        """
+        Returns the computer player's win rate in random playouts of a position.
+
+        Args:
+            comp_hand (int): Bitmask of computer player's cards.
+            human_hand (int): Bitmask of human player's cards.
+            top (int): Index of the top card.
+            is_active (bool, optional): Was last card an active card? True if yes. Defaults to False.
+            stacking (int, optional): Cards to take against an active "*7". Defaults to 0.
+            computer (bool, optional): Who is currently playing. True if computer. Defaults to True.
+            pack (int | None, optional): Bitmask of the card pack. Defaults to every card not in hand or on top.
+
+        Returns:
+            float: Fraction of won playouts, unfinished ones count by cards in hand.
+        """
+        state = GameState(comp_hand, human_hand, top, is_active, stacking, computer)
+        key = state.snapshot() + (pack,)
+        value = self.cache.get(key)
+        if value is None:
+            if pack is None:
+                pack = FULL_MASK & ~comp_hand & ~human_hand & ~CARD_BITS[top]
+            value = self._play(state, pack)
+            if len(self.cache) >= self.max_entries:
+                self.cache.clear()
+            self.cache[key] = value
+        return value
+
+    def score(
+        self,
+        comp_hand: int,
+        human_hand: int,
+        top: int,
+        is_active: bool,
+        is_maximizing: bool,
+        stacking: int = 0,
+    ) -> int:
+        """
+        Returns a search leaf score from the win rate, between -50 and 50.
+
+        Wins and losses of the search stay at 100 and -100, so a certain result always
+        beats an estimate.
+
+        Args:
+            comp_hand (int): Bitmask of computer player's cards.
+            human_hand (int): Bitmask of human player's cards.
+            top (int): Index of the top card.
+            is_active (bool): Was last card an active card? True if yes.
+            is_maximizing (bool): Who is currently playing. True if computer.
+            stacking (int, optional): Cards to take against an active "*7". Defaults to 0.
+
+        Returns:
+            int: Score of the leaf.
+        """
+        equity = self.equity(
+            comp_hand, human_hand, top, is_active, stacking, is_maximizing
+        )
+        return round(100 * equity) - 50
+
+    def _play(self, state: GameState, pack: int) -> float:
+        """Plays self.games random playouts of a position and returns the win rate."""
+        rng = self.rng
+        playable = self._playable
+        bits = self._bits
+        shifts = self._shifts
+        n = self.games
+        rows = np.arange(n)
+        # Column 1 is the computer player, like the computer flag used as an index.
+        hands = np.empty((n, 2), dtype=np.uint64)
+        hands[:, 0] = state.human_hand
+        hands[:, 1] = state.comp_hand
+        turn = np.full(n, int(state.computer))
+        top = np.full(n, state.top)
+        active = np.full(n, state.active)
+        stacking = np.full(n, state.stacking)
+        cards = np.array(
+            [index for index in range(len(CARDS)) if pack >> index & 1], dtype=np.int64
+        )
+        deck = rng.permuted(np.tile(cards, (n, 1)), axis=1)
+        drawn = np.zeros(n, dtype=np.int64)
+        running = np.ones(n, dtype=bool)
+        winner = np.full(n, -1)
+
+        for _ in range(self.max_plies):
+            if not running.any():
+                break
+            hand = hands[rows, turn]
+            legal = hand & playable[top * 2 + active]
+            choices = ((legal[:, None] >> shifts) & 1).astype(bool)
+            weights = np.where(choices, rng.random(choices.shape), -1.0)
+            card = weights.argmax(axis=1)
+            number = card % len(NUMBERS)
+
+            play = running & choices.any(axis=1)
+            hand = np.where(play, hand & ~bits[card], hand)
+            hands[rows, turn] = hand
+            colors = rng.integers(0, 4, n) * len(NUMBERS) + CHANGER
+            top = np.where(play, np.where(number == CHANGER, colors, card), top)
+            seven = number == SEVEN
+            stacking = np.where(
+                play,
+                np.where(seven, np.minimum(stacking + 2, MAX_STACKING), 0),
+                stacking,
+            )
+            won = play & (hand == 0)
+            winner[won] = turn[won]
+
+            passing = running & ~play
+            stand = passing & active & (top % len(NUMBERS) == ACE)
+            take = passing & ~stand
+            count = np.where(take, np.maximum(stacking, 1), 0)
+            for taken in range(MAX_STACKING):
+                draw = (count > taken) & (drawn < len(cards))
+                if not draw.any():
+                    break
+                draw_rows = rows[draw]
+                hands[draw_rows, turn[draw]] |= bits[deck[draw_rows, drawn[draw]]]
+                drawn[draw] += 1
+            active = np.where(play, seven | (number == ACE), active & ~passing)
+            stacking = np.where(take, 0, stacking)
+            running &= ~won
+            turn = np.where(running, 1 - turn, turn)
+
+        counts = ((hands[:, :, None] >> shifts) & 1).sum(axis=2).astype(np.int64)
+        difference = counts[:, 0] - counts[:, 1]
+        rewards = np.where(
+            winner >= 0, winner, np.where(difference == 0, 0.5, difference > 0)
+        )
+        return float(rewards.mean())
+
+
+def position_equity(
+    comp_hand: int,
+    human_hand: int,
+    top: int,
+    is_active: bool = False,
+    stacking: int = 0,
+    games: int = 1000,
+    seed: int | None = None,
+) -> float:
+    """
+    Returns the computer player's win rate in random playouts, the computer player to move.
+
+    Args:
+        comp_hand (int): Bitmask of computer player's cards.
+        human_hand (int): Bitmask of human player's cards.
+        top (int): Index of the top card.
+        is_active (bool, optional): Was last card an active card? True if yes. Defaults to False.
+        stacking (int, optional): Cards to take against an active "*7". Defaults to 0.
+        games (int, optional): Amount of playouts. Defaults to 1000.
+        seed (int | None, optional): Seed of the playouts. Defaults to None.
+
+    Returns:
+        float: Fraction of won playouts.
+    """
+    return RolloutEvaluator(games, seed).equity(
+        comp_hand, human_hand, top, is_active, stacking
+    )
@@ -0,0 +1,154 @@
+from bitcards import (
+    CARD_BITS,
+    CARD_INDEX,
+    CARDS,
+    COLOR_MASKS,
+    COLORS,
+    MOVES,
+    NUMBER_MASKS,
+)
+
+# Rule state is (top card, desired color or None, active flag), the "which cards can be
+# played" answer for every state is computed once at import time.
+DESIRED = COLORS + (None,)
+
+
+def _playable(card: str, last_card: str, desired_color: str | None, active: bool) -> bool:
+    """Reference card-play rules the tables are built from."""
+    if active:
+        match last_card[1]:
+            case "7" | "a":
+                return last_card[1] == card[1]
+            case "m":
+                return card[0] == desired_color or card[1] == "m"
+    return (
+        ((last_card[0] == card[0] or last_card[1] == card[1]) and desired_color is None)
+        or (card[0] == desired_color and desired_color is not None)
+        or card[1] == "m"
+    )
+
+
+def state_index(top: int, desired_color: str | None, active: bool) -> int:
+    """
+    Returns the index of a rule state in PLAYABLE.
+
+    Args:
+        top (int): Index of the top card.
+        desired_color (str | None): The color the player switched to with an "*m" card.
+        active (bool): Is the top card an active card?
+
+    Returns:
+        int: Index of the state.
+    """
+    return (top * len(DESIRED) + DESIRED.index(desired_color)) * 2 + active
+
+
+PLAYABLE = tuple(
+    sum(
+        CARD_BITS[index]
+        for index, card in enumerate(CARDS)
+        if _playable(card, top_card, desired_color, active)
+    )
+    for top_card in CARDS
+    for desired_color in DESIRED
+    for active in (False, True)
+)
+
+# The search keeps a color change as the "*m" card of the chosen color on top.
+SEARCH_PLAYABLE = tuple(
+    PLAYABLE[
+        state_index(top, card[0] if card[1:] == "m" else None, active)
+    ]
+    for top, card in enumerate(CARDS)
+    for active in (False, True)
+)
+
+
+def game_playable_mask(last_card: str, desired_color: str | None, active: bool) -> int:
+    """
+    Returns the bitmask of cards playable in a game state.
+
+    Args:
+        last_card (str): Last played card.
+        desired_color (str | None): The color the player switched to with an "*m" card.
+        active (bool): Is the top card an active card?
+
+    Returns:
+        int: Bitmask of playable cards.
+    """
+    return PLAYABLE[state_index(CARD_INDEX[last_card], desired_color, active)]
+
+
+def playable_mask(top: int, is_active: bool) -> int:
+    """
+    Returns the bitmask of all cards that can be played on a top card in the search.
+
+    Args:
+        top (int): Index of the top card, a color change is the "*m" card of the chosen color.
+        is_active (bool): Is the top card an active card?
+
+    Returns:
+        int: Bitmask of playable cards.
+    """
+    return SEARCH_PLAYABLE[top * 2 + is_active]
+
+
+def valid_moves(
+    hand: int, top: int, is_active: bool, computer_turn: bool = False
+) -> list[tuple[int, int]]:
+    """
+    Generates all possible moves of a hand.
+
+    Args:
+        hand (int): Bitmask of the cards in hand.
+        top (int): Index of the top card.
+        is_active (bool): Is the top card an active card?
+        computer_turn (bool, optional): Restricts color changes to colors left in hand. Defaults to False.
+
+    Returns:
+        list[tuple[int, int]]: Moves as (card index, resulting top card index).
+    """
+    moves = []
+    playable = hand & SEARCH_PLAYABLE[top * 2 + is_active]
+    while playable:
+        low = playable & -playable
+        playable ^= low
+        card_moves = MOVES[low.bit_length() - 1]
+        if computer_turn and len(card_moves) > 1:
+            rest = hand & ~NUMBER_MASKS["m"]
+            suitable = [
+                move
+                for move, color in zip(card_moves, COLORS)
+                if rest & COLOR_MASKS[color]
+            ]
+            if suitable:
+                card_moves = suitable
+        moves.extend(card_moves)
+    return moves
+
+
+def greedy_move(
+    hand: int, top: int, is_active: bool, computer_turn: bool = False
+) -> tuple[int, int] | None:
+    """
+    Returns the move of a cheap greedy policy, active cards first and color changers last.
+
+    Args:
+        hand (int): Bitmask of the cards in hand.
+        top (int): Index of the top card.
+        is_active (bool): Is the top card an active card?
+        computer_turn (bool, optional): Restricts color changes to colors left in hand. Defaults to False.
+
+    Returns:
+        (tuple[int, int] | None): The move, None if no card can be played.
+    """
+    moves = valid_moves(hand, top, is_active, computer_turn)
+    if not moves:
+        return None
+    return min(
+        moves,
+        key=lambda move: (
+            CARDS[move[0]][1:] not in ("7", "a"),
+            CARDS[move[0]][1:] == "m",
+        ),
+    )
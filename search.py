@@ -0,0 +1,1075 @@
+from collections import Counter, deque
+from functools import partial
+import itertools as i
+from math import comb
+import random
+import time
+from bitcards import CARD_BITS, CARDS, FULL_MASK, iter_indices
+from rules import playable_mask, valid_moves
+from ordering import MoveOrdering
+from rollout import RolloutEvaluator
+from settings import AISettings
+from state import ACTIVE_CARDS, SEVENS, STACKED, GameState
+from stats import SearchStats
+from strength import HandStrength, load_strength
+from symmetry import ColorSymmetry
+from tablebase import Tablebase, load_tablebase
+from transposition import (
+    COMP_KEYS,
+    EXACT,
+    HUMAN_KEYS,
+    LOWER,
+    SIDE_KEY,
+    STACK_KEYS,
+    STATE_KEYS,
+    UPPER,
+    TranspositionTable,
+    pack_key,
+    zobrist_key,
+)
+
+
+# Chance node draws cached by one searcher, the cache is cleared when full.
+DRAW_ENTRIES = 4096
+
+
+class SearchTimeout(Exception):
+    """Raised inside the search when its deadline has passed."""
+
+    pass
+
+
+class NodeBudgetExceeded(SearchTimeout):
+    """Raised inside the search when it visited max_nodes nodes."""
+
+    pass
+
+
+def evaluate_state(comp_hand: int, human_hand: int) -> int:
+    """Heuristic: Robot wants small hand, Human wants large hand."""
+    return human_hand.bit_count() - comp_hand.bit_count()
+
+
+class Searcher:
+    """
+    Alpha-Beta search over bitmask hands.
+
+    Attributes:
+        table (TranspositionTable | None): Transposition table shared by all searches of this searcher.
+        deadline (float | None): time.time() after which the search raises SearchTimeout.
+        ordering (MoveOrdering | None): Move ordering heuristics, None searches moves in hand order.
+        stats (SearchStats | None): Collected statistics, None collects nothing.
+        tablebase (Tablebase | None): Exact scores of positions with small hands.
+        evaluator (RolloutEvaluator | None): Scores leaves and players taking cards by random playouts, None by card counts.
+        chance_samples (int): Draws searched when a player takes cards, 0 scores taking cards with a fixed penalty.
+        draws (dict[tuple[int, int], tuple[int, ...]]): Searched draws by card pack and amount of cards, at most DRAW_ENTRIES.
+        unseen (int | None): Bitmask of the cards the human player could hold or draw, the human hand and the card pack. None takes every card in neither hand nor on top for the card pack.
+        pack (int | None): Bitmask of the card pack of the current root search, derived from unseen.
+        pack_key (int): Key of pack XORed into every transposition table key when chance nodes draw from it, else 0.
+        max_nodes (int | None): Nodes after which the search raises NodeBudgetExceeded, checked every 64 nodes.
+        exhausted (bool): True once the node budget stopped a search.
+        strength (HandStrength | None): Hand strengths breaking ties between card counts at leaves.
+        nodes (int): Amount of visited nodes.
+    """
+
+    def __init__(
+        self,
+        table: TranspositionTable | None = None,
+        deadline: float | None = None,
+        ordering: MoveOrdering | None = None,
+        stats: SearchStats | None = None,
+        tablebase: Tablebase | None = None,
+        evaluator: RolloutEvaluator | None = None,
+        chance_samples: int = 0,
+        max_nodes: int | None = None,
+        strength: HandStrength | None = None,
+    ) -> None:
+        """
+        Initialize the Searcher object.
+
+        Args:
+            table (TranspositionTable | None, optional): Transposition table to use. Defaults to None.
+            deadline (float | None, optional): time.time() after which the search stops. Defaults to None.
+            ordering (MoveOrdering | None, optional): Move ordering heuristics. Defaults to None.
+            stats (SearchStats | None, optional): Statistics to be collected. Defaults to None.
+            tablebase (Tablebase | None, optional): Exact scores of small positions. Defaults to None.
+            evaluator (RolloutEvaluator | None, optional): Scores leaves by random playouts. Defaults to None.
+            chance_samples (int, optional): Draws searched when a player takes cards. Defaults to 0.
+            max_nodes (int | None, optional): Nodes after which the search stops. Defaults to None.
+            strength (HandStrength | None, optional): Hand strengths scoring leaves. Defaults to None.
+        """
+        self.table = table
+        self.deadline = deadline
+        self.ordering = ordering
+        self.stats = stats
+        self.tablebase = tablebase
+        self.evaluator = evaluator
+        self.chance_samples = chance_samples
+        self.draws = {}
+        self.unseen = None
+        self.pack = None
+        self.pack_key = 0
+        self.max_nodes = max_nodes
+        self.exhausted = False
+        self.strength = strength
+        self.nodes = 0
+
+    @staticmethod
+    def from_settings(
+        settings: AISettings,
+        deadline: float | None = None,
+        stats: SearchStats | None = None,
+    ):
+        """
+        Creates a searcher configured by the computer player's settings.
+
+        Args:
+            settings (AISettings): Settings of the computer player.
+            deadline (float | None, optional): time.time() after which the search stops. Defaults to None.
+            stats (SearchStats | None, optional): Statistics to be collected. Defaults to None.
+
+        Returns:
+            Searcher: New searcher with its own transposition table.
+        """
+        strength = (
+            load_strength(settings.strength_table) if settings.strength_table else None
+        )
+        return Searcher(
+            TranspositionTable(settings.tt_size, settings.tt_replacement)
+            if settings.tt_size
+            else None,
+            deadline,
+            MoveOrdering(strength) if settings.move_ordering else None,
+            stats,
+            load_tablebase(settings.tablebase) if settings.tablebase else None,
+            RolloutEvaluator(
+                settings.rollouts, settings.seed, max_entries=settings.rollout_entries
+            )
+            if settings.rollouts
+            else None,
+            settings.chance_samples,
+            settings.max_nodes,
+            strength,
+        )
+
+    def search_root(
+        self,
+        comp_hand: int,
+        human_hand: int,
+        top: int,
+        is_active: bool,
+        depth: int,
+        first_move: tuple[int, int] | None = None,
+        stacking: int = 0,
+    ):
+        """
+        Searches the computer player's moves at the root of the search.
+
+        The first_move, or the best move stored in the transposition table by a shallower
+        iteration, is searched first for better pruning. Ties are searched exactly and go to
+        the earliest move in hand order, so the answer is the same as minimax's whatever
+        move is searched first.
+
+        Args:
+            comp_hand (int): Bitmask of computer player's cards.
+            human_hand (int): Bitmask of human player's cards.
+            top (int): Index of the top card.
+            is_active (bool): Was last card an active card? True if yes.
+            depth (int): How deep should the minimax go.
+            first_move (tuple[int, int] | None, optional): Move to search first. Defaults to None.
+            stacking (int, optional): Cards to take against an active "*7". Defaults to 0.
+
+        Returns:
+            (score, best_move) where best_move is (card index, resulting top card index).
+        """
+        self.set_root(human_hand)
+        state = GameState(comp_hand, human_hand, top, is_active, stacking)
+        moves = state.moves() if human_hand else []
+        if not moves or depth == 0:
+            return self.search(state, depth)
+
+        table = self.table
+        if table is not None and first_move is None:
+            first_move = table.probe_move(state.key ^ self.pack_key)
+        if self.ordering is not None:
+            order = self.ordering.order(moves, 0, first_move, True, comp_hand)
+        elif first_move in moves:
+            order = [first_move] + [move for move in moves if move != first_move]
+        else:
+            order = moves
+        if self.stats is not None:
+            self.stats.add_node(0)
+
+        best_eval = float("-inf")
+        best_index = None
+        for move in order:
+            if self.deadline is not None and time.time() >= self.deadline:
+                raise SearchTimeout()
+            state.make_move(move)
+            eval_score, _ = self.search(
+                state, depth - 1, best_eval - 1, float("inf"), 1
+            )
+            state.unmake_move()
+            index = moves.index(move)
+            if eval_score > best_eval or (
+                eval_score == best_eval and index < best_index
+            ):
+                best_eval = eval_score
+                best_index = index
+
+        if table is not None:
+            table.store(
+                state.key ^ self.pack_key, depth, best_eval, EXACT, moves[best_index]
+            )
+        if self.stats is not None:
+            self.stats.depth = max(self.stats.depth, depth)
+        return best_eval, moves[best_index]
+
+    def iterative_deepening(
+        self,
+        comp_hand: int,
+        human_hand: int,
+        top: int,
+        is_active: bool,
+        max_depth: int,
+        stacking: int = 0,
+    ):
+        """
+        Searches one position deeper and deeper until max_depth or the deadline.
+
+        Every iteration starts with the best move of the previous one. The first iteration
+        always completes, later ones are thrown away when the deadline or the node budget
+        interrupts them.
+
+        Args:
+            comp_hand (int): Bitmask of computer player's cards.
+            human_hand (int): Bitmask of human player's cards.
+            top (int): Index of the top card.
+            is_active (bool): Was last card an active card? True if yes.
+            max_depth (int): Maximum depth of the last iteration.
+            stacking (int, optional): Cards to take against an active "*7". Defaults to 0.
+
+        Returns:
+            (score, best_move, depth) of the deepest completed iteration.
+        """
+        deadline = self.deadline
+        max_nodes = self.max_nodes
+        self.deadline = None
+        self.max_nodes = None
+        try:
+            score, move = self.search_root(
+                comp_hand, human_hand, top, is_active, 1, stacking=stacking
+            )
+            completed = 1
+            self.deadline = deadline
+            self.max_nodes = max_nodes
+            for depth in range(2, max_depth + 1):
+                score, move = self.search_root(
+                    comp_hand, human_hand, top, is_active, depth, move, stacking
+                )
+                completed = depth
+        except SearchTimeout:
+            pass
+        finally:
+            self.deadline = deadline
+            self.max_nodes = max_nodes
+        return score, move, completed
+
+    def solve(
+        self,
+        comp_hand: int,
+        human_hand: int,
+        top: int,
+        is_active: bool,
+        stacking: int = 0,
+    ):
+        """
+        Searches a position to the end with MTD(f).
+
+        Searches to max_useful_depth, so every line ends in a win, a loss or a player
+        without a move. Taking cards is scored with the fixed penalty, the drawn cards are
+        unknown, so only a score of 100 or -100 is exact, see is_solved: a win or a loss
+        forced without drawing any card. Each MTD(f) pass is a null window search, the
+        transposition table keeps the bounds between passes. The earliest move in hand
+        order reaching the score is returned, the same move search_root would choose at
+        that depth.
+
+        Args:
+            comp_hand (int): Bitmask of computer player's cards.
+            human_hand (int): Bitmask of human player's cards.
+            top (int): Index of the top card.
+            is_active (bool): Was last card an active card? True if yes.
+            stacking (int, optional): Cards to take against an active "*7". Defaults to 0.
+
+        Returns:
+            (score, best_move) where best_move is (card index, resulting top card index).
+        """
+        chance_samples = self.chance_samples
+        self.chance_samples = 0
+        try:
+            return self._solve(comp_hand, human_hand, top, is_active, stacking)
+        finally:
+            self.chance_samples = chance_samples
+
+    def _solve(
+        self,
+        comp_hand: int,
+        human_hand: int,
+        top: int,
+        is_active: bool,
+        stacking: int = 0,
+    ):
+        """MTD(f) passes of solve."""
+        depth = max_useful_depth(comp_hand.bit_count() + human_hand.bit_count())
+        state = GameState(comp_hand, human_hand, top, is_active, stacking)
+        moves = state.moves() if human_hand else []
+        if not moves:
+            return self.search(state, depth)
+        if self.table is None:
+            self.table = TranspositionTable()
+
+        score = evaluate_state(comp_hand, human_hand)
+        lower, upper = float("-inf"), float("inf")
+        while lower < upper:
+            beta = max(score, lower + 1)
+            score, _ = self.search(state, depth, beta - 1, beta)
+            if score < beta:
+                upper = score
+            else:
+                lower = score
+
+        for move in moves:
+            state.make_move(move)
+            child, _ = self.search(state, depth - 1, score - 1, score, 1)
+            state.unmake_move()
+            if child >= score:
+                return score, move
+        # Bounds of different windows in the table can disagree, search plainly then.
+        return self.search_root(
+            comp_hand, human_hand, top, is_active, depth, stacking=stacking
+        )
+
+    def minimax(
+        self,
+        comp_hand: int,
+        human_hand: int,
+        top: int,
+        is_active: bool,
+        depth: int,
+        is_maximizing: bool,
+        alpha=float("-inf"),
+        beta=float("inf"),
+        stacking: int = 0,
+    ):
+        """
+        Minimax with Alpha-Beta pruning over bitmask hands.
+
+        Mirrors GameRunner.minimax, but hands are bitmasks and the top card is a card index,
+        so no lists are built while searching.
+
+        Args:
+            comp_hand (int): Bitmask of computer player's cards.
+            human_hand (int): Bitmask of human player's cards.
+            top (int): Index of the top card.
+            is_active (bool): Was last card an active card? True if yes.
+            depth (int): How deep should the minimax go.
+            is_maximizing (bool): Who is currently playing. True if computer.
+            alpha (_type_, optional): Maximum pruning value. Defaults to float("-inf").
+            beta (_type_, optional): Minimum pruning value. Defaults to float("inf").
+            stacking (int, optional): Cards to take against an active "*7". Defaults to 0.
+
+        Returns:
+            (score, best_move) where best_move is (card index, resulting top card index).
+        """
+        self.set_root(human_hand)
+        state = GameState(
+            comp_hand, human_hand, top, is_active, stacking, is_maximizing
+        )
+        return self.search(state, depth, alpha, beta)
+
+    def set_root(self, human_hand: int) -> None:
+        """Derives the card pack of a root search from unseen, the human hand is not in it."""
+        self.pack = None if self.unseen is None else self.unseen & ~human_hand
+        # Chance nodes below a position depend on the pack, so it keys the table too.
+        self.pack_key = 0
+        if self.pack is not None and self.chance_samples:
+            self.pack_key = pack_key(self.pack)
+
+    def search(
+        self,
+        state: GameState,
+        depth: int,
+        alpha=float("-inf"),
+        beta=float("inf"),
+        ply: int = 0,
+    ):
+        """
+        Alpha-Beta search of a position, see minimax.
+
+        Args:
+            state (GameState): Position to be searched, it is not changed.
+            depth (int): How deep should the minimax go.
+            alpha (_type_, optional): Maximum pruning value. Defaults to float("-inf").
+            beta (_type_, optional): Minimum pruning value. Defaults to float("inf").
+            ply (int, optional): Distance from the root of the search. Defaults to 0.
+
+        Returns:
+            (score, best_move) where best_move is (card index, resulting top card index).
+        """
+        return self._minimax(
+            state.comp_hand,
+            state.human_hand,
+            state.top,
+            state.active,
+            depth,
+            state.computer,
+            alpha,
+            beta,
+            None if self.table is None else state.key ^ self.pack_key,
+            ply,
+            state.stacking,
+        )
+
+    def _minimax(
+        self,
+        comp_hand: int,
+        human_hand: int,
+        top: int,
+        is_active: bool,
+        depth: int,
+        is_maximizing: bool,
+        alpha=float("-inf"),
+        beta=float("inf"),
+        key: int | None = None,
+        ply: int = 0,
+        stacking: int = 0,
+    ):
+        """
+        Recursion of search over plain integers, see minimax.
+
+        A GameState would need a make_move and an unmake_move call per node, which costs
+        about as much as the rest of the node in CPython, so positions are passed as
+        arguments here. stacking has to be normalized as in GameState.
+
+        Args:
+            comp_hand (int): Bitmask of computer player's cards.
+            human_hand (int): Bitmask of human player's cards.
+            top (int): Index of the top card.
+            is_active (bool): Was last card an active card? True if yes.
+            depth (int): How deep should the minimax go.
+            is_maximizing (bool): Who is currently playing. True if computer.
+            alpha (_type_, optional): Maximum pruning value. Defaults to float("-inf").
+            beta (_type_, optional): Minimum pruning value. Defaults to float("inf").
+            key (int | None, optional): Zobrist key of the position, computed when not given.
+            ply (int, optional): Distance from the root of the search. Defaults to 0.
+            stacking (int, optional): Cards to take against an active "*7". Defaults to 0.
+
+        Returns:
+            (score, best_move) where best_move is (card index, resulting top card index).
+        """
+        self.nodes += 1
+        if not self.nodes & 63:
+            if self.max_nodes is not None and self.nodes >= self.max_nodes:
+                self.exhausted = True
+                raise NodeBudgetExceeded()
+            if (
+                self.deadline is not None
+                and not self.nodes & 1023
+                and time.time() >= self.deadline
+            ):
+                raise SearchTimeout()
+        stats = self.stats
+        if stats is not None:
+            stats.add_node(ply)
+        if not comp_hand:
+            return 100, None
+        if not human_hand:
+            return -100, None
+        tablebase = self.tablebase
+        if tablebase is not None and tablebase.covers(comp_hand, human_hand):
+            if stats is not None:
+                stats.tablebase_hits += 1
+            return (
+                tablebase.probe(
+                    comp_hand, human_hand, top, is_active, is_maximizing, stacking
+                ),
+                None,
+            )
+        if depth == 0:
+            if self.evaluator is not None:
+                return (
+                    self.evaluator.score(
+                        comp_hand, human_hand, top, is_active, is_maximizing, stacking
+                    ),
+                    None,
+                )
+            score = evaluate_state(comp_hand, human_hand)
+            strength = self.strength
+            if (
+                strength is not None
+                and strength.covers(comp_hand)
+                and strength.covers(human_hand)
+            ):
+                score += strength.leaf_bonus(comp_hand, human_hand)
+            return score, None
+
+        table = self.table
+        if table is not None:
+            if key is None:
+                key = self.pack_key ^ zobrist_key(
+                    comp_hand, human_hand, top, is_active, is_maximizing, stacking
+                )
+            entry = table.probe(key, depth)
+            if entry is not None:
+                _, _, score, flag, move = entry
+                if (
+                    flag == EXACT
+                    or (flag == LOWER and score >= beta)
+                    or (flag == UPPER and score <= alpha)
+                ):
+                    if stats is not None:
+                        stats.tt_hits += 1
+                    return score, move
+
+        current_hand = comp_hand if is_maximizing else human_hand
+        if not current_hand & playable_mask(top, is_active):
+            if is_active and CARDS[top][1] == "a":
+                val, _ = self._minimax(
+                    comp_hand,
+                    human_hand,
+                    top,
+                    False,
+                    depth - 1,
+                    not is_maximizing,
+                    alpha,
+                    beta,
+                    None
+                    if key is None
+                    else key ^ STATE_KEYS[top][True] ^ STATE_KEYS[top][False] ^ SIDE_KEY,
+                    ply + 1,
+                )
+                return val, None
+            if self.chance_samples:
+                score = self._chance(
+                    comp_hand,
+                    human_hand,
+                    top,
+                    is_active,
+                    depth,
+                    is_maximizing,
+                    alpha,
+                    beta,
+                    key,
+                    ply,
+                    stacking,
+                )
+                if table is not None:
+                    if score <= alpha:
+                        flag = UPPER
+                    elif score >= beta:
+                        flag = LOWER
+                    else:
+                        flag = EXACT
+                    table.store(key, depth, score, flag, None)
+                return score, None
+            if self.evaluator is not None:
+                # Playouts take the cards themselves, keeping one scale for all leaves.
+                return (
+                    self.evaluator.score(
+                        comp_hand, human_hand, top, is_active, is_maximizing, stacking
+                    ),
+                    None,
+                )
+            # Taking cards, one more penalty point for every stacked card.
+            penalty = 9 + (stacking or 1)
+            return (
+                evaluate_state(comp_hand, human_hand)
+                + (-penalty if is_maximizing else penalty),
+                None,
+            )
+
+        alpha_orig, beta_orig = alpha, beta
+        state_key = (
+            0
+            if key is None
+            else key ^ STATE_KEYS[top][is_active] ^ STACK_KEYS[stacking >> 1] ^ SIDE_KEY
+        )
+        best_move = None
+        moves = valid_moves(current_hand, top, is_active, is_maximizing)
+        ordering = self.ordering
+        if ordering is not None:
+            moves = ordering.order(
+                moves,
+                ply,
+                None if table is None else table.probe_move(key),
+                is_maximizing,
+                current_hand,
+            )
+
+        if is_maximizing:
+            best_eval = float("-inf")
+            for move in moves:
+                card, next_top = move
+                next_active = ACTIVE_CARDS[card]
+                next_stacking = STACKED[stacking >> 1] if SEVENS[card] else 0
+                eval_score, _ = self._minimax(
+                    comp_hand & ~CARD_BITS[card],
+                    human_hand,
+                    next_top,
+                    next_active,
+                    depth - 1,
+                    False,
+                    alpha,
+                    beta,
+                    None
+                    if key is None
+                    else state_key
+                    ^ COMP_KEYS[card]
+                    ^ STATE_KEYS[next_top][next_active]
+                    ^ STACK_KEYS[next_stacking >> 1],
+                    ply + 1,
+                    next_stacking,
+                )
+
+                if eval_score > best_eval:
+                    best_eval = eval_score
+                    best_move = move
+
+                alpha = max(alpha, eval_score)
+                if beta <= alpha:
+                    if ordering is not None:
+                        ordering.record_cutoff(move, ply, depth, True)
+                    if stats is not None:
+                        stats.cutoffs += 1
+                    break
+        else:
+            best_eval = float("inf")
+            for move in moves:
+                card, next_top = move
+                next_active = ACTIVE_CARDS[card]
+                next_stacking = STACKED[stacking >> 1] if SEVENS[card] else 0
+                eval_score, _ = self._minimax(
+                    comp_hand,
+                    human_hand & ~CARD_BITS[card],
+                    next_top,
+                    next_active,
+                    depth - 1,
+                    True,
+                    alpha,
+                    beta,
+                    None
+                    if key is None
+                    else state_key
+                    ^ HUMAN_KEYS[card]
+                    ^ STATE_KEYS[next_top][next_active]
+                    ^ STACK_KEYS[next_stacking >> 1],
+                    ply + 1,
+                    next_stacking,
+                )
+
+                if eval_score < best_eval:
+                    best_eval = eval_score
+                    best_move = move
+
+                beta = min(beta, eval_score)
+                if beta <= alpha:
+                    if ordering is not None:
+                        ordering.record_cutoff(move, ply, depth, False)
+                    if stats is not None:
+                        stats.cutoffs += 1
+                    break
+
+        if table is not None:
+            if best_eval <= alpha_orig:
+                flag = UPPER
+            elif best_eval >= beta_orig:
+                flag = LOWER
+            else:
+                flag = EXACT
+            table.store(key, depth, best_eval, flag, best_move)
+        return best_eval, best_move
+
+    def _chance(
+        self,
+        comp_hand: int,
+        human_hand: int,
+        top: int,
+        is_active: bool,
+        depth: int,
+        is_maximizing: bool,
+        alpha,
+        beta,
+        key: int | None,
+        ply: int,
+        stacking: int,
+    ) -> float:
+        """
+        Chance node of a player taking cards, the mean score of the searched draws.
+
+        Every draw is equally likely. Star1 pruning: scores lie between -100 and 100, so
+        every draw is searched with the window which could still move the mean into
+        (alpha, beta), and the node returns a bound as soon as the mean cannot get there.
+        The card pack is the one of the root without the cards drawn since. Without unseen
+        every card in neither hand nor on top can be drawn, played cards included.
+
+        Args:
+            comp_hand (int): Bitmask of computer player's cards.
+            human_hand (int): Bitmask of human player's cards.
+            top (int): Index of the top card.
+            is_active (bool): Was last card an active card? True if yes.
+            depth (int): How deep should the minimax go.
+            is_maximizing (bool): Who is taking cards. True if computer.
+            alpha (_type_): Maximum pruning value.
+            beta (_type_): Minimum pruning value.
+            key (int | None): Zobrist key of the position, None without a transposition table.
+            ply (int): Distance from the root of the search.
+            stacking (int): Cards to take against an active "*7".
+
+        Returns:
+            float: Mean score, or a bound of it outside (alpha, beta).
+        """
+        if self.pack is None:
+            pack = FULL_MASK & ~comp_hand & ~human_hand & ~CARD_BITS[top]
+        else:
+            pack = self.pack & ~comp_hand & ~human_hand
+        draws = self.sample_draws(pack, stacking or 1)
+        if self.stats is not None:
+            self.stats.chance_nodes += 1
+        hand_keys = COMP_KEYS if is_maximizing else HUMAN_KEYS
+        if key is not None:
+            key ^= (
+                STATE_KEYS[top][is_active]
+                ^ STACK_KEYS[stacking >> 1]
+                ^ SIDE_KEY
+                ^ STATE_KEYS[top][False]
+            )
+        count = len(draws)
+        total = 0
+        for index, drawn in enumerate(draws):
+            remaining = count - index - 1
+            child_key = key
+            if key is not None:
+                for card in iter_indices(drawn):
+                    child_key ^= hand_keys[card]
+            score, _ = self._minimax(
+                comp_hand | drawn if is_maximizing else comp_hand,
+                human_hand if is_maximizing else human_hand | drawn,
+                top,
+                False,
+                depth - 1,
+                not is_maximizing,
+                max(-100, count * alpha - total - remaining * 100),
+                min(100, count * beta - total + remaining * 100),
+                child_key,
+                ply + 1,
+            )
+            total += score
+            if total - remaining * 100 >= count * beta:
+                return (total - remaining * 100) / count
+            if total + remaining * 100 <= count * alpha:
+                return (total + remaining * 100) / count
+        return total / count
+
+    def sample_draws(self, pack: int, count: int) -> tuple[int, ...]:
+        """
+        Returns the draws searched at a chance node, cached per card pack.
+
+        All draws are searched if there are at most chance_samples of them, otherwise
+        chance_samples draws are sampled, seeded by the card pack so they are the same in
+        every search.
+
+        Args:
+            pack (int): Bitmask of the cards which can be drawn.
+            count (int): Amount of cards to take.
+
+        Returns:
+            tuple[int, ...]: Bitmasks of the drawn cards.
+        """
+        draws = self.draws.get((pack, count))
+        if draws is None:
+            cards = [CARD_BITS[index] for index in iter_indices(pack)]
+            count = min(count, len(cards))
+            if comb(len(cards), count) <= self.chance_samples:
+                draws = tuple(sum(drawn) for drawn in i.combinations(cards, count))
+            else:
+                rng = random.Random(pack << 4 | count)
+                draws = tuple(
+                    sum(rng.sample(cards, count)) for _ in range(self.chance_samples)
+                )
+            if len(self.draws) >= DRAW_ENTRIES:
+                self.draws.clear()
+            self.draws[pack, count] = draws
+        return draws
+
+
+def minimax(
+    comp_hand: int,
+    human_hand: int,
+    top: int,
+    is_active: bool,
+    depth: int,
+    is_maximizing: bool,
+    alpha=float("-inf"),
+    beta=float("inf"),
+    stacking: int = 0,
+):
+    """Runs Searcher.minimax without a transposition table, see Searcher.minimax."""
+    return Searcher().minimax(
+        comp_hand,
+        human_hand,
+        top,
+        is_active,
+        depth,
+        is_maximizing,
+        alpha,
+        beta,
+        stacking,
+    )
+
+
+def is_solved(score: int) -> bool:
+    """Checks if a score of Searcher.solve is exact, a forced win or loss."""
+    return score in (100, -100)
+
+
+def max_useful_depth(card_count: int) -> int:
+    """
+    Returns the depth after which searching deeper cannot change anything.
+
+    Every ply plays a card or stands a round after an ace, which was played too,
+    so no line is longer than twice the amount of cards in both hands.
+
+    Args:
+        card_count (int): Amount of cards in both hands.
+
+    Returns:
+        int: Maximum useful depth.
+    """
+    return 2 * card_count
+
+
+def vote_hands(
+    comp_hand: int,
+    human_hands,
+    top: int,
+    is_active: bool,
+    depth: int,
+    settings: AISettings | None = None,
+    deadline: float | None = None,
+    stats: SearchStats | None = None,
+    stacking: int = 0,
+    unseen: int | None = None,
+    searcher: Searcher | None = None,
+) -> Counter:
+    """
+    Searches every hypothetical human hand and counts the suggested moves.
+
+    Module level and independent of GameRunner, so it can run in worker processes.
+    When the deadline passes, the votes collected so far are returned. Hands equal up to
+    swapping colors are searched once, each of them still votes, see ColorSymmetry.
+
+    Args:
+        comp_hand (int): Bitmask of computer player's cards.
+        human_hands (Iterable[int]): Bitmasks of hypothetical human hands.
+        top (int): Index of the top card.
+        is_active (bool): Was last card an active card? True if yes.
+        depth (int): How deep should the minimax go.
+        settings (AISettings | None, optional): Settings of the computer player. Defaults to AISettings().
+        deadline (float | None, optional): time.time() after which voting stops. Defaults to None.
+        stats (SearchStats | None, optional): Statistics to be collected. Defaults to None.
+        stacking (int, optional): Cards to take against an active "*7". Defaults to 0.
+        unseen (int | None, optional): Bitmask of the human hand and the card pack, see Searcher.unseen. Defaults to None.
+        searcher (Searcher | None, optional): Searcher to use instead of deadline, stats and unseen. Defaults to a new one.
+
+    Returns:
+        Counter: Votes for each move, None stands for taking a card or standing a round.
+    """
+    settings = settings or AISettings()
+    if searcher is None:
+        searcher = Searcher.from_settings(settings, deadline, stats)
+        searcher.unseen = unseen
+    deadline = searcher.deadline
+    stats = searcher.stats
+    symmetry = None
+    if ColorSymmetry.usable(settings):
+        symmetry = ColorSymmetry.of(comp_hand, top)
+    votes = Counter()
+    try:
+        for human_hand in human_hands:
+            if deadline is not None and time.time() >= deadline:
+                break
+            if symmetry is not None:
+                canonical = symmetry.canonical(human_hand)
+                if canonical in symmetry.moves:
+                    votes[symmetry.moves[canonical]] += 1
+                    continue
+            _, move = searcher.search_root(
+                comp_hand, human_hand, top, is_active, depth, stacking=stacking
+            )
+            votes[move] += 1
+            if symmetry is not None:
+                symmetry.remember(canonical, move)
+            if stats is not None:
+                stats.determinizations += 1
+    except SearchTimeout:
+        pass
+    return votes
+
+
+def vote_chunk(
+    comp_hand: int,
+    human_hands,
+    top: int,
+    is_active: bool,
+    depth: int,
+    settings: AISettings,
+    deadline: float | None = None,
+    max_nodes: int | None = None,
+    collect_stats: bool = False,
+    stacking: int = 0,
+    unseen: int | None = None,
+) -> tuple[Counter, int, bool, SearchStats | None]:
+    """
+    Runs vote_hands in a worker process with its share of the node budget.
+
+    Args:
+        comp_hand (int): Bitmask of computer player's cards.
+        human_hands (Iterable[int]): Bitmasks of hypothetical human hands.
+        top (int): Index of the top card.
+        is_active (bool): Was last card an active card? True if yes.
+        depth (int): How deep should the minimax go.
+        settings (AISettings): Settings of the computer player.
+        deadline (float | None, optional): time.time() after which voting stops. Defaults to None.
+        max_nodes (int | None, optional): Nodes of the chunk, None for no limit. Defaults to None.
+        collect_stats (bool, optional): Collect statistics, which worker processes have to send back. Defaults to False.
+        stacking (int, optional): Cards to take against an active "*7". Defaults to 0.
+        unseen (int | None, optional): Bitmask of the human hand and the card pack, see Searcher.unseen. Defaults to None.
+
+    Returns:
+        tuple[Counter, int, bool, SearchStats | None]: Votes, searched nodes, True if the nodes ran out, and the statistics if collected.
+    """
+    stats = SearchStats() if collect_stats else None
+    searcher = Searcher.from_settings(settings, deadline, stats)
+    searcher.unseen = unseen
+    searcher.max_nodes = max_nodes
+    votes = vote_hands(
+        comp_hand, human_hands, top, is_active, depth, settings, searcher=searcher
+    )
+    return votes, searcher.nodes, searcher.exhausted, stats
+
+
+def vote_hands_parallel(
+    executor,
+    comp_hand: int,
+    human_hands,
+    top: int,
+    is_active: bool,
+    depth: int,
+    chunk_size: int,
+    max_pending: int,
+    settings: AISettings | None = None,
+    deadline: float | None = None,
+    stats: SearchStats | None = None,
+    stacking: int = 0,
+    unseen: int | None = None,
+    searcher: Searcher | None = None,
+):
+    """
+    Shards hypothetical human hands across an executor in chunks.
+
+    Results are yielded in submission order, so merging them into a Counter keeps the
+    same move order, and therefore the same tie-breaking, as vote_hands over all hands.
+    Only max_pending chunks exist at a time. The node budget is shared: a chunk gets
+    an even share of the nodes no pending chunk holds, the last chunk all of them, and
+    nodes a finished chunk did not use go to the next ones.
+
+    Args:
+        executor (concurrent.futures.Executor): Executor running vote_chunk.
+        comp_hand (int): Bitmask of computer player's cards.
+        human_hands (Iterable[int]): Bitmasks of hypothetical human hands.
+        top (int): Index of the top card.
+        is_active (bool): Was last card an active card? True if yes.
+        depth (int): How deep should the minimax go.
+        chunk_size (int): Amount of hands searched by one task.
+        max_pending (int): Maximum amount of submitted, not yet yielded chunks.
+        settings (AISettings | None, optional): Settings of the computer player. Defaults to AISettings().
+        deadline (float | None, optional): time.time() after which voting stops. Defaults to None.
+        stats (SearchStats | None, optional): Statistics the workers' statistics are merged into. Defaults to None.
+        stacking (int, optional): Cards to take against an active "*7". Defaults to 0.
+        unseen (int | None, optional): Bitmask of the human hand and the card pack, see Searcher.unseen. Defaults to None.
+        searcher (Searcher | None, optional): Searcher of this process whose remaining max_nodes the chunks share, their nodes are added to it. Defaults to settings.max_nodes.
+
+    Yields:
+        Counter: Votes of one chunk.
+    """
+    settings = settings or AISettings()
+    max_nodes = settings.max_nodes
+    if searcher is not None:
+        max_nodes = searcher.max_nodes
+        if max_nodes is not None:
+            max_nodes -= searcher.nodes
+    human_hands = iter(human_hands)
+    pending = deque()
+    # Nodes searched by finished chunks and held by pending ones.
+    spent = 0
+    allotted = 0
+    task = partial(
+        vote_chunk, collect_stats=stats is not None, stacking=stacking, unseen=unseen
+    )
+
+    def share(last):
+        free = max_nodes - spent - allotted
+        return free if last else free // (max_pending - len(pending))
+
+    def result():
+        nonlocal spent, allotted
+        future, allotment = pending.popleft()
+        votes, nodes, exhausted, chunk_stats = future.result()
+        spent += nodes
+        allotted -= allotment or 0
+        if searcher is not None:
+            searcher.nodes += nodes
+            searcher.exhausted = searcher.exhausted or exhausted
+        if stats is not None:
+            stats.merge(chunk_stats)
+        return votes
+
+    try:
+        chunk = list(i.islice(human_hands, chunk_size))
+        while chunk:
+            if deadline is not None and time.time() >= deadline:
+                break
+            # The last chunk gets every free node.
+            next_chunk = list(i.islice(human_hands, chunk_size))
+            allotment = None
+            if max_nodes is not None:
+                allotment = share(not next_chunk)
+                # Finished chunks may give back nodes they did not use.
+                while allotment <= 0 and pending:
+                    yield result()
+                    allotment = share(not next_chunk)
+                if allotment <= 0:
+                    if searcher is not None:
+                        searcher.exhausted = True
+                    break
+                allotted += allotment
+            future = executor.submit(
+                task,
+                comp_hand,
+                chunk,
+                top,
+                is_active,
+                depth,
+                settings,
+                deadline,
+                allotment,
+            )
+            pending.append((future, allotment))
+            if len(pending) >= max_pending:
+                yield result()
+            chunk = next_chunk
+        while pending:
+            yield result()
+    finally:
+        for future, _ in pending:
+            future.cancel()
@@ -0,0 +1,392 @@
+import argparse
+import asyncio
+from collections import Counter
+from concurrent.futures import Executor, ProcessPoolExecutor
+import copy
+import random
+import time
+from ai import ComputerAI
+from bitcards import CARD_INDEX, CARDS, COLORS, to_cards
+from events import COMPUTER, HUMAN
+from settings import AISettings
+from simulation import HeadlessGame, greedy_policy
+
+# Seats of the HeadlessGame, the client plays seat 0.
+SEATS = {HUMAN: 0, COMPUTER: 1}
+
+
+def computer_move(
+    settings: AISettings,
+    comp_hand: int,
+    top: int,
+    is_active: bool,
+    human_hand: int | None,
+    unseen_cards: list[str] | None,
+    human_count: int,
+    stacking: int = 0,
+    deadline: float | None = None,
+):
+    """
+    Decides a computer turn, module level so it can run in worker processes.
+
+    A deadline shortens settings.time_budget, so the search stops on its own instead
+    of keeping the worker busy after the turn timed out.
+
+    Args:
+        settings (AISettings): Settings of the computer player.
+        comp_hand (int): Bitmask of computer player's cards.
+        top (int): Index of the top card.
+        is_active (bool): Was last card an active card? True if yes.
+        human_hand (int | None): Bitmask of human player's cards in hard mode.
+        unseen_cards (list[str] | None): Cards the human player could be holding or drawing.
+        human_count (int): Amount of cards in human player's hand.
+        stacking (int, optional): Cards to take against an active "*7". Defaults to 0.
+        deadline (float | None, optional): time.time() after which the search stops. Defaults to None.
+
+    Returns:
+        tuple: The move, None to take a card or stand a round, and ComputerAI.fallback.
+    """
+    if deadline is not None:
+        budget = max(deadline - time.time(), 0.0)
+        if settings.time_budget is None or settings.time_budget > budget:
+            settings = copy.copy(settings)
+            settings.time_budget = budget
+    ai = ComputerAI(settings)
+    try:
+        move = ai.choose_move(
+            comp_hand,
+            top,
+            is_active,
+            human_hand,
+            unseen_cards,
+            human_count,
+            stacking=stacking,
+        )
+        return move, ai.fallback
+    finally:
+        ai.close()
+
+
+class Session:
+    """
+    One game of a connected client.
+
+    Attributes:
+        game (HeadlessGame): State of the game, the client plays seat 0.
+        easy (bool): True if the computer player does not see the client's hand.
+    """
+
+    def __init__(self, easy: bool, rng: random.Random) -> None:
+        """
+        Initialize the Session object and deal the cards.
+
+        Args:
+            easy (bool): True for easy mode.
+            rng (random.Random): Random number generator shuffling the deck.
+        """
+        self.game = HeadlessGame(rng)
+        self.easy = easy
+
+    def state(self) -> str:
+        """Returns the STATE line describing what the client can see."""
+        game = self.game
+        return (
+            f"STATE top={CARDS[game.top]} color={game.desired_color or '-'}"
+            f" active={int(game.active)}"
+            f" hand={','.join(to_cards(game.hands[SEATS[HUMAN]]))}"
+            f" computer={game.hands[SEATS[COMPUTER]].bit_count()}"
+            f" deck={len(game.deck)}"
+        )
+
+    def human_move(self, words: list[str]):
+        """
+        Parses a PLAY, TAKE or STAND command of the client.
+
+        Args:
+            words (list[str]): Words of the command.
+
+        Raises:
+            ValueError: If the move is not allowed.
+
+        Returns:
+            (tuple[int, int] | None): Move of the client, None to take a card or stand a round.
+        """
+        game = self.game
+        ace = game.active and CARDS[game.top][1] == "a"
+        match words:
+            case ["TAKE"]:
+                if ace:
+                    raise ValueError("cannot take a card against an active ace")
+                return None
+            case ["STAND"]:
+                if not ace:
+                    raise ValueError("can only stand a round against an active ace")
+                return None
+            case ["PLAY", card, *color] if card in CARD_INDEX:
+                index = CARD_INDEX[card]
+                if card[1] == "m":
+                    if len(color) != 1 or color[0] not in COLORS:
+                        raise ValueError("choose a color: PLAY <card> <l|k|c|z>")
+                    move = (index, CARD_INDEX[f"{color[0]}m"])
+                else:
+                    move = (index, index)
+                if move not in game.legal_moves():
+                    raise ValueError(f"cannot play {card} now")
+                return move
+        raise ValueError("unknown command")
+
+    def computer_arguments(self, settings: AISettings) -> tuple:
+        """Returns the arguments of computer_move for the computer's turn, with the budget of the difficulty."""
+        game = self.game
+        state = game.game_state()
+        return (
+            settings.for_difficulty(self.easy),
+            state.comp_hand,
+            state.top,
+            state.active,
+            None if self.easy else state.human_hand,
+            to_cards(game.unseen(SEATS[COMPUTER])),
+            state.human_hand.bit_count(),
+            state.stacking,
+        )
+
+
+def describe_computer_move(game: HeadlessGame, move) -> str:
+    """Returns the COMPUTER line of a computer move, called before the move is applied."""
+    if move is None:
+        if game.active and CARDS[game.top][1] == "a":
+            return "COMPUTER STAND"
+        return "COMPUTER TAKE"
+    card, next_top = move
+    if CARDS[card][1] == "m":
+        return f"COMPUTER PLAY {CARDS[card]} {CARDS[next_top][0]}"
+    return f"COMPUTER PLAY {CARDS[card]}"
+
+
+class PrsiServer:
+    """
+    Asyncio server hosting many games over a line protocol.
+
+    Client commands are NEW easy|hard, PLAY <card> [color], TAKE, STAND, STATE and QUIT.
+    Every command is answered by event lines and a final OK or ERR <reason> line.
+    Computer turns run in the executor, at most `workers` of them at a time, so a slow
+    search never blocks the event loop.
+
+    Attributes:
+        settings (AISettings): Settings of the computer player.
+        executor (Executor): Executor running computer turns.
+        workers (int): Maximum amount of computer turns running at once.
+        session_timeout (float | None): Seconds a client may stay silent before it is disconnected.
+        turn_timeout (float | None): Seconds after which a computer turn plays the greedy move instead.
+        sessions (int): Amount of connected clients.
+        rng (random.Random): Random number generator seeding the games.
+        fallbacks (Counter): Computer turns which fell back, by "best_so_far", "greedy" or "timeout".
+    """
+
+    def __init__(
+        self,
+        settings: AISettings | None = None,
+        workers: int = 4,
+        executor: Executor | None = None,
+        session_timeout: float | None = 300.0,
+        turn_timeout: float | None = None,
+        seed: int | None = None,
+    ) -> None:
+        """
+        Initialize the PrsiServer object.
+
+        Args:
+            settings (AISettings | None, optional): Settings of the computer player. Defaults to AISettings().
+            workers (int, optional): Maximum amount of computer turns running at once. Defaults to 4.
+            executor (Executor | None, optional): Executor for computer turns. Defaults to a process pool with `workers` processes.
+            session_timeout (float | None, optional): Idle seconds before disconnecting. Defaults to 300.
+            turn_timeout (float | None, optional): Seconds per computer turn. Defaults to None.
+            seed (int | None, optional): Seed of the games. Defaults to None.
+        """
+        self.settings = settings or AISettings()
+        self.workers = workers
+        self.executor = executor or ProcessPoolExecutor(workers)
+        self.session_timeout = session_timeout
+        self.turn_timeout = turn_timeout
+        self.sessions = 0
+        self.rng = random.Random(seed)
+        self.fallbacks = Counter()
+        self._slots = asyncio.Semaphore(workers)
+
+    async def handle(
+        self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter
+    ) -> None:
+        """Serves one client until it quits, disconnects or times out."""
+        self.sessions += 1
+        session = None
+
+        def send(*lines):
+            writer.write("".join(f"{line}\n" for line in lines).encode())
+
+        try:
+            send("HELLO prsi 1")
+            while True:
+                try:
+                    line = await asyncio.wait_for(
+                        reader.readline(), self.session_timeout
+                    )
+                except asyncio.TimeoutError:
+                    send("TIMEOUT")
+                    break
+                if not line:
+                    break
+                words = line.decode().split()
+                if not words:
+                    continue
+                command = words[0].upper()
+                words[0] = command
+                if command == "QUIT":
+                    send("BYE")
+                    break
+                if command == "NEW":
+                    if words[1:] not in (["easy"], ["hard"]):
+                        send("ERR usage: NEW easy|hard")
+                    else:
+                        session = Session(
+                            words[1] == "easy",
+                            random.Random(self.rng.getrandbits(64)),
+                        )
+                        send(session.state(), "OK")
+                elif session is None:
+                    send("ERR no game, start one with NEW easy|hard")
+                elif session.game.winner is not None:
+                    send("ERR game over, start a new one with NEW easy|hard")
+                elif command == "STATE":
+                    send(session.state(), "OK")
+                else:
+                    try:
+                        move = session.human_move(words)
+                    except ValueError as error:
+                        send(f"ERR {error}")
+                    else:
+                        send(*await self.play_round(session, move), "OK")
+                await writer.drain()
+        except ConnectionError:
+            pass
+        finally:
+            self.sessions -= 1
+            writer.close()
+
+    async def play_round(self, session: Session, move) -> list[str]:
+        """
+        Applies the client's move and answers with the computer's turn.
+
+        Args:
+            session (Session): Game of the client.
+            move (tuple[int, int] | None): Move of the client.
+
+        Returns:
+            list[str]: Event lines for the client.
+        """
+        game = session.game
+        game.apply(move)
+        if game.winner == SEATS[HUMAN]:
+            return ["OVER win"]
+        move = await self.computer_turn(session)
+        lines = [describe_computer_move(game, move)]
+        game.apply(move)
+        if game.winner == SEATS[COMPUTER]:
+            lines.append("OVER loss")
+        else:
+            lines.append(session.state())
+        return lines
+
+    async def computer_turn(self, session: Session):
+        """
+        Runs the computer's search in the executor.
+
+        The search gets turn_timeout as its deadline. The greedy move is played when
+        turn_timeout passes anyway, fallbacks counts it like the searches which ran out
+        of nodes. The slot of the search is only freed when the search has finished,
+        so searches left behind by timed out turns cannot pile up in the executor.
+
+        Returns:
+            (tuple[int, int] | None): Move of the computer player.
+        """
+        loop = asyncio.get_running_loop()
+        deadline = None
+        if self.turn_timeout is not None:
+            deadline = time.time() + self.turn_timeout
+        await self._slots.acquire()
+        try:
+            future = loop.run_in_executor(
+                self.executor,
+                computer_move,
+                *session.computer_arguments(self.settings),
+                deadline,
+            )
+        except BaseException:
+            self._slots.release()
+            raise
+        future.add_done_callback(lambda _: self._slots.release())
+        try:
+            move, fallback = await asyncio.wait_for(
+                asyncio.shield(future), self.turn_timeout
+            )
+        except asyncio.TimeoutError:
+            self.fallbacks["timeout"] += 1
+            return greedy_policy(session.game, self.rng)
+        if fallback is not None:
+            self.fallbacks[fallback] += 1
+        return move
+
+    async def start(
+        self, host: str = "127.0.0.1", port: int = 0, path: str | None = None
+    ) -> asyncio.AbstractServer:
+        """
+        Starts listening on a TCP port, or on a Unix socket if path is given.
+
+        Args:
+            host (str, optional): Address to listen on. Defaults to "127.0.0.1".
+            port (int, optional): TCP port, 0 picks a free one. Defaults to 0.
+            path (str | None, optional): Path of a Unix socket. Defaults to None.
+
+        Returns:
+            asyncio.AbstractServer: The listening server.
+        """
+        if path is not None:
+            return await asyncio.start_unix_server(self.handle, path)
+        return await asyncio.start_server(self.handle, host, port)
+
+    def close(self) -> None:
+        """Shuts down the executor."""
+        self.executor.shutdown(cancel_futures=True)
+
+
+async def serve(server: PrsiServer, host: str, port: int, path: str | None) -> None:
+    """Runs the server until it is cancelled."""
+    listener = await server.start(host, port, path)
+    address = path or "{}:{}".format(*listener.sockets[0].getsockname()[:2])
+    print(f"Serving Prsi on {address}")
+    async with listener:
+        await listener.serve_forever()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Prsi game server.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--unix", help="listen on this Unix socket instead")
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--session-timeout", type=float, default=300.0)
+    parser.add_argument("--turn-timeout", type=float)
+    parser.add_argument("--max-nodes", type=int, help="nodes per computer turn")
+    parser.add_argument("--max-memory", type=int, help="bytes of computer tables")
+    args = parser.parse_args()
+    prsi_server = PrsiServer(
+        AISettings(max_nodes=args.max_nodes, max_memory=args.max_memory),
+        workers=args.workers,
+        session_timeout=args.session_timeout,
+        turn_timeout=args.turn_timeout,
+    )
+    try:
+        asyncio.run(serve(prsi_server, args.host, args.port, args.unix))
+    except KeyboardInterrupt:
+        pass
+    finally:
+        prsi_server.close()
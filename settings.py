@@ -0,0 +1,134 @@
+import copy
+
+
+class AISettings:
+    """
+    Settings of the computer player.
+
+    Attributes:
+        depth (int): How deep should the minimax go.
+        tt_size (int): Transposition table entries shared by one computer turn, 0 disables the table.
+        tt_replacement (str): Transposition table replacement policy, "depth" or "always".
+        sampling (str): How easy mode picks hypothetical human hands, "exhaustive" or "monte_carlo".
+        confidence (float): Confidence level at which Monte Carlo sampling stops early.
+        max_samples (int): Maximum amount of sampled hands per computer turn.
+        sample_weights (dict[str, float] | None): Weight of each card when sampling, uniform if None.
+        seed (int | None): Seed of the computer player's random number generator.
+        workers (int): Processes searching hypothetical human hands, 1 searches in the main process.
+        chunk_size (int): Amount of hypothetical human hands sent to a worker at once.
+        time_budget (float | None): Seconds per computer turn, None searches to a fixed depth.
+        max_depth (int): Deepest iteration of the iterative deepening with a time budget.
+        move_ordering (bool): Order moves with the transposition table move, active cards, killer moves and history.
+        belief_tracking (bool): Only search human hands consistent with the cards the human player could not play.
+        color_symmetry (bool): Search hypothetical human hands equal up to swapping colors only once, not with rollouts or chance_samples.
+        solver_cards (int): Hard mode positions with at most this many cards in both hands are searched to the end first, a forced win or loss found there is played. 0 never.
+        tablebase (str | None): Endgame tablebase file written by tablebase.py, probed instead of searching small positions.
+        cache_path (str | None): SQLite file caching decisions across turns, games and restarts, None disables it.
+        cache_entries (int): Maximum amount of cached decisions, the least recently used ones are evicted.
+        stats (bool): Collect search statistics of every computer turn in ComputerAI.stats.
+        stats_log (str | None): JSON-lines file the statistics of every computer turn are appended to, enables stats.
+        ponder (bool): Search the answers to the human player's likely moves in a background thread during their turn.
+        engine (str): Search of the computer player, "minimax" or "ismcts".
+        iterations (int): Iterations of one ISMCTS computer turn, split between settings.workers trees.
+        exploration (float): Weight of the exploration term of ISMCTS selection.
+        rollouts (int): Random playouts scoring each minimax leaf by the win rate instead of card counts, 0 disables them, needs NumPy.
+        chance_samples (int): Draws searched as chance nodes when a player takes cards, 0 scores taking cards with a fixed penalty.
+        rollout_entries (int): Maximum amount of positions in the rollout cache.
+        max_nodes (int | None): Searched nodes per computer turn, None for no limit. With workers > 1 the chunks of hands share it, ISMCTS counts plies and splits it between its trees.
+        max_memory (int | None): Bytes the tables of the computer player may grow to, see budget.fit_memory. None for no limit.
+        budgets (dict[str, dict[str, int | None]] | None): max_nodes and max_memory of "easy" and "hard" games, overriding the ones above.
+        strength_table (str | None): Hand strength table written by strength.py, breaking ties of card counts at minimax leaves and in move ordering.
+    """
+
+    def __init__(
+        self,
+        depth: int = 4,
+        tt_size: int = 1 << 16,
+        tt_replacement: str = "depth",
+        sampling: str = "exhaustive",
+        confidence: float = 0.95,
+        max_samples: int = 500,
+        sample_weights: dict[str, float] | None = None,
+        seed: int | None = None,
+        workers: int = 1,
+        chunk_size: int = 256,
+        time_budget: float | None = None,
+        max_depth: int = 32,
+        move_ordering: bool = True,
+        belief_tracking: bool = True,
+        color_symmetry: bool = True,
+        solver_cards: int = 6,
+        tablebase: str | None = None,
+        cache_path: str | None = None,
+        cache_entries: int = 100_000,
+        stats: bool = False,
+        stats_log: str | None = None,
+        ponder: bool = False,
+        engine: str = "minimax",
+        iterations: int = 2000,
+        exploration: float = 0.7,
+        rollouts: int = 0,
+        chance_samples: int = 0,
+        rollout_entries: int = 1 << 16,
+        max_nodes: int | None = None,
+        max_memory: int | None = None,
+        budgets: dict[str, dict[str, int | None]] | None = None,
+        strength_table: str | None = None,
+    ) -> None:
+        """Initialize the AISettings object, every setting has a default value."""
+        self.depth = depth
+        self.tt_size = tt_size
+        self.tt_replacement = tt_replacement
+        self.sampling = sampling
+        self.confidence = confidence
+        self.max_samples = max_samples
+        self.sample_weights = sample_weights
+        self.seed = seed
+        self.workers = workers
+        self.chunk_size = chunk_size
+        self.time_budget = time_budget
+        self.max_depth = max_depth
+        self.move_ordering = move_ordering
+        self.belief_tracking = belief_tracking
+        self.color_symmetry = color_symmetry
+        self.solver_cards = solver_cards
+        self.tablebase = tablebase
+        self.cache_path = cache_path
+        self.cache_entries = cache_entries
+        self.stats = stats or stats_log is not None
+        self.stats_log = stats_log
+        self.ponder = ponder
+        self.engine = engine
+        self.iterations = iterations
+        self.exploration = exploration
+        self.rollouts = rollouts
+        self.chance_samples = chance_samples
+        self.rollout_entries = rollout_entries
+        self.max_nodes = max_nodes
+        self.max_memory = max_memory
+        self.budgets = budgets
+        self.strength_table = strength_table
+
+    def for_difficulty(self, easy: bool):
+        """
+        Returns the settings of an easy or a hard game.
+
+        Args:
+            easy (bool): True for easy mode.
+
+        Raises:
+            ValueError: If budgets sets anything but max_nodes and max_memory.
+
+        Returns:
+            AISettings: A copy with the budget of the difficulty, self without budgets.
+        """
+        budget = (self.budgets or {}).get("easy" if easy else "hard")
+        if not budget:
+            return self
+        unknown = set(budget) - {"max_nodes", "max_memory"}
+        if unknown:
+            raise ValueError(f"Unknown budget: {', '.join(sorted(unknown))}")
+        settings = copy.copy(self)
+        for name, value in budget.items():
+            setattr(settings, name, value)
+        return settings
@@ -0,0 +1,343 @@
+from collections import deque
+import argparse
+import json
+import random
+import statistics
+import time
+from ai import ComputerAI
+from bitcards import CARD_BITS, CARD_INDEX, CARDS, FULL_MASK, to_cards
+from rules import greedy_move, valid_moves
+from settings import AISettings
+from state import GameState
+
+
+class HeadlessGame:
+    """
+    Prsi game between two seats without any input or output.
+
+    Follows the same rules as GameRunner. Seat 0 starts, like the human player does.
+
+    Attributes:
+        deck (deque[int]): Card indices to be taken.
+        pile (list[int]): Played card indices, the last one is on top.
+        hands (list[int]): Bitmask hand of each seat.
+        desired_color (str | None): The color switched to with an "*m" card.
+        active (bool): True if the top card is an active card affecting the seat to play.
+        stacking (int): The amount of cards to take after "*7" cards were played.
+        turn (int): Seat to play.
+        winner (int | None): Seat which won, None while the game runs.
+        plies (int): Amount of turns played.
+    """
+
+    def __init__(self, rng: random.Random) -> None:
+        """
+        Initialize the HeadlessGame object, shuffle the deck and deal the cards.
+
+        Args:
+            rng (random.Random): Random number generator of the game.
+        """
+        cards = list(range(len(CARDS)))
+        rng.shuffle(cards)
+        self.deck = deque(cards)
+        self.pile = []
+        self.hands = [0, 0]
+        self.desired_color = None
+        self.active = False
+        self.stacking = 0
+        self.turn = 0
+        self.winner = None
+        self.plies = 0
+        for _ in range(2):
+            for seat in (0, 1):
+                for _ in range(2):
+                    self._draw(seat)
+        self.pile.append(self.deck.popleft())
+
+    @property
+    def top(self) -> int:
+        """Index of the physical top card."""
+        return self.pile[-1]
+
+    def search_top(self) -> int:
+        """
+        Returns the top card the way the search sees it.
+
+        Returns:
+            int: Index of the top card, a color change is the "*m" card of the chosen color.
+        """
+        if self.desired_color is not None:
+            return CARD_INDEX[f"{self.desired_color}m"]
+        return self.top
+
+    def game_state(self) -> GameState:
+        """
+        Returns the position the way the search sees it.
+
+        Returns:
+            GameState: Position where the seat to play is the computer player.
+        """
+        seat = self.turn
+        return GameState(
+            self.hands[seat],
+            self.hands[1 - seat],
+            self.search_top(),
+            self.active,
+            self.stacking,
+        )
+
+    def unseen(self, seat: int) -> int:
+        """
+        Returns the cards a seat cannot see.
+
+        Args:
+            seat (int): Seat looking at the game.
+
+        Returns:
+            int: Bitmask of the opponent's hand and the deck.
+        """
+        pile = 0
+        for card in self.pile:
+            pile |= CARD_BITS[card]
+        return FULL_MASK & ~self.hands[seat] & ~pile
+
+    def legal_moves(self) -> list[tuple[int, int]]:
+        """
+        Returns the moves of the seat to play.
+
+        Returns:
+            list[tuple[int, int]]: Moves as (card index, resulting top card index).
+        """
+        return valid_moves(self.hands[self.turn], self.search_top(), self.active)
+
+    def apply(self, move: tuple[int, int] | None) -> None:
+        """
+        Plays a move of the seat to play and passes the turn.
+
+        Args:
+            move (tuple[int, int] | None): Move to play, None takes cards or stands a round after an active ace.
+        """
+        seat = self.turn
+        if move is None:
+            if self.active and CARDS[self.top][1] == "a":
+                self.active = False
+            elif self.active and CARDS[self.top][1] == "7":
+                for _ in range(self.stacking):
+                    self._draw(seat)
+                self.stacking = 0
+                self.active = False
+            else:
+                self._draw(seat)
+                self.active = False
+        else:
+            card, next_top = move
+            self.hands[seat] &= ~CARD_BITS[card]
+            self.pile.append(card)
+            number = CARDS[card][1:]
+            self.desired_color = CARDS[next_top][0] if number == "m" else None
+            if number == "7":
+                self.stacking += 2
+            self.active = number in ("7", "a")
+            if not self.hands[seat]:
+                self.winner = seat
+        self.turn = 1 - seat
+        self.plies += 1
+
+    def _draw(self, seat: int) -> None:
+        """Moves a card from the deck to a hand, the played cards are reused when the deck runs out."""
+        if not self.deck and len(self.pile) > 1:
+            self.deck.extend(self.pile[:-1])
+            del self.pile[:-1]
+        if self.deck:
+            self.hands[seat] |= CARD_BITS[self.deck.popleft()]
+
+
+def random_policy(game: HeadlessGame, rng: random.Random):
+    """Plays a random legal move, takes a card only when there is none."""
+    moves = game.legal_moves()
+    return rng.choice(moves) if moves else None
+
+
+def greedy_policy(game: HeadlessGame, rng: random.Random):
+    """Plays active cards first and keeps color changers for last."""
+    return greedy_move(game.hands[game.turn], game.search_top(), game.active)
+
+
+class AIPolicy:
+    """
+    Policy playing with the computer player's search.
+
+    Attributes:
+        ai (ComputerAI): Decision logic of the computer player.
+        easy (bool): True if the opponent's hand is unknown, like in easy mode.
+    """
+
+    def __init__(self, settings: AISettings | None = None, easy: bool = True) -> None:
+        """
+        Initialize the AIPolicy object.
+
+        Args:
+            settings (AISettings | None, optional): Settings of the computer player. Defaults to AISettings().
+            easy (bool, optional): True if the opponent's hand is unknown. Defaults to True.
+        """
+        self.ai = ComputerAI(settings)
+        self.easy = easy
+
+    def __call__(self, game: HeadlessGame, rng: random.Random):
+        """Chooses a move of the seat to play."""
+        state = game.game_state()
+        if self.easy:
+            return self.ai.choose_move(
+                state.comp_hand,
+                state.top,
+                state.active,
+                None,
+                to_cards(game.unseen(game.turn)),
+                state.human_hand.bit_count(),
+                stacking=state.stacking,
+            )
+        return self.ai.choose_move(
+            state.comp_hand,
+            state.top,
+            state.active,
+            state.human_hand,
+            to_cards(game.unseen(game.turn)),
+            stacking=state.stacking,
+        )
+
+    def close(self) -> None:
+        """Releases resources of the computer player."""
+        self.ai.close()
+
+
+class SimulationReport:
+    """
+    Results of a simulation.
+
+    Attributes:
+        games (int): Amount of played games.
+        wins (list[int]): Amount of won games of each seat.
+        unfinished (int): Amount of games stopped after the maximum amount of turns.
+        lengths (list[int]): Amount of turns of every game.
+        latencies (list[list[float]]): Seconds spent deciding every move of each seat.
+        duration (float): Seconds the whole simulation took.
+    """
+
+    def __init__(self) -> None:
+        """Initialize the SimulationReport object with no games."""
+        self.games = 0
+        self.wins = [0, 0]
+        self.unfinished = 0
+        self.lengths = []
+        self.latencies = [[], []]
+        self.duration = 0.0
+
+    def as_dict(self) -> dict:
+        """
+        Summarizes the report.
+
+        Returns:
+            dict: Win rates, game lengths, per-move latencies and throughput.
+        """
+
+        def latency(values):
+            if not values:
+                return {"mean_ms": 0.0, "p95_ms": 0.0, "max_ms": 0.0}
+            ordered = sorted(values)
+            return {
+                "mean_ms": statistics.fmean(ordered) * 1000,
+                "p95_ms": ordered[int(0.95 * (len(ordered) - 1))] * 1000,
+                "max_ms": ordered[-1] * 1000,
+            }
+
+        return {
+            "games": self.games,
+            "win_rate": [
+                wins / self.games if self.games else 0.0 for wins in self.wins
+            ],
+            "unfinished": self.unfinished,
+            "mean_length": statistics.fmean(self.lengths) if self.lengths else 0.0,
+            "max_length": max(self.lengths, default=0),
+            "latency": [latency(values) for values in self.latencies],
+            "games_per_second": self.games / self.duration if self.duration else 0.0,
+        }
+
+
+class Simulator:
+    """
+    Plays policy-vs-policy games without input or output.
+
+    Attributes:
+        policies (tuple): Policy of seat 0 and seat 1, called as policy(game, rng).
+        seed (int | None): Seed of the simulation, the same seed plays the same games.
+        max_plies (int): Turns after which a game is stopped as unfinished.
+    """
+
+    def __init__(
+        self, policies, seed: int | None = None, max_plies: int = 1000
+    ) -> None:
+        """
+        Initialize the Simulator object.
+
+        Args:
+            policies (tuple): Policy of seat 0 and seat 1.
+            seed (int | None, optional): Seed of the simulation. Defaults to None.
+            max_plies (int, optional): Turns after which a game is stopped. Defaults to 1000.
+        """
+        self.policies = policies
+        self.seed = seed
+        self.max_plies = max_plies
+
+    def run(self, games: int) -> SimulationReport:
+        """
+        Plays games, seat 0 starts every game.
+
+        Args:
+            games (int): Amount of games to play.
+
+        Returns:
+            SimulationReport: Results of the games.
+        """
+        report = SimulationReport()
+        rng = random.Random(self.seed)
+        start = time.perf_counter()
+        for _ in range(games):
+            game = HeadlessGame(random.Random(rng.getrandbits(64)))
+            policy_rng = random.Random(rng.getrandbits(64))
+            while game.winner is None and game.plies < self.max_plies:
+                seat = game.turn
+                move_start = time.perf_counter()
+                move = self.policies[seat](game, policy_rng)
+                report.latencies[seat].append(time.perf_counter() - move_start)
+                game.apply(move)
+            report.games += 1
+            report.lengths.append(game.plies)
+            if game.winner is None:
+                report.unfinished += 1
+            else:
+                report.wins[game.winner] += 1
+        report.duration = time.perf_counter() - start
+        return report
+
+
+POLICIES = {
+    "random": lambda: random_policy,
+    "greedy": lambda: greedy_policy,
+    "easy": lambda: AIPolicy(
+        AISettings(sampling="monte_carlo", max_samples=64, seed=0)
+    ),
+    "hard": lambda: AIPolicy(easy=False),
+    "ismcts": lambda: AIPolicy(AISettings(engine="ismcts", iterations=500, seed=0)),
+}
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Headless Prsi self-play.")
+    parser.add_argument(
+        "policies", nargs=2, choices=POLICIES, help="policy of seat 0 and seat 1"
+    )
+    parser.add_argument("--games", type=int, default=1000)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+    report = Simulator(
+        tuple(POLICIES[name]() for name in args.policies), args.seed
+    ).run(args.games)
+    print(json.dumps(report.as_dict(), indent=2))
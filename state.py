@@ -0,0 +1,174 @@
+from bitcards import CARD_BITS, CARDS
+from rules import SEARCH_PLAYABLE, valid_moves
+from transposition import (
+    COMP_KEYS,
+    HUMAN_KEYS,
+    SIDE_KEY,
+    STACK_KEYS,
+    STATE_KEYS,
+    zobrist_key,
+)
+
+# Only four "*7" cards exist, so no more than 8 cards are ever stacked.
+MAX_STACKING = 8
+NUMBERS = tuple(card[1:] for card in CARDS)
+ACTIVE_CARDS = tuple(number in ("a", "7") for number in NUMBERS)
+SEVENS = tuple(number == "7" for number in NUMBERS)
+# STACKED[stacking // 2] is the stacking after one more "*7" is played.
+STACKED = tuple(
+    min(stacking + 2, MAX_STACKING) for stacking in range(0, MAX_STACKING + 1, 2)
+)
+
+
+class GameState:
+    """
+    Compact position of the game as the search sees it.
+
+    A color change is the "*m" card of the chosen color on top, and stacking is only kept
+    while a "*7" is active, so equal positions have equal attributes and equal keys.
+    make_move and unmake_move change the state in place, the Zobrist key is updated
+    with a few XORs, so a search can walk the whole tree with a single GameState.
+
+    Attributes:
+        comp_hand (int): Bitmask of computer player's cards.
+        human_hand (int): Bitmask of human player's cards.
+        top (int): Index of the top card.
+        active (bool): Is the top card an active card?
+        stacking (int): Cards to take against an active "*7", 0 otherwise.
+        computer (bool): Who is currently playing. True if computer.
+        key (int): Zobrist key of the position.
+    """
+
+    __slots__ = (
+        "comp_hand",
+        "human_hand",
+        "top",
+        "active",
+        "stacking",
+        "computer",
+        "key",
+        "_history",
+    )
+
+    def __init__(
+        self,
+        comp_hand: int,
+        human_hand: int,
+        top: int,
+        active: bool = False,
+        stacking: int = 0,
+        computer: bool = True,
+    ) -> None:
+        """
+        Initialize the GameState object.
+
+        Args:
+            comp_hand (int): Bitmask of computer player's cards.
+            human_hand (int): Bitmask of human player's cards.
+            top (int): Index of the top card.
+            active (bool, optional): Is the top card an active card? Defaults to False.
+            stacking (int, optional): Cards to take against an active "*7", at least 2 is assumed. Defaults to 0.
+            computer (bool, optional): Who is currently playing. True if computer. Defaults to True.
+        """
+        active = bool(active) and NUMBERS[top] in ("7", "a")
+        if active and NUMBERS[top] == "7":
+            stacking = min(max(stacking, 2), MAX_STACKING)
+        else:
+            stacking = 0
+        self.comp_hand = comp_hand
+        self.human_hand = human_hand
+        self.top = top
+        self.active = active
+        self.stacking = stacking
+        self.computer = computer
+        self.key = zobrist_key(comp_hand, human_hand, top, active, computer, stacking)
+        self._history = []
+
+    def snapshot(self) -> tuple:
+        """Returns the position as an immutable, hashable tuple."""
+        return (
+            self.comp_hand,
+            self.human_hand,
+            self.top,
+            self.active,
+            self.stacking,
+            self.computer,
+        )
+
+    def copy(self):
+        """Returns an independent GameState of the same position."""
+        return GameState(*self.snapshot())
+
+    def moves(self) -> list[tuple[int, int]]:
+        """
+        Returns the moves of the player to move.
+
+        Returns:
+            list[tuple[int, int]]: Moves as (card index, resulting top card index).
+        """
+        hand = self.comp_hand if self.computer else self.human_hand
+        return valid_moves(hand, self.top, self.active, self.computer)
+
+    def can_play(self) -> bool:
+        """Checks if the player to move has a playable card."""
+        hand = self.comp_hand if self.computer else self.human_hand
+        return bool(hand & SEARCH_PLAYABLE[self.top * 2 + self.active])
+
+    def must_stand(self) -> bool:
+        """Checks if the player to move faces an active ace, which is answered by standing a round."""
+        return self.active and NUMBERS[self.top] == "a"
+
+    def penalty(self) -> int:
+        """Returns the penalty of the player to move for taking cards, one more per stacked card."""
+        return 9 + (self.stacking or 1)
+
+    def make_move(self, move: tuple[int, int] | None) -> None:
+        """
+        Plays a move of the player to move and passes the turn.
+
+        Args:
+            move (tuple[int, int] | None): Move to play, None stands a round against an active ace.
+        """
+        top = self.top
+        active = self.active
+        stacking = self.stacking
+        key = self.key
+        self._history.append(
+            (self.comp_hand, self.human_hand, top, active, stacking, key)
+        )
+        key ^= STATE_KEYS[top][active] ^ STACK_KEYS[stacking >> 1] ^ SIDE_KEY
+        if move is None:
+            self.active = False
+            self.key = key ^ STATE_KEYS[top][False]
+        else:
+            card, next_top = move
+            if self.computer:
+                self.comp_hand &= ~CARD_BITS[card]
+                key ^= COMP_KEYS[card]
+            else:
+                self.human_hand &= ~CARD_BITS[card]
+                key ^= HUMAN_KEYS[card]
+            self.top = next_top
+            if SEVENS[card]:
+                stacking = STACKED[stacking >> 1]
+                self.active = True
+                self.stacking = stacking
+                self.key = key ^ STATE_KEYS[next_top][True] ^ STACK_KEYS[stacking >> 1]
+            else:
+                next_active = ACTIVE_CARDS[card]
+                self.active = next_active
+                self.stacking = 0
+                self.key = key ^ STATE_KEYS[next_top][next_active]
+        self.computer = not self.computer
+
+    def unmake_move(self) -> None:
+        """Takes back the last move made with make_move."""
+        (
+            self.comp_hand,
+            self.human_hand,
+            self.top,
+            self.active,
+            self.stacking,
+            self.key,
+        ) = self._history.pop()
+        self.computer = not self.computer
@@ -0,0 +1,101 @@
+import json
+import time
+
+
+class SearchStats:
+    """
+    Counters of one computer turn, collected only when enabled in the settings.
+
+    Attributes:
+        nodes (list[int]): Amount of visited nodes at every ply, nodes[0] are root positions.
+        cutoffs (int): Amount of alpha/beta cutoffs.
+        tt_hits (int): Amount of positions answered by the transposition table.
+        tablebase_hits (int): Amount of positions answered by the endgame tablebase.
+        cache_hits (int): Amount of decisions answered by the decision cache.
+        ponder_hits (int): Amount of decisions answered by pondering.
+        determinizations (int): Amount of searched hypothetical human hands.
+        chance_nodes (int): Amount of searched chance nodes of players taking cards.
+        depth (int): Depth of the deepest completed search.
+        fallback (str | None): "best_so_far" or "greedy" if the node budget ran out.
+        seconds (float): Wall time of the computer turn.
+    """
+
+    def __init__(self) -> None:
+        """Initialize the SearchStats object with zero counters."""
+        self.nodes = []
+        self.cutoffs = 0
+        self.tt_hits = 0
+        self.tablebase_hits = 0
+        self.cache_hits = 0
+        self.ponder_hits = 0
+        self.determinizations = 0
+        self.chance_nodes = 0
+        self.depth = 0
+        self.fallback = None
+        self.seconds = 0.0
+
+    def add_node(self, ply: int) -> None:
+        """
+        Counts a visited node.
+
+        Args:
+            ply (int): Distance of the node from the root of the search.
+        """
+        nodes = self.nodes
+        while len(nodes) <= ply:
+            nodes.append(0)
+        nodes[ply] += 1
+
+    def merge(self, other) -> None:
+        """
+        Adds the counters of another SearchStats object, e.g. of a worker process.
+
+        Args:
+            other (SearchStats): Counters to be added.
+        """
+        for ply, count in enumerate(other.nodes):
+            if ply == len(self.nodes):
+                self.nodes.append(0)
+            self.nodes[ply] += count
+        self.cutoffs += other.cutoffs
+        self.tt_hits += other.tt_hits
+        self.tablebase_hits += other.tablebase_hits
+        self.cache_hits += other.cache_hits
+        self.ponder_hits += other.ponder_hits
+        self.determinizations += other.determinizations
+        self.chance_nodes += other.chance_nodes
+        self.depth = max(self.depth, other.depth)
+
+    def as_dict(self) -> dict:
+        """
+        Returns the counters as a JSON serializable dictionary.
+
+        Returns:
+            dict: All counters and the total amount of nodes.
+        """
+        return {
+            "nodes": sum(self.nodes),
+            "nodes_per_ply": list(self.nodes),
+            "cutoffs": self.cutoffs,
+            "tt_hits": self.tt_hits,
+            "tablebase_hits": self.tablebase_hits,
+            "cache_hits": self.cache_hits,
+            "ponder_hits": self.ponder_hits,
+            "determinizations": self.determinizations,
+            "chance_nodes": self.chance_nodes,
+            "depth": self.depth,
+            "fallback": self.fallback,
+            "seconds": self.seconds,
+        }
+
+    def write_log(self, path: str, move=None) -> None:
+        """
+        Appends the counters as one JSON line to a log file.
+
+        Args:
+            path (str): Path of the JSON-lines log.
+            move (tuple[int, int] | None, optional): Chosen move. Defaults to None.
+        """
+        record = {"time": time.time(), "move": move, **self.as_dict()}
+        with open(path, "a") as file:
+            file.write(json.dumps(record) + "\n")
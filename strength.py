@@ -0,0 +1,171 @@
+import argparse
+from array import array
+import itertools as i
+import struct
+import time
+from bitcards import CARD_BITS, CARDS, COLOR_MASKS, NUMBER_MASKS
+from rules import SEARCH_PLAYABLE
+from tablebase import hand_offsets, hand_rank
+
+MAGIC = b"PRSIHS"
+VERSION = 1
+HEADER = struct.Struct("<6sBB")
+# Strengths are stored in one unsigned byte, the empty hand has won.
+MAX_STRENGTH = 127
+# Points of each feature, a playable card against every top is worth 64.
+FLEXIBILITY_POINTS = 2
+COLOR_POINTS = 4
+CHANGER_POINTS = 6
+SEVEN_POINTS = 3
+ACE_POINTS = 2
+
+
+def hand_strength(hand: int) -> int:
+    """
+    Scores how well a hand can answer the coming top cards, between 0 and MAX_STRENGTH.
+
+    Args:
+        hand (int): Bitmask of the hand.
+
+    Returns:
+        int: Points of the playable inactive top cards, covered colors and "*m", "*7" and "*a" cards.
+    """
+    flexible = sum(1 for top in range(len(CARDS)) if hand & SEARCH_PLAYABLE[top * 2])
+    colors = sum(1 for mask in COLOR_MASKS.values() if hand & mask)
+    value = (
+        FLEXIBILITY_POINTS * flexible
+        + COLOR_POINTS * colors
+        + CHANGER_POINTS * (hand & NUMBER_MASKS["m"]).bit_count()
+        + SEVEN_POINTS * (hand & NUMBER_MASKS["7"]).bit_count()
+        + ACE_POINTS * (hand & NUMBER_MASKS["a"]).bit_count()
+    )
+    return min(value, MAX_STRENGTH)
+
+
+class HandStrength:
+    """
+    Precomputed hand_strength of every hand with at most max_cards cards.
+
+    Attributes:
+        max_cards (int): Largest hand in the table.
+        offsets (tuple[int, ...]): Offsets of hand sizes, see tablebase.hand_offsets.
+        values (array.array): Strength of every hand by its rank.
+    """
+
+    def __init__(self, path: str) -> None:
+        """
+        Initialize the HandStrength object by reading a file written by write_table.
+
+        Args:
+            path (str): Path of the table file.
+
+        Raises:
+            ValueError: If the file is not a hand strength table of this version.
+        """
+        with open(path, "rb") as file:
+            data = file.read()
+        magic, version, max_cards = HEADER.unpack_from(data)
+        if magic != MAGIC or version != VERSION:
+            raise ValueError(f"Not a hand strength table: {path}")
+        self.max_cards = max_cards
+        self.offsets = hand_offsets(max_cards)
+        self.values = array("B", data[HEADER.size :])
+        if len(self.values) != self.offsets[-1]:
+            raise ValueError(f"Truncated hand strength table: {path}")
+
+    def covers(self, hand: int) -> bool:
+        """Checks if a hand is small enough for the table."""
+        return hand.bit_count() <= self.max_cards
+
+    def strength(self, hand: int) -> int:
+        """
+        Looks up the strength of a covered hand.
+
+        Args:
+            hand (int): Bitmask of the hand.
+
+        Returns:
+            int: hand_strength of the hand, MAX_STRENGTH for the empty hand.
+        """
+        if not hand:
+            return MAX_STRENGTH
+        return self.values[hand_rank(hand, self.offsets)]
+
+    def leaf_bonus(self, comp_hand: int, human_hand: int) -> float:
+        """
+        Returns the strength difference of two covered hands, scaled below half a card.
+
+        Args:
+            comp_hand (int): Bitmask of computer player's cards.
+            human_hand (int): Bitmask of human player's cards.
+
+        Returns:
+            float: Bonus of the computer player, between -0.5 and 0.5 exclusive.
+        """
+        values = self.values
+        offsets = self.offsets
+        return (
+            values[hand_rank(comp_hand, offsets)]
+            - values[hand_rank(human_hand, offsets)]
+        ) / (2 * MAX_STRENGTH + 2)
+
+
+_loaded = {}
+
+
+def load_strength(path: str) -> HandStrength:
+    """
+    Reads a hand strength table once per process.
+
+    Args:
+        path (str): Path of the table file.
+
+    Returns:
+        HandStrength: The loaded table.
+    """
+    if path not in _loaded:
+        _loaded[path] = HandStrength(path)
+    return _loaded[path]
+
+
+def generate(max_cards: int) -> bytearray:
+    """
+    Computes the strength of every hand with at most max_cards cards.
+
+    Args:
+        max_cards (int): Largest hand in the table.
+
+    Returns:
+        bytearray: Contents of the table file.
+    """
+    offsets = hand_offsets(max_cards)
+    data = bytearray(HEADER.size + offsets[-1])
+    HEADER.pack_into(data, 0, MAGIC, VERSION, max_cards)
+    for count in range(1, max_cards + 1):
+        for indices in i.combinations(range(len(CARDS)), count):
+            hand = sum(CARD_BITS[index] for index in indices)
+            data[HEADER.size + hand_rank(hand, offsets)] = hand_strength(hand)
+    return data
+
+
+def write_table(path: str, max_cards: int) -> None:
+    """
+    Generates the hand strength table and writes it to a file.
+
+    Args:
+        path (str): Path of the table file.
+        max_cards (int): Largest hand in the table.
+    """
+    data = generate(max_cards)
+    with open(path, "wb") as file:
+        file.write(data)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Prsi hand strength table generator.")
+    parser.add_argument("--max-cards", type=int, default=5)
+    parser.add_argument("--output", default="strength.tbl")
+    args = parser.parse_args()
+    start = time.perf_counter()
+    write_table(args.output, args.max_cards)
+    print(f"Wrote {args.output} in {time.perf_counter() - start:.1f} s")
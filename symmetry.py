@@ -0,0 +1,107 @@
+from bitcards import CARDS, COLOR_MASKS, COLORS, NUMBER_MASKS, NUMBERS, iter_indices
+
+COLOR_SHIFTS = tuple(index * len(NUMBERS) for index in range(len(COLORS)))
+PATTERN_MASK = (1 << len(NUMBERS)) - 1
+# Moves of canonical hands remembered by one symmetry, it is cleared when full.
+MEMO_ENTRIES = 4096
+
+
+class ColorSymmetry:
+    """
+    Color permutations which cannot change the computer player's decision.
+
+    Colors of no card in computer player's hand and other than the top card's color only
+    matter through the human hand. Swapping them in a human hand swaps them everywhere
+    in the search tree, so the search scores every computer move the same way. Hands
+    equal up to such a swap share one canonical hand and need to be searched only once.
+    Rollouts and chance nodes draw from the card pack, the unseen cards outside the
+    human hand, which a swap does not map onto itself, so they turn the symmetry off,
+    see usable.
+
+    Attributes:
+        free (list[int]): Bit shifts of the colors which can be swapped.
+        free_mask (int): Bitmask of all cards of the free colors.
+        moves (dict[int, tuple[int, int] | None]): Moves of searched canonical hands, at most MEMO_ENTRIES.
+    """
+
+    def __init__(self, comp_hand: int, top: int) -> None:
+        """
+        Initialize the ColorSymmetry object of a computer turn.
+
+        Args:
+            comp_hand (int): Bitmask of computer player's cards.
+            top (int): Index of the top card, a color change is the "*m" card of the chosen color.
+        """
+        fixed = {CARDS[top][0]}
+        fixed.update(CARDS[index][0] for index in iter_indices(comp_hand))
+        if not comp_hand & ~NUMBER_MASKS["m"]:
+            # With color changers only, the computer player can switch to any color.
+            fixed.update(COLORS)
+        self.free = [
+            shift for color, shift in zip(COLORS, COLOR_SHIFTS) if color not in fixed
+        ]
+        self.free_mask = sum(
+            COLOR_MASKS[color] for color in COLORS if color not in fixed
+        )
+        self.moves = {}
+
+    @staticmethod
+    def usable(settings) -> bool:
+        """
+        Checks if the settings search hands equal up to swapping colors only once.
+
+        Args:
+            settings (AISettings): Settings of the computer player.
+
+        Returns:
+            bool: True if color_symmetry is on and neither rollouts nor chance nodes draw cards.
+        """
+        return (
+            settings.color_symmetry
+            and not settings.rollouts
+            and not settings.chance_samples
+        )
+
+    @staticmethod
+    def of(comp_hand: int, top: int):
+        """
+        Returns the symmetry of a computer turn if there are colors to swap.
+
+        Args:
+            comp_hand (int): Bitmask of computer player's cards.
+            top (int): Index of the top card.
+
+        Returns:
+            ColorSymmetry | None: The symmetry, None if fewer than two colors are free.
+        """
+        symmetry = ColorSymmetry(comp_hand, top)
+        return symmetry if len(symmetry.free) > 1 else None
+
+    def canonical(self, hand: int) -> int:
+        """
+        Returns the canonical hand of all hands equal to hand up to swapping free colors.
+
+        Args:
+            hand (int): Bitmask of a hypothetical human hand.
+
+        Returns:
+            int: Bitmask of the canonical hand.
+        """
+        free = self.free
+        patterns = sorted(((hand >> shift) & PATTERN_MASK for shift in free), reverse=True)
+        canonical = hand & ~self.free_mask
+        for shift, pattern in zip(free, patterns):
+            canonical |= pattern << shift
+        return canonical
+
+    def remember(self, canonical: int, move) -> None:
+        """
+        Stores the searched move of a canonical hand, forgetting all moves when full.
+
+        Args:
+            canonical (int): Bitmask of the canonical hand.
+            move (tuple[int, int] | None): Move found for the hand.
+        """
+        if len(self.moves) >= MEMO_ENTRIES:
+            self.moves.clear()
+        self.moves[canonical] = move
@@ -0,0 +1,363 @@
+import argparse
+import itertools as i
+import mmap
+import struct
+import time
+from math import comb
+from bitcards import CARD_BITS, CARDS
+from rules import SEARCH_PLAYABLE, valid_moves
+from state import MAX_STACKING
+
+MAGIC = b"PRSITB"
+VERSION = 3
+HEADER = struct.Struct("<6sBB")
+
+
+def _state_slots() -> tuple[tuple[int, ...], int]:
+    """Numbers the search states, the active flag only matters on "*7" and "*a"."""
+    slots = []
+    count = 0
+    for card in CARDS:
+        # An active "*7" has a slot for every amount of stacked cards.
+        active_slots = {"7": MAX_STACKING // 2, "a": 1}.get(card[1], 0)
+        slots.extend((count, count + bool(active_slots)))
+        count += 1 + active_slots
+    return tuple(slots), count
+
+
+# STATE_SLOTS[top * 2 + is_active] is the first slot of a search state among SLOT_COUNT slots.
+STATE_SLOTS, SLOT_COUNT = _state_slots()
+BINOMIALS = tuple(
+    tuple(comb(n, k) for k in range(len(CARDS) + 1)) for n in range(len(CARDS))
+)
+
+
+def state_slot(top: int, is_active: bool, stacking: int) -> int:
+    """Returns the slot of a search state, stacking is 0 or at least 2 as in GameState."""
+    return STATE_SLOTS[top * 2 + is_active] + (stacking >> 1) - (stacking > 0)
+
+
+def hand_offsets(max_cards: int, cards: int = len(CARDS)) -> tuple[int, ...]:
+    """
+    Returns where the ranks of hands of every size start.
+
+    Args:
+        max_cards (int): Largest hand in the tablebase.
+        cards (int, optional): Amount of cards the hands are drawn from. Defaults to all cards.
+
+    Returns:
+        tuple[int, ...]: offsets[k] is the rank of the first hand with k cards, offsets[max_cards + 1] is the amount of hands.
+    """
+    offsets = [0, 0]
+    for count in range(1, max_cards + 1):
+        offsets.append(offsets[-1] + comb(cards, count))
+    return tuple(offsets)
+
+
+def hand_rank(hand: int, offsets: tuple[int, ...]) -> int:
+    """
+    Ranks a non-empty hand with the combinatorial number system.
+
+    Args:
+        hand (int): Bitmask of the hand.
+        offsets (tuple[int, ...]): Offsets of hand sizes, see hand_offsets.
+
+    Returns:
+        int: Rank of the hand, unique among hands of at most max_cards cards.
+    """
+    rank = offsets[hand.bit_count()]
+    position = 1
+    while hand:
+        low = hand & -hand
+        rank += BINOMIALS[low.bit_length() - 1][position]
+        position += 1
+        hand ^= low
+    return rank
+
+
+def squeeze(hand: int, removed: int) -> int:
+    """Drops the bits of removed from a disjoint hand, the higher bits move down."""
+    while removed:
+        high = removed.bit_length() - 1
+        removed ^= 1 << high
+        low_mask = (1 << high) - 1
+        hand = hand & low_mask | hand >> 1 & ~low_mask
+    return hand
+
+
+class PairRanks:
+    """
+    Ranks of disjoint pairs of non-empty hands with at most max_cards cards each.
+
+    The computer hand is ranked among all cards, the human hand among the cards the
+    computer hand does not hold, so overlapping pairs take no space.
+
+    Attributes:
+        offsets (tuple[int, ...]): Offsets of computer hand sizes, see hand_offsets.
+        human_offsets (tuple[tuple[int, ...], ...]): Offsets of human hand sizes by the computer hand size.
+        bases (tuple[int, ...]): bases[k] is the rank of the first pair with a k card computer hand.
+        count (int): Amount of ranked pairs.
+    """
+
+    def __init__(self, max_cards: int) -> None:
+        """
+        Initialize the PairRanks object.
+
+        Args:
+            max_cards (int): Largest hand in the tablebase.
+        """
+        self.offsets = hand_offsets(max_cards)
+        self.human_offsets = tuple(
+            hand_offsets(max_cards, len(CARDS) - count)
+            for count in range(max_cards + 1)
+        )
+        bases = [0, 0]
+        for count in range(1, max_cards + 1):
+            humans = self.human_offsets[count][-1]
+            bases.append(bases[-1] + comb(len(CARDS), count) * humans)
+        self.bases = tuple(bases)
+        self.count = bases[-1]
+
+    def rank(self, comp_hand: int, human_hand: int) -> int:
+        """
+        Ranks a disjoint pair of non-empty hands.
+
+        Args:
+            comp_hand (int): Bitmask of computer player's cards.
+            human_hand (int): Bitmask of human player's cards.
+
+        Returns:
+            int: Rank of the pair, below count.
+        """
+        count = comp_hand.bit_count()
+        human_offsets = self.human_offsets[count]
+        return (
+            self.bases[count]
+            + (hand_rank(comp_hand, self.offsets) - self.offsets[count])
+            * human_offsets[-1]
+            + hand_rank(squeeze(human_hand, comp_hand), human_offsets)
+        )
+
+
+class Tablebase:
+    """
+    Exact search scores of positions where both hands hold at most max_cards cards.
+
+    The file is memory mapped, a lookup ranks both hands and reads one byte. Every
+    disjoint pair of hands has SLOT_COUNT * 2 bytes, 26 MB for two cards and 2.4 GB
+    for three, so tablebases beyond two cards do not fit the memory of a server.
+
+    Attributes:
+        max_cards (int): Largest hand in the tablebase.
+        pairs (PairRanks): Ranks of the pairs of hands.
+        data (mmap.mmap): The mapped file.
+    """
+
+    def __init__(self, path: str) -> None:
+        """
+        Initialize the Tablebase object by mapping a file written by write_tablebase.
+
+        Args:
+            path (str): Path of the tablebase file.
+
+        Raises:
+            ValueError: If the file is not a tablebase of this version.
+        """
+        with open(path, "rb") as file:
+            self.data = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, version, max_cards = HEADER.unpack_from(self.data)
+        if magic != MAGIC or version != VERSION:
+            self.data.close()
+            raise ValueError(f"Not a tablebase file: {path}")
+        self.max_cards = max_cards
+        self.pairs = PairRanks(max_cards)
+
+    def covers(self, comp_hand: int, human_hand: int) -> bool:
+        """Checks if both non-empty hands are small enough for the tablebase."""
+        return (
+            comp_hand.bit_count() <= self.max_cards
+            and human_hand.bit_count() <= self.max_cards
+        )
+
+    def probe(
+        self,
+        comp_hand: int,
+        human_hand: int,
+        top: int,
+        is_active: bool,
+        is_maximizing: bool,
+        stacking: int = 0,
+    ) -> int:
+        """
+        Looks up the exact score of a covered position.
+
+        Args:
+            comp_hand (int): Bitmask of computer player's cards.
+            human_hand (int): Bitmask of human player's cards.
+            top (int): Index of the top card.
+            is_active (bool): Was last card an active card? True if yes.
+            is_maximizing (bool): Who is currently playing. True if computer.
+            stacking (int, optional): Cards to take against an active "*7", 0 or at least 2. Defaults to 0.
+
+        Returns:
+            int: Score of the position searched to the end.
+        """
+        pair = self.pairs.rank(comp_hand, human_hand)
+        slot = pair * SLOT_COUNT + state_slot(top, is_active, stacking)
+        index = slot * 2 + is_maximizing
+        value = self.data[HEADER.size + index]
+        return value - 256 if value > 127 else value
+
+    def close(self) -> None:
+        """Unmaps the file."""
+        self.data.close()
+
+
+_loaded = {}
+
+
+def load_tablebase(path: str) -> Tablebase:
+    """
+    Maps a tablebase file once per process.
+
+    Args:
+        path (str): Path of the tablebase file.
+
+    Returns:
+        Tablebase: The mapped tablebase.
+    """
+    if path not in _loaded:
+        _loaded[path] = Tablebase(path)
+    return _loaded[path]
+
+
+def generate(max_cards: int) -> bytearray:
+    """
+    Computes the tablebase by retrograde analysis.
+
+    Positions are solved from the fewest cards up, so every move leads to a solved
+    position. Standing a round after an ace keeps the cards, so inactive states of a
+    pair of hands are solved before the active ones. An active "*7" is solved for every
+    amount of stacked cards. Two cards take about two minutes, three cards would take
+    hours and 2.4 GB.
+
+    Args:
+        max_cards (int): Largest hand in the tablebase.
+
+    Returns:
+        bytearray: Contents of the tablebase file.
+    """
+    offsets = hand_offsets(max_cards)
+    hands = [0] * offsets[-1]
+    for count in range(1, max_cards + 1):
+        for indices in i.combinations(range(len(CARDS)), count):
+            hand = sum(CARD_BITS[index] for index in indices)
+            hands[hand_rank(hand, offsets)] = hand
+    pairs = PairRanks(max_cards)
+    data = bytearray(HEADER.size + pairs.count * SLOT_COUNT * 2)
+    HEADER.pack_into(data, 0, MAGIC, VERSION, max_cards)
+
+    # Inactive states first, an active ace can be answered by standing a round.
+    states = [(top, False, 0) for top in range(len(CARDS))]
+    for top, card in enumerate(CARDS):
+        if card[1] == "a":
+            states.append((top, True, 0))
+        elif card[1] == "7":
+            states.extend(
+                (top, True, stacking) for stacking in range(2, MAX_STACKING + 1, 2)
+            )
+
+    def value(comp_hand, human_hand, top, is_active, stacking, is_maximizing):
+        if not comp_hand:
+            return 100
+        if not human_hand:
+            return -100
+        index = (
+            pairs.rank(comp_hand, human_hand) * SLOT_COUNT
+            + state_slot(top, is_active, stacking)
+        ) * 2 + is_maximizing
+        stored = data[HEADER.size + index]
+        return stored - 256 if stored > 127 else stored
+
+    def solve(comp_hand, human_hand, top, is_active, stacking, is_maximizing):
+        current_hand = comp_hand if is_maximizing else human_hand
+        if not current_hand & SEARCH_PLAYABLE[top * 2 + is_active]:
+            if is_active and CARDS[top][1] == "a":
+                return value(comp_hand, human_hand, top, False, 0, not is_maximizing)
+            penalty = 9 + (stacking or 1)
+            return (
+                human_hand.bit_count()
+                - comp_hand.bit_count()
+                + (-penalty if is_maximizing else penalty)
+            )
+        scores = []
+        for card, next_top in valid_moves(current_hand, top, is_active, is_maximizing):
+            number = CARDS[card][1:]
+            next_active = number in ("a", "7")
+            next_stacking = min(stacking + 2, MAX_STACKING) if number == "7" else 0
+            if is_maximizing:
+                next_comp, next_human = comp_hand & ~CARD_BITS[card], human_hand
+            else:
+                next_comp, next_human = comp_hand, human_hand & ~CARD_BITS[card]
+            scores.append(
+                value(
+                    next_comp,
+                    next_human,
+                    next_top,
+                    next_active,
+                    next_stacking,
+                    not is_maximizing,
+                )
+            )
+        return max(scores) if is_maximizing else min(scores)
+
+    for total in range(2, 2 * max_cards + 1):
+        for comp_hand in hands:
+            human_count = total - comp_hand.bit_count()
+            if not 1 <= human_count <= max_cards:
+                continue
+            for human_hand in hands[offsets[human_count] : offsets[human_count + 1]]:
+                if comp_hand & human_hand:
+                    continue
+                base = pairs.rank(comp_hand, human_hand) * SLOT_COUNT
+                for top, is_active, stacking in states:
+                    slot = base + state_slot(top, is_active, stacking)
+                    for is_maximizing in (False, True):
+                        score = solve(
+                            comp_hand,
+                            human_hand,
+                            top,
+                            is_active,
+                            stacking,
+                            is_maximizing,
+                        )
+                        data[HEADER.size + slot * 2 + is_maximizing] = score & 0xFF
+    return data
+
+
+def write_tablebase(path: str, max_cards: int) -> None:
+    """
+    Generates the tablebase and writes it to a file.
+
+    Args:
+        path (str): Path of the tablebase file.
+        max_cards (int): Largest hand in the tablebase.
+    """
+    data = generate(max_cards)
+    with open(path, "wb") as file:
+        file.write(data)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Prsi endgame tablebase generator.")
+    parser.add_argument(
+        "--max-cards",
+        type=int,
+        default=2,
+        help="largest hand, 2 cards take 26 MB and 3 cards 2.4 GB",
+    )
+    parser.add_argument("--output", default="endgame.tb")
+    args = parser.parse_args()
+    start = time.perf_counter()
+    write_tablebase(args.output, args.max_cards)
+    print(f"Wrote {args.output} in {time.perf_counter() - start:.1f} s")
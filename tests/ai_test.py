@@ -0,0 +1,92 @@
+import unittest as u
+import random
+import time
+from bitcards import CARDS, to_cards, to_mask, top_index
+from rules import valid_moves
+from ai import ComputerAI
+from settings import AISettings
+import search
+
+
+class AITests(u.TestCase):
+    """Testcase containing the decision logic of the computer player."""
+
+    def setUp(self):
+        self.comp_hand = to_mask(["lk", "z8", "cm", "k7", "l10"])
+        self.human_hand = to_mask(["c8", "ks", "za", "l8", "z10", "c7", "km", "ls"])
+        self.top = top_index("l9")
+
+    def test_hard_fixed_depth(self):
+        """Testing that the fixed depth search plays a legal move."""
+        move = ComputerAI(AISettings(solver_cards=0)).choose_move(
+            self.comp_hand, self.top, False, self.human_hand
+        )
+        self.assertIn(move, valid_moves(self.comp_hand, self.top, False, True))
+
+    def test_hard_solved(self):
+        """Testing that forced wins and losses of small hard mode positions are played."""
+        rng = random.Random(7)
+        solved = 0
+        for _ in range(100):
+            cards = rng.sample(CARDS, 7)
+            comp, human = to_mask(cards[:3]), to_mask(cards[3:6])
+            top = top_index(cards[6])
+            score, move = search.Searcher().solve(comp, human, top, False)
+            if search.is_solved(score):
+                solved += 1
+                ai = ComputerAI(AISettings(depth=1))
+                self.assertEqual(ai.choose_move(comp, top, False, human), move)
+        self.assertGreater(solved, 0)
+
+    def test_hard_not_solved(self):
+        """Testing that positions without a forced result are searched as usual."""
+        score, _ = search.Searcher().solve(
+            self.comp_hand, self.human_hand, self.top, False
+        )
+        self.assertFalse(search.is_solved(score))
+        settings = AISettings(solver_cards=16, depth=1)
+        self.assertEqual(
+            ComputerAI(settings).choose_move(
+                self.comp_hand, self.top, False, self.human_hand
+            ),
+            search.Searcher().search_root(
+                self.comp_hand, self.human_hand, self.top, False, 1
+            )[1],
+        )
+        ai = ComputerAI(AISettings(chance_samples=8, stats=True))
+        ai.choose_move(self.comp_hand, self.top, False, self.human_hand)
+        self.assertGreater(ai.stats.chance_nodes, 0)
+
+    def test_hard_time_budget(self):
+        """Testing that a time budget bounds the hard mode search."""
+        ai = ComputerAI(AISettings(time_budget=0.05, solver_cards=0))
+        start = time.time()
+        move = ai.choose_move(self.comp_hand, self.top, False, self.human_hand)
+        self.assertLess(time.time() - start, 0.5)
+        self.assertIn(move, valid_moves(self.comp_hand, self.top, False, True))
+
+    def test_easy_time_budget(self):
+        """Testing that a time budget bounds the easy mode search over millions of hands."""
+        unseen = to_cards(
+            (1 << len(CARDS)) - 1 & ~self.comp_hand & ~to_mask(["l9"])
+        )
+        ai = ComputerAI(AISettings(time_budget=0.05))
+        start = time.time()
+        move = ai.choose_move(self.comp_hand, self.top, False, None, unseen, 8)
+        self.assertLess(time.time() - start, 0.5)
+        self.assertIn(move, valid_moves(self.comp_hand, self.top, False, True))
+
+    def test_spent_time_budget(self):
+        """Testing that a deadline passed before the first hand plays the greedy move."""
+        unseen = to_cards(
+            (1 << len(CARDS)) - 1 & ~self.comp_hand & ~to_mask(["l9"])
+        )
+        moves = valid_moves(self.comp_hand, self.top, False, True)
+        for workers in (1, 2):
+            ai = ComputerAI(AISettings(time_budget=0.0, workers=workers))
+            try:
+                move = ai.choose_move(self.comp_hand, self.top, False, None, unseen, 8)
+            finally:
+                ai.close()
+            self.assertIn(move, moves)
+            self.assertEqual(ai.fallback, "greedy")
@@ -0,0 +1,76 @@
+import unittest as u
+from collections import Counter
+import random
+from belief import HandBelief
+from bitcards import CARD_INDEX, FULL_MASK, to_mask
+from determinization import enumerate_hands, sample_hands
+
+
+class BeliefTests(u.TestCase):
+    """Testcase containing the belief about human player's hand."""
+
+    def test_exclude_and_draw(self):
+        """Testing that exclusions restrict held cards but not taken ones."""
+        belief = HandBelief(2)
+        belief.exclude(to_mask(["l8", "z8"]))
+        belief.draw()
+        self.assertEqual(belief.slots[:2], [FULL_MASK & ~to_mask(["l8", "z8"])] * 2)
+        self.assertEqual(belief.slots[2], FULL_MASK)
+        self.assertTrue(belief.consistent(to_mask(["l8", "k9", "c9"])))
+        self.assertFalse(belief.consistent(to_mask(["l8", "z8", "c9"])))
+
+    def test_play(self):
+        """Testing that a played card leaves the most restricted slot allowing it."""
+        belief = HandBelief(1)
+        belief.exclude(to_mask(["l8"]))
+        belief.draw()
+        belief.play(CARD_INDEX["l8"])
+        self.assertEqual(belief.slots, [FULL_MASK & ~to_mask(["l8"])])
+        belief.play(CARD_INDEX["k8"])
+        self.assertEqual(belief.slots, [])
+
+    def test_contradiction(self):
+        """Testing that playing an excluded card drops all exclusions."""
+        belief = HandBelief(2)
+        belief.exclude(to_mask(["l8"]))
+        belief.play(CARD_INDEX["l8"])
+        self.assertFalse(belief.constrained)
+        self.assertEqual(len(belief.slots), 1)
+
+    def test_enumerate(self):
+        """Testing that only consistent hands are enumerated, all of them if none is."""
+        belief = HandBelief(2)
+        belief.exclude(to_mask(["l8"]))
+        cards = ["l8", "k9", "c9"]
+        self.assertEqual(
+            list(enumerate_hands(cards, 2, belief)), [to_mask(["k9", "c9"])]
+        )
+        belief.exclude(to_mask(["k9", "c9"]))
+        self.assertEqual(len(list(enumerate_hands(cards, 2, belief))), 3)
+
+    def test_sample(self):
+        """Testing that sampled hands are consistent."""
+        belief = HandBelief(2)
+        belief.exclude(to_mask(["l8", "l9"]))
+        belief.draw()
+        cards = ["l8", "l9", "k9", "c9", "zs"]
+        hands = sample_hands(cards, 3, random.Random(2), belief=belief)
+        for _ in range(50):
+            hand = next(hands)
+            self.assertEqual(hand.bit_count(), 3)
+            self.assertTrue(belief.consistent(hand))
+
+    def test_sample_uniform(self):
+        """Testing that every consistent hand is sampled equally often."""
+        belief = HandBelief(1)
+        belief.exclude(to_mask(["l8", "l9"]))
+        belief.draw()
+        cards = to_mask(["l8", "l9", "k9", "c9", "zs"])
+        rng = random.Random(3)
+        counts = Counter(belief.sample(cards, rng) for _ in range(9000))
+        self.assertEqual(len(counts), 9)
+        self.assertNotIn(to_mask(["l8", "l9"]), counts)
+        for hand, count in counts.items():
+            self.assertTrue(belief.consistent(hand))
+            self.assertGreater(count, 850)
+            self.assertLess(count, 1150)
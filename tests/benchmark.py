@@ -0,0 +1,243 @@
+# Speed benchmarks, run with: python -m tests.benchmark --output bench.json [--baseline old.json]
+import argparse
+import json
+import platform
+import random
+import sys
+import time
+import tracemalloc
+from ai import ComputerAI
+from bitcards import CARDS, to_cards, to_mask, top_index
+from game_runner import GameRunner
+from rules import valid_moves
+from search import Searcher
+from settings import AISettings
+from simulation import AIPolicy, Simulator, greedy_policy
+
+# Metric name -> True if a higher value is better.
+METRICS = {
+    "ms_per_decision": False,
+    "nodes_per_sec": True,
+    "ops_per_sec": True,
+    "games_per_sec": True,
+    "peak_kib": False,
+}
+
+
+def positions(seed: int, count: int, comp_count: int, human_count: int) -> list:
+    """
+    Generates fixed random positions.
+
+    Args:
+        seed (int): Seed of the positions.
+        count (int): Amount of positions.
+        comp_count (int): Amount of computer player's cards.
+        human_count (int): Amount of human player's cards.
+
+    Returns:
+        list[tuple[int, int, int, list[str]]]: (comp_hand, human_hand, top, unseen cards) positions.
+    """
+    rng = random.Random(seed)
+    result = []
+    for _ in range(count):
+        cards = list(CARDS)
+        rng.shuffle(cards)
+        comp = cards[:comp_count]
+        human = cards[comp_count : comp_count + human_count]
+        top = cards[comp_count + human_count]
+        rest = cards[comp_count + human_count + 1 :]
+        # Roughly a third of the cards already lie in the played pack.
+        unseen = human + rest[len(rest) // 3 :]
+        result.append((to_mask(comp), to_mask(human), top_index(top), unseen))
+    return result
+
+
+def measure(function, repeat: int = 3) -> dict:
+    """
+    Times a function and measures its peak memory in a separate run.
+
+    Args:
+        function (Callable[[], int]): Benchmarked function, returns the amount of work done (decisions, nodes...).
+        repeat (int, optional): Timed runs, the fastest one counts. Defaults to 3.
+
+    Returns:
+        dict: seconds, work and peak_kib.
+    """
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        work = function()
+        elapsed = time.perf_counter() - start
+        if best is None or elapsed < best[0]:
+            best = (elapsed, work)
+    tracemalloc.start()
+    function()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return {"seconds": best[0], "work": best[1], "peak_kib": peak / 1024}
+
+
+def bench_minimax(depth: int, count: int) -> dict:
+    """Searches fixed 6 vs 6 card positions to the given depth."""
+    cases = positions(depth, count, 6, 6)
+
+    def run():
+        nodes = 0
+        for comp, human, top, _ in cases:
+            searcher = Searcher.from_settings(AISettings())
+            searcher.search_root(comp, human, top, False, depth)
+            nodes += searcher.nodes
+        return nodes
+
+    result = measure(run)
+    return {
+        "ms_per_decision": result["seconds"] * 1000 / count,
+        "nodes_per_sec": result["work"] / result["seconds"],
+        "peak_kib": result["peak_kib"],
+    }
+
+
+def bench_decision(easy: bool, human_count: int, count: int) -> dict:
+    """Runs whole computer turns, easy mode with many hands samples them."""
+    cases = positions(100 + human_count, count, 5, human_count)
+    settings = AISettings(
+        sampling="monte_carlo" if easy and human_count > 3 else "exhaustive",
+        seed=0,
+    )
+
+    def run():
+        ai = ComputerAI(settings)
+        for comp, human, top, unseen in cases:
+            if easy:
+                ai.choose_move(comp, top, False, None, unseen, human_count)
+            else:
+                ai.choose_move(comp, top, False, human)
+        return count
+
+    result = measure(run)
+    return {
+        "ms_per_decision": result["seconds"] * 1000 / count,
+        "peak_kib": result["peak_kib"],
+    }
+
+
+def bench_valid_moves(count: int) -> dict:
+    """Generates moves with the string API and with bitmask hands."""
+    cases = positions(7, 64, 7, 7)
+    runner = GameRunner()
+    string_cases = [(to_cards(comp), CARDS[top]) for comp, _, top, _ in cases]
+
+    def run_strings():
+        for _ in range(count // len(cases)):
+            for hand, top in string_cases:
+                runner._get_valid_moves(hand, top, False, True)
+        return count
+
+    def run_masks():
+        for _ in range(count // len(cases)):
+            for comp, _, top, _ in cases:
+                valid_moves(comp, top, False, True)
+        return count
+
+    strings = measure(run_strings)
+    masks = measure(run_masks)
+    return {
+        "strings": {"ops_per_sec": strings["work"] / strings["seconds"]},
+        "bitmask": {"ops_per_sec": masks["work"] / masks["seconds"]},
+    }
+
+
+def bench_games(games: int) -> dict:
+    """Plays full hard mode games against the greedy policy."""
+
+    def run():
+        Simulator((greedy_policy, AIPolicy(easy=False)), seed=0).run(games)
+        return games
+
+    result = measure(run)
+    return {
+        "games_per_sec": result["work"] / result["seconds"],
+        "peak_kib": result["peak_kib"],
+    }
+
+
+def run_benchmarks(quick: bool = False) -> dict:
+    """
+    Runs the whole suite.
+
+    Args:
+        quick (bool, optional): Fewer positions and games for a fast smoke run. Defaults to False.
+
+    Returns:
+        dict: Flat mapping of benchmark names to their metrics.
+    """
+    scale = 1 if quick else 5
+    results = {}
+    for depth in range(2, 9):
+        results[f"minimax/depth{depth}"] = bench_minimax(depth, 4 * scale)
+    for easy in (True, False):
+        for human_count in (3, 7):
+            mode = "easy" if easy else "hard"
+            results[f"decision/{mode}/human{human_count}"] = bench_decision(
+                easy, human_count, 2 * scale
+            )
+    for name, metrics in bench_valid_moves(2000 * scale).items():
+        results[f"valid_moves/{name}"] = metrics
+    results["games/hard_vs_greedy"] = bench_games(10 * scale)
+    return results
+
+
+def compare(results: dict, baseline: dict, threshold: float) -> list[str]:
+    """
+    Finds metrics which got worse than the baseline by more than the threshold.
+
+    Args:
+        results (dict): Current benchmark results.
+        baseline (dict): Stored benchmark results.
+        threshold (float): Allowed relative change, e.g. 0.2 for 20 %.
+
+    Returns:
+        list[str]: Descriptions of the regressions.
+    """
+    regressions = []
+    for name, metrics in results.items():
+        for metric, value in metrics.items():
+            old = baseline.get(name, {}).get(metric)
+            if not old or metric not in METRICS:
+                continue
+            change = (value - old) / old
+            if METRICS[metric]:
+                change = -change
+            if change > threshold:
+                regressions.append(
+                    f"{name} {metric}: {old:.4g} -> {value:.4g} ({change:+.0%} worse)"
+                )
+    return regressions
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Prsi speed benchmarks.")
+    parser.add_argument("--output", help="write results as JSON to this file")
+    parser.add_argument("--baseline", help="compare against results stored in this file")
+    parser.add_argument("--threshold", type=float, default=0.2)
+    parser.add_argument("--quick", action="store_true")
+    args = parser.parse_args()
+
+    results = run_benchmarks(args.quick)
+    report = {
+        "python": platform.python_version(),
+        "machine": platform.machine(),
+        "benchmarks": results,
+    }
+    text = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w") as file:
+            file.write(text)
+    else:
+        print(text)
+    if args.baseline:
+        with open(args.baseline) as file:
+            regressions = compare(results, json.load(file)["benchmarks"], args.threshold)
+        for regression in regressions:
+            print(f"REGRESSION {regression}", file=sys.stderr)
+        sys.exit(1 if regressions else 0)
@@ -0,0 +1,27 @@
+import unittest as u
+from .benchmark import compare, positions
+
+
+class BenchmarkTests(u.TestCase):
+    """Testcase containing the benchmark suite helpers."""
+
+    def test_positions_are_fixed(self):
+        """Testing that the same seed gives the same positions."""
+        self.assertEqual(positions(3, 4, 5, 5), positions(3, 4, 5, 5))
+        comp, human, top, unseen = positions(3, 1, 5, 6)[0]
+        self.assertEqual(comp.bit_count(), 5)
+        self.assertEqual(human.bit_count(), 6)
+        self.assertFalse(comp & human)
+        self.assertEqual(len(unseen), len(set(unseen)))
+
+    def test_compare(self):
+        """Testing that only changes beyond the threshold in the worse direction are reported."""
+        baseline = {"a": {"ms_per_decision": 10.0, "nodes_per_sec": 1000.0}}
+        self.assertEqual(compare(baseline, baseline, 0.2), [])
+        faster = {"a": {"ms_per_decision": 5.0, "nodes_per_sec": 2000.0}}
+        self.assertEqual(compare(faster, baseline, 0.2), [])
+        slower = {"a": {"ms_per_decision": 13.0, "nodes_per_sec": 700.0}}
+        regressions = compare(slower, baseline, 0.2)
+        self.assertEqual(len(regressions), 2)
+        self.assertEqual(compare(slower, baseline, 0.5), [])
+        self.assertEqual(compare(slower, {}, 0.2), [])
@@ -0,0 +1,36 @@
+import unittest as u
+from bitcards import CARDS, FULL_MASK, to_cards, to_mask
+from cards import CardHand, GiveCardPack
+
+
+class BitcardsTests(u.TestCase):
+    """Testcase containing the bitmask card encoding."""
+
+    def test_cards_match_generated(self):
+        """Testing that every generated card has exactly one bit."""
+        self.assertEqual(
+            sorted(CARDS),
+            sorted(GiveCardPack.generate_all_cards()),
+            "Bitmask encoding should cover exactly the generated cards.",
+        )
+        self.assertEqual(
+            to_mask(CARDS), FULL_MASK, "All cards should set all 32 bits."
+        )
+
+    def test_round_trip(self):
+        """Testing that encoding and decoding returns the same cards."""
+        self.assertEqual(
+            sorted(to_cards(to_mask(["l7", "z10", "cm"]))),
+            ["cm", "l7", "z10"],
+            "Decoding an encoded hand should return the same cards.",
+        )
+
+    def test_cardhand_to_mask(self):
+        """Testing the bitmask of a CardHand."""
+        hand = CardHand()
+        hand.cards = ["ka", "l10"]
+        self.assertEqual(
+            hand.to_mask(),
+            to_mask(["ka", "l10"]),
+            "CardHand.to_mask should encode the cards in hand.",
+        )
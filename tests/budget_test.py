@@ -0,0 +1,119 @@
+import unittest as u
+from unittest.mock import patch
+from ai import ComputerAI
+from bitcards import CARD_BITS, FULL_MASK, to_cards, to_mask, top_index
+from budget import (
+    MEMO_ENTRY_BYTES,
+    TT_ENTRY_BYTES,
+    fit_memory,
+    memory_estimate,
+)
+from rules import greedy_move
+from server import computer_move
+from search import Searcher
+from settings import AISettings
+from symmetry import MEMO_ENTRIES
+
+
+class BudgetTests(u.TestCase):
+    """Testcase containing the node and memory budgets of the computer player."""
+
+    def setUp(self):
+        """Sets up a position which takes a few thousand nodes to search."""
+        self.comp = to_mask(["l7", "k8", "z9", "cs", "lm", "z10", "ka"])
+        self.human = to_mask(["la", "k9", "lk", "c8", "zs", "k7", "c10"])
+        self.top = top_index("l8")
+
+    def test_greedy_fallback(self):
+        """Testing that the greedy move is played when no search finished."""
+        ai = ComputerAI(AISettings(max_nodes=64, solver_cards=0, depth=9))
+        move = ai.choose_move(self.comp, self.top, False, self.human)
+        self.assertEqual(move, greedy_move(self.comp, self.top, False, True))
+        self.assertEqual(ai.fallback, "greedy")
+        self.assertLessEqual(sum(searcher.nodes for searcher in ai.searchers), 64)
+
+    def test_best_so_far(self):
+        """Testing that the votes collected before the budget ran out decide."""
+        ai = ComputerAI(AISettings(max_nodes=2000, stats=True))
+        unseen = to_cards(self.human | to_mask(["c9", "ca", "k10"]))
+        move = ai.choose_move(self.comp, self.top, False, None, unseen, 7)
+        self.assertEqual(ai.fallback, "best_so_far")
+        self.assertEqual(ai.stats.fallback, "best_so_far")
+        self.assertIsNotNone(move)
+        self.assertLessEqual(ai.searchers[0].nodes, 2000 + 64)
+        ai.choose_move(self.comp, self.top, False, self.human)
+        self.assertIsNone(ai.fallback)
+
+    def test_truncated_vote_unbiased(self):
+        """Testing that hands voting before the budget ran out are not the first unseen cards."""
+        ai = ComputerAI(AISettings(max_nodes=3000, color_symmetry=False, seed=1))
+        unseen = to_cards(FULL_MASK & ~self.comp & ~CARD_BITS[self.top])[::-1][:20]
+        first = to_mask(unseen[:10])
+        searched = []
+        search_root = Searcher.search_root
+
+        def recording(searcher, comp_hand, human_hand, *args, **kwargs):
+            searched.append(human_hand)
+            return search_root(searcher, comp_hand, human_hand, *args, **kwargs)
+
+        with patch.object(Searcher, "search_root", recording):
+            ai.choose_move(self.comp, self.top, False, None, unseen, 10)
+        self.assertEqual(ai.fallback, "best_so_far")
+        overlap = sum((hand & first).bit_count() for hand in searched) / len(searched)
+        # Lexicographic order overlaps in about 8.5 cards, random hands in 5.
+        self.assertLess(overlap, 6.5)
+
+    def test_shared_budget(self):
+        """Testing that searchers of one turn share the budget."""
+        ai = ComputerAI(AISettings(max_nodes=1000))
+        ai.searchers = []
+        first = ai.searcher()
+        first.nodes = 700
+        self.assertEqual(ai.searcher().max_nodes, 300)
+
+    def test_fit_memory(self):
+        """Testing that tables are shrunk to the memory budget."""
+        settings = AISettings(max_memory=1 << 20)
+        fitted, reduced = fit_memory(settings)
+        self.assertEqual(reduced, ["tt_size"])
+        self.assertLessEqual(memory_estimate(fitted), 1 << 20)
+        memo = MEMO_ENTRIES * MEMO_ENTRY_BYTES
+        self.assertEqual(fitted.tt_size, ((1 << 20) - memo) // TT_ENTRY_BYTES)
+        self.assertEqual(settings.tt_size, 1 << 16)
+        ismcts, reduced = fit_memory(
+            AISettings(
+                engine="ismcts", iterations=10_000, tt_size=0, max_memory=1 << 20
+            )
+        )
+        self.assertEqual(reduced, ["iterations"])
+        self.assertLess(ismcts.iterations, 10_000)
+        unlimited = AISettings(max_memory=1 << 30)
+        self.assertEqual(fit_memory(unlimited), (unlimited, []))
+        ai = ComputerAI(settings)
+        self.assertEqual(ai.memory_reductions, ["tt_size"])
+
+    def test_searcher_copies(self):
+        """Testing that worker processes and pondering count their own tables."""
+        single = memory_estimate(AISettings())
+        self.assertEqual(memory_estimate(AISettings(workers=4)), 5 * single)
+        self.assertEqual(memory_estimate(AISettings(ponder=True)), 2 * single)
+        self.assertGreater(memory_estimate(AISettings(chance_samples=8)), single)
+        fitted, _ = fit_memory(AISettings(workers=4, max_memory=16 << 20))
+        self.assertLessEqual(memory_estimate(fitted), 16 << 20)
+
+    def test_for_difficulty(self):
+        """Testing that budgets of a difficulty override the settings."""
+        settings = AISettings(max_nodes=5000, budgets={"easy": {"max_nodes": 100}})
+        self.assertEqual(settings.for_difficulty(True).max_nodes, 100)
+        self.assertIs(settings.for_difficulty(False), settings)
+        with self.assertRaises(ValueError):
+            AISettings(budgets={"hard": {"depth": 9}}).for_difficulty(False)
+
+    def test_server_reports_fallback(self):
+        """Testing that server workers send the fallback back."""
+        settings = AISettings(max_nodes=64, solver_cards=0, depth=9)
+        move, fallback = computer_move(
+            settings, self.comp, self.top, False, self.human, None, 7
+        )
+        self.assertEqual(move, greedy_move(self.comp, self.top, False, True))
+        self.assertEqual(fallback, "greedy")
@@ -0,0 +1,106 @@
+import unittest as u
+import os
+import tempfile
+from ai import ComputerAI
+from bitcards import to_mask, top_index
+from cache import DecisionCache, decision_key
+from settings import AISettings
+
+
+class CacheTests(u.TestCase):
+    """Testcase containing the decision cache."""
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.directory.name, "decisions.db")
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_get_put(self):
+        """Testing that moves and taking a card are stored and survive a restart."""
+        cache = DecisionCache(self.path)
+        self.assertIsNone(cache.get("a"))
+        cache.put("a", (3, 3))
+        cache.put("b", None)
+        cache.close()
+        cache = DecisionCache(self.path)
+        self.assertEqual(cache.get("a"), (3, 3))
+        self.assertEqual(cache.get("b"), ())
+        cache.close()
+
+    def test_eviction(self):
+        """Testing that the least recently used decisions are evicted."""
+        cache = DecisionCache(self.path, max_entries=2, memory_size=1)
+        cache.put("a", (1, 1))
+        cache.put("b", (2, 2))
+        cache.get("a")
+        cache.put("c", (3, 3))
+        self.assertEqual(len(cache.memory), 1)
+        self.assertEqual(cache.get("a"), (1, 1))
+        self.assertIsNone(cache.get("b"))
+        self.assertEqual(cache.get("c"), (3, 3))
+        cache.close()
+
+    def test_key(self):
+        """Testing that the key depends on the game state and on the search settings."""
+        state = (to_mask(["l7", "k8"]), top_index("l9"), False, to_mask(["za"]), None, 1)
+        self.assertEqual(
+            decision_key(AISettings(), *state), decision_key(AISettings(workers=2), *state)
+        )
+        self.assertNotEqual(
+            decision_key(AISettings(), *state), decision_key(AISettings(depth=6), *state)
+        )
+        self.assertNotEqual(
+            decision_key(AISettings(), *state),
+            decision_key(AISettings(max_nodes=100), *state),
+        )
+
+    def test_choose_move_cached(self):
+        """Testing that a repeated computer turn is answered from the cache."""
+        settings = AISettings(cache_path=self.path, stats=True)
+        comp, top = to_mask(["l7", "k8", "cm"]), top_index("l9")
+        unseen = ["za", "k9", "l8"]
+        ai = ComputerAI(settings)
+        move = ai.choose_move(comp, top, False, None, unseen, 2)
+        ai.close()
+        ai = ComputerAI(settings)
+        self.assertEqual(ai.choose_move(comp, top, False, None, unseen, 2), move)
+        self.assertEqual(ai.stats.cache_hits, 1)
+        self.assertEqual(ai.stats.determinizations, 0)
+        ai.close()
+
+    def test_fallback_not_cached(self):
+        """Testing that moves played when the node budget ran out are not stored."""
+        settings = AISettings(
+            cache_path=self.path, stats=True, max_nodes=64, solver_cards=0, depth=9
+        )
+        comp = to_mask(["l7", "k8", "z9", "cs", "lm", "z10", "ka"])
+        human = to_mask(["la", "k9", "lk", "c8", "zs", "k7", "c10"])
+        top = top_index("l8")
+        ai = ComputerAI(settings)
+        ai.choose_move(comp, top, False, human)
+        self.assertEqual(ai.fallback, "greedy")
+        ai.close()
+        ai = ComputerAI(settings)
+        ai.choose_move(comp, top, False, human)
+        self.assertEqual(ai.stats.cache_hits, 0)
+        ai.close()
+
+    def test_interrupted_not_cached(self):
+        """Testing that moves of a search cut by the deadline are not stored."""
+        settings = AISettings(
+            cache_path=self.path, stats=True, time_budget=0.0, solver_cards=0
+        )
+        comp = to_mask(["l7", "k8", "z9", "cs", "lm", "z10", "ka"])
+        human = to_mask(["la", "k9", "lk", "c8", "zs", "k7", "c10"])
+        top = top_index("l8")
+        ai = ComputerAI(settings)
+        self.assertIsNotNone(ai.choose_move(comp, top, False, human))
+        self.assertIsNone(ai.fallback)
+        self.assertTrue(ai.interrupted)
+        ai.close()
+        ai = ComputerAI(settings)
+        ai.choose_move(comp, top, False, human)
+        self.assertEqual(ai.stats.cache_hits, 0)
+        ai.close()
@@ -0,0 +1,71 @@
+import unittest as u
+from collections import Counter
+from inspect import isgenerator
+import itertools as i
+from math import comb
+import random
+from bitcards import to_mask
+from determinization import (
+    confidence_z,
+    enumerate_hands,
+    sample_hands,
+    votes_separated,
+)
+
+
+class DeterminizationTests(u.TestCase):
+    """Testcase containing generation of hypothetical human hands."""
+
+    def test_enumerate_hands_is_lazy(self):
+        """Testing that hands are produced by a generator."""
+        self.assertTrue(
+            isgenerator(enumerate_hands(["l7", "k8"], 1)),
+            "Hypothetical hands should be generated lazily.",
+        )
+
+    def test_enumerate_hands(self):
+        """Testing that every combination is produced exactly once."""
+        cards = ["l7", "k8", "c9", "z10", "lm"]
+        hands = list(enumerate_hands(cards, 2))
+        self.assertEqual(len(hands), comb(5, 2))
+        self.assertEqual(len(set(hands)), comb(5, 2), "Hands should be unique.")
+        self.assertIn(to_mask(["l7", "lm"]), hands)
+
+    def test_enumerate_hands_shuffled(self):
+        """Testing that a seeded order produces every hand once, not the first cards first."""
+        cards = ["l7", "k8", "c9", "z10", "lm", "za", "ks", "c7", "z8", "l9", "kk", "cm"]
+        hands = list(enumerate_hands(cards, 4, rng=random.Random(3)))
+        self.assertEqual(sorted(hands), sorted(enumerate_hands(cards, 4)))
+        first = to_mask(cards[:4])
+        overlap = sum((hand & first).bit_count() for hand in hands[:100]) / 100
+        # Lexicographic order overlaps in about 2.3 cards, random hands in 4 / 3.
+        self.assertLess(overlap, 1.8)
+
+    def test_sample_hands_size(self):
+        """Testing that sampled hands have the right amount of unseen cards."""
+        cards = ["l7", "k8", "c9", "z10", "lm"]
+        for hand in i.islice(sample_hands(cards, 3, random.Random(1)), 50):
+            self.assertEqual(hand.bit_count(), 3)
+            self.assertEqual(hand & ~to_mask(cards), 0)
+
+    def test_sample_hands_weights(self):
+        """Testing that cards with zero weight are never sampled."""
+        cards = ["l7", "k8", "c9", "z10"]
+        hands = sample_hands(cards, 2, random.Random(1), {"l7": 0.0})
+        for hand in i.islice(hands, 50):
+            self.assertFalse(
+                hand & to_mask(["l7"]), "A card with zero weight should not be drawn."
+            )
+
+    def test_votes_separated(self):
+        """Testing the early stop of Monte Carlo sampling."""
+        z = confidence_z(0.95)
+        self.assertFalse(votes_separated(Counter(), z))
+        self.assertFalse(
+            votes_separated(Counter({"a": 6, "b": 4}), z),
+            "A lead of 6 to 4 is not statistically significant.",
+        )
+        self.assertTrue(
+            votes_separated(Counter({"a": 60, "b": 10, "c": 30}), z),
+            "A lead of 60 to 30 should be significant.",
+        )
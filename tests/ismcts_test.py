@@ -0,0 +1,109 @@
+import unittest as u
+from concurrent.futures import ProcessPoolExecutor
+import random
+from ai import ComputerAI
+from bitcards import CARD_INDEX, to_mask, top_index
+import ismcts
+from settings import AISettings
+from stats import SearchStats
+
+
+class ISMCTSTests(u.TestCase):
+    """Testcase containing the Information Set Monte Carlo Tree Search."""
+
+    def test_best_move(self):
+        """Testing that the "*7" keeping the human player from winning gets most visits."""
+        tree = ismcts.ISMCTS(AISettings(iterations=200, seed=1))
+        visits = tree.search(
+            to_mask(["z7", "z8"]), top_index("z9"), False, to_mask(["c8"]), None, 1
+        )
+        self.assertEqual(sum(visits.values()), 200)
+        self.assertEqual(visits.most_common(1)[0][0], (CARD_INDEX["z7"],) * 2)
+
+    def test_take_card(self):
+        """Testing that taking a card is the only move without a playable card."""
+        tree = ismcts.ISMCTS(AISettings(iterations=50, seed=1))
+        visits = tree.search(
+            to_mask(["lk"]), top_index("z9"), False, to_mask(["c8"]), None, 1
+        )
+        self.assertEqual(visits, {None: 50})
+
+    def test_hard_mode_pack(self):
+        """Testing that hard mode playouts only draw the unseen cards."""
+        decks = []
+
+        class Recording(ismcts.ISMCTS):
+            def _iterate(self, root, comp_hand, human_hand, deck, *state):
+                decks.append(set(deck))
+                return super()._iterate(root, comp_hand, human_hand, deck, *state)
+
+        human = to_mask(["c8", "k9"])
+        Recording(AISettings(iterations=20, seed=1)).search(
+            to_mask(["lk"]), top_index("z9"), False, human, ["c8", "k9", "z10", "l7"], 2
+        )
+        self.assertEqual(decks, [{CARD_INDEX["z10"], CARD_INDEX["l7"]}] * 20)
+
+    def test_seeded(self):
+        """Testing that equal seeds grow equal trees."""
+        arguments = (to_mask(["lk", "z8", "cm"]), top_index("l9"), False)
+        runs = [
+            ismcts.run_ismcts(
+                AISettings(stats=True),
+                7,
+                300,
+                *arguments,
+                None,
+                ["c8", "ks", "k9"],
+                2,
+            )
+            for _ in range(2)
+        ]
+        self.assertEqual(runs[0][0], runs[1][0])
+        self.assertEqual(runs[0][1].determinizations, 300)
+
+    def test_parallel(self):
+        """Testing that root parallel trees add up their visits."""
+        settings = AISettings(iterations=301, stats=True)
+        stats = SearchStats()
+        with ProcessPoolExecutor(2) as executor:
+            visits, exhausted = ismcts.ismcts_parallel(
+                executor,
+                2,
+                random.Random(1),
+                settings,
+                to_mask(["lk", "z8", "cm"]),
+                top_index("l9"),
+                False,
+                None,
+                ["c8", "ks", "k9", "za"],
+                2,
+                stats=stats,
+            )
+        self.assertEqual(sum(visits.values()), 301)
+        self.assertEqual(stats.determinizations, 301)
+        self.assertFalse(exhausted)
+
+    def test_node_budget(self):
+        """Testing that iterations stop when the plies reach max_nodes."""
+        settings = AISettings(engine="ismcts", iterations=10_000, max_nodes=500)
+        tree = ismcts.ISMCTS(settings)
+        visits = tree.search(
+            to_mask(["lk", "z8", "cm"]), top_index("l9"), False, None, ["c8", "ks"], 2
+        )
+        self.assertTrue(tree.exhausted)
+        self.assertLess(sum(visits.values()), 10_000)
+        self.assertLess(tree.nodes, 500 + ismcts.ROLLOUT_PLIES + 2)
+        ai = ComputerAI(settings)
+        ai.choose_move(
+            to_mask(["lk", "z8", "cm"]), top_index("l9"), False, None, ["c8", "ks"], 2
+        )
+        self.assertEqual(ai.fallback, "best_so_far")
+
+    def test_computer_ai(self):
+        """Testing that the engine setting selects ISMCTS."""
+        ai = ComputerAI(AISettings(engine="ismcts", iterations=100, stats=True))
+        move = ai.choose_move(
+            to_mask(["z7", "z8"]), top_index("z9"), False, to_mask(["c8"]), None, 1
+        )
+        self.assertEqual(move, (CARD_INDEX["z7"],) * 2)
+        self.assertEqual(ai.stats.determinizations, 100)
@@ -0,0 +1,53 @@
+import unittest as u
+import random
+from bitcards import CARDS, MOVES, to_mask, top_index
+from ordering import MoveOrdering
+from search import Searcher
+
+
+def move(card: str):
+    return MOVES[top_index(card)][0]
+
+
+class OrderingTests(u.TestCase):
+    """Testcase containing the move ordering heuristics."""
+
+    def test_order_priorities(self):
+        """Testing that the table move goes first, then active cards, then killers."""
+        ordering = MoveOrdering()
+        ordering.record_cutoff(move("l8"), 2, 1, True)
+        moves = [move("lk"), move("l8"), move("la"), move("ls")]
+        self.assertEqual(
+            ordering.order(moves, 2, move("ls"), True),
+            [move("ls"), move("la"), move("l8"), move("lk")],
+        )
+
+    def test_history(self):
+        """Testing that the history score sorts the remaining moves."""
+        ordering = MoveOrdering()
+        ordering.record_cutoff(move("lk"), 5, 3, False)
+        moves = [move("l8"), move("lk")]
+        self.assertEqual(ordering.order(moves, 0, None, False), [move("lk"), move("l8")])
+        self.assertEqual(
+            ordering.order(moves, 0, None, True),
+            moves,
+            "History of the other player should not be used.",
+        )
+
+    def test_fewer_nodes_same_result(self):
+        """Testing that ordering prunes more without changing the search result."""
+        rng = random.Random(5)
+        plain_nodes = ordered_nodes = 0
+        for _ in range(50):
+            cards = rng.sample(CARDS, 15)
+            comp, human = to_mask(cards[:7]), to_mask(cards[7:14])
+            top = top_index(cards[14])
+            plain = Searcher()
+            ordered = Searcher(ordering=MoveOrdering())
+            self.assertEqual(
+                plain.search_root(comp, human, top, False, 6),
+                ordered.search_root(comp, human, top, False, 6),
+            )
+            plain_nodes += plain.nodes
+            ordered_nodes += ordered.nodes
+        self.assertLess(ordered_nodes, plain_nodes)
@@ -0,0 +1,76 @@
+import unittest as u
+from collections import deque
+from ai import ComputerAI
+from bitcards import to_mask, top_index
+from cache import decision_key
+from game_runner import GameRunner
+from ponder import Ponderer
+from settings import AISettings
+
+
+class PonderTests(u.TestCase):
+    """Testcase containing the background search during the human player's turn."""
+
+    def test_answers(self):
+        """Testing that pondered positions are answered like searched ones."""
+        settings = AISettings(seed=1)
+        ponderer = Ponderer(settings, lambda: ComputerAI(settings))
+        positions = [
+            (
+                to_mask(["lk", "z8", "cm"]),
+                top_index("l9"),
+                False,
+                to_mask(["c8", "ks"]),
+                None,
+                2,
+            ),
+            (to_mask(["lk", "z8"]), top_index("z9"), False, to_mask(["c8"]), None, 1),
+        ]
+        ponderer.ponder(positions)
+        self.assertTrue(ponderer.wait(10))
+        ai = ComputerAI(settings)
+        key = decision_key(settings, *positions[0])
+        self.assertEqual(ponderer.answer(key), ai.choose_move(*positions[0]))
+        missing = decision_key(settings, 1, 0, False, 2, None, 1)
+        self.assertIsNone(ponderer.answer(missing))
+        self.assertEqual(ponderer.hits, 1)
+
+    def test_interrupted_not_stored(self):
+        """Testing that answers of a search cut by the deadline are not kept."""
+        settings = AISettings(time_budget=0.0, solver_cards=0)
+        ponderer = Ponderer(settings, lambda: ComputerAI(settings))
+        position = (
+            to_mask(["l7", "k8", "z9", "cs", "lm", "z10", "ka"]),
+            top_index("l8"),
+            False,
+            to_mask(["la", "k9", "lk", "c8", "zs", "k7", "c10"]),
+            None,
+            7,
+        )
+        ponderer.ponder([position])
+        self.assertTrue(ponderer.wait(10))
+        self.assertIsNone(ponderer.answer(decision_key(settings, *position)))
+
+    def test_runner_ponders(self):
+        """Testing that the reply to a pondered human turn is not searched again."""
+        runners = []
+        for ponder in (False, True):
+            runner = GameRunner(AISettings(ponder=ponder, stats=True, seed=2))
+            runner.computer_player.card_hand.cards = ["lk", "z8", "c9", "k7"]
+            runner.human_player.card_hand.cards = ["l8", "zs", "cm", "k10"]
+            runner.give_card_pack.cards = deque(["ka", "c10", "zk", "l10"])
+            runner.played_card_pack.cards = deque(["l9"])
+            runner.computer_turn()
+            if ponder:
+                self.assertTrue(runner.ai.ponderer.wait(10))
+            action = runner.human_actions()[0]
+            runner.human_turn(action)
+            self.assertEqual(runner.winner, None)
+            runners.append(runner)
+        plain, pondering = runners
+        try:
+            self.assertEqual(pondering.choose_move(), plain.choose_move())
+            self.assertEqual(pondering.ai.stats.ponder_hits, 1)
+            self.assertEqual(plain.ai.stats.ponder_hits, 0)
+        finally:
+            pondering.close()
@@ -0,0 +1,73 @@
+import unittest as u
+from ai import ComputerAI
+from bitcards import CARD_INDEX, to_mask, top_index
+import rollout
+from search import Searcher
+from settings import AISettings
+
+
+@u.skipUnless(rollout.np is not None, "rollouts need NumPy")
+class RolloutTests(u.TestCase):
+    """Testcase containing the batched random playouts."""
+
+    def test_certain_results(self):
+        """Testing that decided positions are won or lost in every playout."""
+        win = rollout.position_equity(
+            to_mask(["z8"]), to_mask(["c8", "ks"]), top_index("z9"), games=64, seed=1
+        )
+        loss = rollout.position_equity(
+            to_mask(["l8"]), to_mask(["z10"]), top_index("z9"), games=64, seed=1
+        )
+        self.assertEqual(win, 1.0)
+        self.assertEqual(loss, 0.0)
+
+    def test_stacked_sevens(self):
+        """Testing that all stacked cards are taken when the "*7" cannot be answered."""
+        # After one turn the player with fewer cards wins.
+        evaluator = rollout.RolloutEvaluator(64, seed=1, max_plies=1)
+        comp = to_mask(["l8"])
+        human = to_mask(["z10", "za", "k9", "c9"])
+        top = top_index("z7")
+        self.assertEqual(evaluator.equity(comp, human, top, True, 2), 1.0)
+        self.assertEqual(evaluator.equity(comp, human, top, True, 8), 0.0)
+
+    def test_cache(self):
+        """Testing that a position is played out once."""
+        evaluator = rollout.RolloutEvaluator(32, seed=2)
+        arguments = (
+            to_mask(["lk", "z8", "cm"]),
+            to_mask(["c8", "ks"]),
+            top_index("l9"),
+        )
+        equity = evaluator.equity(*arguments)
+        self.assertTrue(0.0 <= equity <= 1.0)
+        self.assertEqual(evaluator.equity(*arguments), equity)
+        self.assertEqual(len(evaluator.cache), 1)
+        score = evaluator.score(*arguments, False, True)
+        self.assertEqual(score, round(100 * equity) - 50)
+
+    def test_leaf_evaluator(self):
+        """Testing that the search with rollout leaves plays the "*7" against a winning reply."""
+        comp = to_mask(["z7", "z8"])
+        human = to_mask(["c8"])
+        searcher = Searcher(evaluator=rollout.RolloutEvaluator(32, seed=3))
+        _, move = searcher.minimax(comp, human, top_index("z9"), False, 4, True)
+        self.assertEqual(move, (CARD_INDEX["z7"],) * 2)
+        evaluator = Searcher.from_settings(AISettings(rollouts=32)).evaluator
+        self.assertEqual(evaluator.games, 32)
+        self.assertIsNone(Searcher.from_settings(AISettings()).evaluator)
+        ai = ComputerAI(AISettings(rollouts=32, depth=2, solver_cards=0, seed=3))
+        move = ai.choose_move(comp, top_index("z9"), False, human, None, 1)
+        self.assertEqual(move, (CARD_INDEX["z7"],) * 2)
+
+    def test_taking_cards(self):
+        """Testing that players taking cards are scored by playouts too."""
+        evaluator = rollout.RolloutEvaluator(32, seed=4)
+        comp = to_mask(["l8", "k9"])
+        human = to_mask(["c8", "ks"])
+        top = top_index("z10")
+        searcher = Searcher(evaluator=evaluator)
+        score, move = searcher.minimax(comp, human, top, False, 3, True)
+        self.assertIsNone(move)
+        self.assertEqual(score, evaluator.score(comp, human, top, False, True))
+        self.assertTrue(-50 <= score <= 50)
@@ -0,0 +1,82 @@
+import unittest as u
+from bitcards import move_to_str, to_cards, to_mask, top_index
+from rules import game_playable_mask, greedy_move, playable_mask, valid_moves
+
+
+class RulesTests(u.TestCase):
+    """Testcase containing the precomputed card-play rule tables."""
+
+    def test_playable_mask_ten(self):
+        """Testing that tens match other tens."""
+        self.assertEqual(
+            to_cards(to_mask(["c10", "z9"]) & playable_mask(top_index("l10"), False)),
+            ["c10"],
+            "Only c10 should be playable after l10.",
+        )
+
+    def test_playable_mask_color_change(self):
+        """Testing that a color changer follows the chosen color."""
+        self.assertEqual(
+            sorted(
+                to_cards(
+                    to_mask(["l7", "z7", "cm"])
+                    & playable_mask(top_index(("z", "m")), True)
+                )
+            ),
+            ["cm", "z7"],
+            "After a color change to z only z cards and color changers should be playable.",
+        )
+
+    def test_valid_moves_color_choice(self):
+        """Testing that the computer only changes to colors it holds."""
+        moves = [
+            move_to_str(move)
+            for move in valid_moves(to_mask(["lm", "k8"]), top_index("l9"), False, True)
+        ]
+        self.assertEqual(
+            moves,
+            [("lm", "k")],
+            "Computer should only switch to the color it has left in hand.",
+        )
+
+    def test_game_playable_desired_color(self):
+        """Testing that a desired color replaces the color and type of the top card."""
+        self.assertEqual(
+            sorted(
+                to_cards(
+                    to_mask(["l8", "z9", "cm", "lm"])
+                    & game_playable_mask("lm", "z", False)
+                )
+            ),
+            ["cm", "lm", "z9"],
+            "After switching to z, only z cards and color changers should be playable.",
+        )
+
+    def test_game_playable_active_seven(self):
+        """Testing that only sevens can be played on an active seven."""
+        self.assertEqual(
+            sorted(
+                to_cards(to_mask(["l8", "z7", "cm"]) & game_playable_mask("l7", None, True))
+            ),
+            ["z7"],
+        )
+
+    def test_game_playable_inactive_ace(self):
+        """Testing that an inactive ace follows the default rules."""
+        self.assertEqual(
+            sorted(
+                to_cards(
+                    to_mask(["l8", "za", "k9"]) & game_playable_mask("la", None, False)
+                )
+            ),
+            ["l8", "za"],
+        )
+
+    def test_greedy_move(self):
+        """Testing that the greedy move plays active cards first and color changers last."""
+        top = top_index("l9")
+        move = greedy_move(to_mask(["lm", "l8", "la"]), top, False)
+        self.assertEqual(move_to_str(move), ("la", None))
+        move = greedy_move(to_mask(["lm", "l8"]), top, False)
+        self.assertEqual(move_to_str(move), ("l8", None))
+        self.assertIsNone(greedy_move(to_mask(["k8"]), top_index("l9"), False))
@@ -1,8 +1,29 @@
 # This file can be used as an replacement of pytest.
 import unittest as u
+from .ai_test import AITests
+from .belief_test import BeliefTests
+from .benchmark_test import BenchmarkTests
+from .bitcards_test import BitcardsTests
+from .budget_test import BudgetTests
+from .cache_test import CacheTests
 from .card_test import CardTests
+from .determinization_test import DeterminizationTests
+from .ismcts_test import ISMCTSTests
+from .ordering_test import OrderingTests
 from .player_test import PlayerTests
+from .ponder_test import PonderTests
+from .rollout_test import RolloutTests
+from .rules_test import RulesTests
 from .runner_test import RunnerTests
+from .search_test import SearchTests
+from .server_test import ServerTests
+from .simulation_test import SimulationTests
+from .state_test import StateTests
+from .stats_test import StatsTests
+from .strength_test import StrengthTests
+from .symmetry_test import SymmetryTests
+from .tablebase_test import TablebaseTests
+from .transposition_test import TranspositionTests
 
 
 def get_tests(testClass):
@@ -11,9 +32,30 @@ def get_tests(testClass):
 
 def suite():
     suite = u.TestSuite()
+    suite.addTests(get_tests(AITests))
+    suite.addTests(get_tests(BeliefTests))
+    suite.addTests(get_tests(BenchmarkTests))
+    suite.addTests(get_tests(BitcardsTests))
+    suite.addTests(get_tests(BudgetTests))
+    suite.addTests(get_tests(CacheTests))
     suite.addTests(get_tests(CardTests))
+    suite.addTests(get_tests(DeterminizationTests))
+    suite.addTests(get_tests(ISMCTSTests))
+    suite.addTests(get_tests(OrderingTests))
     suite.addTests(get_tests(PlayerTests))
+    suite.addTests(get_tests(PonderTests))
+    suite.addTests(get_tests(RolloutTests))
+    suite.addTests(get_tests(RulesTests))
     suite.addTests(get_tests(RunnerTests))
+    suite.addTests(get_tests(SearchTests))
+    suite.addTests(get_tests(ServerTests))
+    suite.addTests(get_tests(SimulationTests))
+    suite.addTests(get_tests(StateTests))
+    suite.addTests(get_tests(StatsTests))
+    suite.addTests(get_tests(StrengthTests))
+    suite.addTests(get_tests(SymmetryTests))
+    suite.addTests(get_tests(TablebaseTests))
+    suite.addTests(get_tests(TranspositionTests))
     return suite
 
 
@@ -1,8 +1,13 @@
 import unittest as u
+from collections import deque
+from bitcards import move_to_str, to_cards, to_mask, top_index
 from cards import GiveCardPack, PlayedCardPack
+from events import COMPUTER, HUMAN, Action, Event
 from game_runner import GameRunner
+from settings import AISettings
 from player import ComputerPlayer, HumanPlayer
 from unittest.mock import patch
+import search
 
 
 class RunnerTests(u.TestCase):
@@ -195,6 +200,62 @@ class RunnerTests(u.TestCase):
             "Minimax should return score -10 because he cannot play any cards.",
         )
 
+    def test_get_valid_moves_bitmask(self):
+        """Testing that the _get_valid_moves bitmask fast path matches the string API."""
+        self.assertEqual(
+            self.runner._get_valid_moves(to_mask(["l7", "ka", "kk"]), "lk", False),
+            [("l7", None), ("kk", None)],
+            "Method _get_valid_moves should return the same moves for a bitmask hand.",
+        )
+
+    def test_playable_sim_bitmask(self):
+        """Testing the _is_playable_sim bitmask fast path."""
+        self.assertTrue(self.runner._is_playable_sim(to_mask(["z8"]), "l8"))
+        self.assertFalse(self.runner._is_playable_sim(to_mask(["z9"]), "l8"))
+
+    def test_minimax_bitmask(self):
+        """Testing that the minimax bitmask fast path matches the string API."""
+        self.assertEqual(
+            self.runner.minimax(
+                to_mask(["l8", "lk"]), to_mask(["z8"]), "l9", False, 4, True
+            ),
+            self.runner.minimax(["l8", "lk"], ["z8"], "l9", False, 4, True),
+            "Minimax should return the same result for bitmask hands.",
+        )
+
+    def test_unseen_cards_order(self):
+        """Testing that unseen cards are ordered by index, not human hand first."""
+        unseen = self.runner.unseen_cards()
+        hand = self.runner.human_player.card_hand.cards
+        self.assertEqual(unseen, to_cards(to_mask(unseen)))
+        self.assertEqual(to_mask(unseen) & to_mask(hand), to_mask(hand))
+        self.assertEqual(
+            len(unseen), len(hand) + len(self.runner.give_card_pack.cards)
+        )
+
+    def test_minimax_stacking(self):
+        """Testing that the string API scores stacked "*7" cards like the bitmask search."""
+        comp, human = ["l8", "k7", "c9"], ["z8", "c10"]
+        for stacking in (2, 4, 6):
+            score, move = search.minimax(
+                to_mask(comp),
+                to_mask(human),
+                top_index("z7"),
+                True,
+                4,
+                True,
+                stacking=stacking,
+            )
+            self.assertEqual(
+                self.runner.minimax(comp, human, "z7", True, 4, True, stacking=stacking),
+                (score, move_to_str(move)),
+            )
+        self.assertEqual(
+            self.runner.minimax(["l8", "c9"], human, "z7", True, 4, True, stacking=6),
+            (-15, None),
+            "Minimax should take all six stacked cards with one penalty point each.",
+        )
+
     def test_play_card(self):
         """Play card method test."""
         self.runner.human_player.card_hand.cards = ["lk"]
@@ -270,3 +331,115 @@ class RunnerTests(u.TestCase):
             self.runner.easy,
             "After setting difficulty to hard, the attribute should be False.",
         )
+
+    @patch("builtins.print")
+    def test_computer_play_easy(self, mock_print):
+        """Computer turn in easy mode test."""
+        self.runner.easy = True
+        self.runner.computer_player.card_hand.cards = ["lk", "z8"]
+        self.runner.human_player.card_hand.cards = ["c8"]
+        self.runner.give_card_pack.cards = deque(["k7", "c10", "zs"])
+        self.runner.played_card_pack.cards = deque(["l9"])
+        self.runner.computer_play()
+        self.assertEqual(
+            self.runner.computer_player.card_hand.cards,
+            ["z8"],
+            "Computer should play lk, the only playable card.",
+        )
+        self.assertEqual(self.runner.played_card_pack.last_card(), "lk")
+
+    @patch("builtins.print")
+    def test_computer_play_monte_carlo(self, mock_print):
+        """Computer turn with Monte Carlo sampling stops before the sample budget."""
+        settings = AISettings(
+            sampling="monte_carlo",
+            max_samples=200,
+            seed=1,
+            stats=True,
+            color_symmetry=False,
+        )
+        runner = GameRunner(settings)
+        runner.easy = True
+        runner.computer_player.card_hand.cards = ["lk", "z8"]
+        runner.human_player.card_hand.cards = ["c8", "ks"]
+        runner.played_card_pack.cards = deque(["l9"])
+        runner.computer_play()
+        self.assertLess(
+            runner.ai.stats.determinizations,
+            200,
+            "Sampling should stop once the only playable move is clearly ahead.",
+        )
+        self.assertEqual(runner.played_card_pack.last_card(), "lk")
+
+    @patch("builtins.print")
+    def test_take_card_belief(self, mock_print):
+        """Taking a card excludes the playable cards from the human player's held cards."""
+        self.runner.played_card_pack.cards = deque(["l9"])
+        self.runner.manage_command("take_card")
+        belief = self.runner.human_belief
+        self.assertEqual(len(belief.slots), 5)
+        self.assertFalse(belief.slots[0] & to_mask(["l8", "k9", "zm"]))
+        self.assertEqual(belief.slots[4] & to_mask(["l8"]), to_mask(["l8"]))
+
+    def test_apply(self):
+        """A human turn is answered by the computer's turn without printing."""
+        runner = self.runner
+        runner.easy = True
+        runner.human_player.card_hand.cards = ["lk", "c8"]
+        runner.computer_player.card_hand.cards = ["l8", "z9"]
+        runner.give_card_pack.cards = deque(["k7", "c10"])
+        runner.played_card_pack.cards = deque(["l9"])
+        with patch("builtins.print") as mock_print:
+            events = runner.apply(Action("play", "lk"))
+        mock_print.assert_not_called()
+        self.assertEqual(
+            events,
+            [Event("played", HUMAN, "lk"), Event("played", COMPUTER, "l8")],
+        )
+        self.assertFalse(runner.played, "The next turn is the human player's again.")
+
+    def test_apply_rejected(self):
+        """Actions which are not allowed leave the game unchanged."""
+        runner = self.runner
+        runner.human_player.card_hand.cards = ["zk", "lm"]
+        runner.played_card_pack.cards = deque(["l9"])
+        for action in (Action("play", "zk"), Action("play", "lm"), Action("stand")):
+            events = runner.apply(action)
+            self.assertEqual([event.kind for event in events], ["rejected"])
+        self.assertEqual(runner.human_player.card_hand.cards, ["zk", "lm"])
+        self.assertEqual(runner.played_card_pack.last_card(), "l9")
+
+    def test_human_turn_color_and_win(self):
+        """Playing the last card, an "*m" card, switches the color and wins."""
+        runner = self.runner
+        runner.human_player.card_hand.cards = ["lm"]
+        runner.played_card_pack.cards = deque(["z9"])
+        events = runner.human_turn(Action("play", "lm", "c"))
+        self.assertEqual(events, [Event("played", HUMAN, "lm", "c"), Event("won", HUMAN)])
+        self.assertEqual(runner.desired_color, "c")
+        self.assertEqual(runner.winner, HUMAN)
+
+    @patch("builtins.print")
+    @patch("builtins.input", return_value="k")
+    def test_manage_command_asks_color(self, mock_input, mock_print):
+        """The command line asks for the color of an "*m" card."""
+        self.runner.human_player.card_hand.cards = ["lm", "z8"]
+        self.runner.played_card_pack.cards = deque(["z9"])
+        self.runner.manage_command("play_card lm")
+        self.assertEqual(self.runner.desired_color, "k")
+        self.assertTrue(self.runner.played)
+
+    def test_choose_move_parallel(self):
+        """Parallel computer turn chooses the same move as the serial one."""
+        serial = GameRunner(AISettings(seed=3))
+        parallel = GameRunner(AISettings(workers=2, chunk_size=16))
+        for runner in (serial, parallel):
+            runner.easy = True
+            runner.computer_player.card_hand.cards = ["lk", "z8", "cm", "l7"]
+            runner.human_player.card_hand.cards = ["c8", "ks", "za"]
+            runner.give_card_pack.cards = deque(["k7", "c10", "zs", "l8", "z9"])
+            runner.played_card_pack.cards = deque(["l9"])
+        try:
+            self.assertEqual(parallel.choose_move(), serial.choose_move())
+        finally:
+            parallel.close()
@@ -0,0 +1,216 @@
+import unittest as u
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+import random
+import time
+from bitcards import CARD_BITS, CARDS, FULL_MASK, to_mask, top_index
+from determinization import enumerate_hands
+import search
+from transposition import TranspositionTable
+
+
+class SearchTests(u.TestCase):
+    """Testcase containing the bitmask search."""
+
+    def test_minimax_win(self):
+        """Minimax win test."""
+        score, move = search.minimax(
+            to_mask(["lk"]), to_mask(["z8"]), top_index("l9"), False, 2, True
+        )
+        self.assertEqual(score, 100, "Computer should win with its only card.")
+        self.assertEqual(move, (top_index("lk"), top_index("lk")))
+
+    def test_minimax_take_card(self):
+        """Testing that no playable card is rated with the penalty."""
+        self.assertEqual(
+            search.minimax(
+                to_mask(["kk"]), to_mask(["z8"]), top_index("l9"), False, 4, True
+            ),
+            (-10, None),
+            "Minimax should return score -10 because he cannot play any cards.",
+        )
+
+    def test_minimax_active_ace(self):
+        """Testing that standing a round passes the turn."""
+        score, move = search.minimax(
+            to_mask(["lk"]), to_mask(["l9"]), top_index("la"), True, 2, True
+        )
+        self.assertEqual(
+            (score, move),
+            (-100, None),
+            "Computer has to stand a round and the human wins afterwards.",
+        )
+
+    def test_vote_hands_parallel(self):
+        """Testing that parallel voting merges to the same votes in the same order."""
+        comp = to_mask(["lk", "z8", "cm", "k7"])
+        unseen = ["l8", "zs", "c9", "k10", "la", "z7", "ca", "lm"]
+        top = top_index("l9")
+        serial = search.vote_hands(comp, enumerate_hands(unseen, 3), top, False, 4)
+        merged = Counter()
+        with ProcessPoolExecutor(2) as executor:
+            for votes in search.vote_hands_parallel(
+                executor, comp, enumerate_hands(unseen, 3), top, False, 4, 5, 4
+            ):
+                merged.update(votes)
+        self.assertEqual(
+            list(merged.items()),
+            list(serial.items()),
+            "Parallel votes should equal serial votes including their order.",
+        )
+
+    def test_vote_hands_parallel_budget(self):
+        """Testing that parallel chunks share the node budget of the searcher."""
+        comp = to_mask(["lk", "z8", "cm", "k7"])
+        unseen = ["l8", "zs", "c9", "k10", "la", "z7", "ca", "lm"]
+        top = top_index("l9")
+        searcher = search.Searcher(max_nodes=300)
+        with ProcessPoolExecutor(2) as executor:
+            chunks = list(
+                search.vote_hands_parallel(
+                    executor,
+                    comp,
+                    enumerate_hands(unseen, 3),
+                    top,
+                    False,
+                    8,
+                    5,
+                    4,
+                    searcher=searcher,
+                )
+            )
+        self.assertTrue(searcher.exhausted)
+        self.assertLessEqual(searcher.nodes, 300 + 4 * 64)
+        self.assertLess(sum(sum(votes.values()) for votes in chunks), 56)
+
+    def test_search_root_matches_minimax(self):
+        """Testing that searching the stored best move first does not change the answer."""
+        rng = random.Random(5)
+        for _ in range(100):
+            cards = rng.sample(CARDS, 11)
+            comp, human = to_mask(cards[:5]), to_mask(cards[5:10])
+            top, active = top_index(cards[10]), rng.random() < 0.5
+            searcher = search.Searcher(TranspositionTable(1 << 12))
+            for depth in range(1, 6):
+                result = searcher.search_root(comp, human, top, active, depth)
+            self.assertEqual(
+                result, search.minimax(comp, human, top, active, 5, True)
+            )
+
+    def test_solve(self):
+        """Testing that MTD(f) finds the score and move of a search to the end."""
+        rng = random.Random(6)
+        for _ in range(50):
+            cards = rng.sample(CARDS, 13)
+            comp, human = to_mask(cards[:6]), to_mask(cards[6:12])
+            top, active = top_index(cards[12]), rng.random() < 0.5
+            depth = search.max_useful_depth(12)
+            self.assertEqual(
+                search.Searcher().solve(comp, human, top, active),
+                search.Searcher(TranspositionTable()).search_root(
+                    comp, human, top, active, depth
+                ),
+            )
+
+    def test_iterative_deepening(self):
+        """Testing that iterative deepening reaches the maximum depth without a deadline."""
+        comp, human = to_mask(["lk", "z8", "cm"]), to_mask(["l8", "zs", "c9"])
+        score, move, depth = search.Searcher().iterative_deepening(
+            comp, human, top_index("l9"), False, 6
+        )
+        self.assertEqual(depth, 6)
+        self.assertEqual(
+            (score, move), search.minimax(comp, human, top_index("l9"), False, 6, True)
+        )
+
+    def test_iterative_deepening_deadline(self):
+        """Testing that an expired deadline still returns the first iteration."""
+        comp, human = to_mask(["lk", "z8", "cm"]), to_mask(["l8", "zs", "c9"])
+        searcher = search.Searcher(deadline=time.time() - 1)
+        score, move, depth = searcher.iterative_deepening(
+            comp, human, top_index("l9"), False, 6
+        )
+        self.assertEqual(depth, 1, "Only the first iteration should complete.")
+        self.assertIsNotNone(move)
+
+    def test_chance_node(self):
+        """Testing that taking a card is scored by the mean over all draws."""
+        comp, human, top = to_mask(["c8"]), to_mask(["z10", "lk"]), top_index("z9")
+        searcher = search.Searcher(chance_samples=28)
+        draws = searcher.sample_draws(FULL_MASK & ~comp & ~human & ~(1 << top), 1)
+        self.assertEqual(len(draws), 28)
+        expected = sum(
+            searcher.minimax(comp | drawn, human, top, False, 2, False)[0]
+            for drawn in draws
+        ) / len(draws)
+        score, move = searcher.minimax(comp, human, top, False, 3, True)
+        self.assertAlmostEqual(score, expected)
+        self.assertIsNone(move)
+
+    def test_chance_pruning(self):
+        """Testing that Star1 pruning and the transposition table keep chance scores."""
+        rng = random.Random(7)
+        for _ in range(50):
+            cards = rng.sample(CARDS, 9)
+            comp, human = to_mask(cards[:4]), to_mask(cards[4:8])
+            top = top_index(cards[8])
+            pruned = search.Searcher(TranspositionTable(1 << 12), chance_samples=4)
+            plain = search.Searcher(chance_samples=4)
+            for depth in range(1, 5):
+                self.assertAlmostEqual(
+                    pruned.search_root(comp, human, top, False, depth)[0],
+                    plain.minimax(comp, human, top, False, depth, True)[0],
+                )
+
+    def test_sample_draws(self):
+        """Testing that draws are sampled only when there are too many, once per pack."""
+        pack = to_mask(["l7", "k8", "z9", "cs", "lm"])
+        searcher = search.Searcher(chance_samples=3)
+        draws = searcher.sample_draws(pack, 1)
+        self.assertEqual(len(draws), 3)
+        self.assertTrue(all(drawn & pack == drawn for drawn in draws))
+        self.assertIs(searcher.sample_draws(pack, 1), draws)
+        all_draws = search.Searcher(chance_samples=10).sample_draws(pack, 2)
+        self.assertEqual(len(all_draws), 10)
+        self.assertEqual(search.Searcher(chance_samples=5).sample_draws(0, 2), (0,))
+
+    def test_chance_pack(self):
+        """Testing that chance nodes only draw from the card pack of the root."""
+        comp, human = to_mask(["l8"]), to_mask(["k9", "z9"])
+        pack = to_mask(["c8", "c9"])
+        searcher = search.Searcher(chance_samples=4)
+        searcher.unseen = human | pack
+        searcher.minimax(comp, human, top_index("k10"), False, 2, True)
+        self.assertEqual({drawable for drawable, _ in searcher.draws}, {pack})
+        for index in range(2 * search.DRAW_ENTRIES):
+            searcher.sample_draws(index + 1, 1)
+            self.assertLessEqual(len(searcher.draws), search.DRAW_ENTRIES)
+
+    def test_chance_pack_keys(self):
+        """Testing that a shared table does not mix scores of different card packs."""
+        rng = random.Random(8)
+        for _ in range(30):
+            cards = rng.sample(range(32), 11)
+            comp = sum(CARD_BITS[card] for card in cards[:3])
+            human = sum(CARD_BITS[card] for card in cards[3:6])
+            top = cards[10]
+            shared = search.Searcher(TranspositionTable(1 << 12), chance_samples=4)
+            for pack in (cards[6:8], cards[8:10]):
+                unseen = human | sum(CARD_BITS[card] for card in pack)
+                shared.unseen = unseen
+                fresh = search.Searcher(TranspositionTable(1 << 12), chance_samples=4)
+                fresh.unseen = unseen
+                self.assertEqual(
+                    shared.search_root(comp, human, top, False, 4),
+                    fresh.search_root(comp, human, top, False, 4),
+                )
+
+    def test_solve_without_chance_nodes(self):
+        """Testing that the solver scores taking cards with the fixed penalty."""
+        comp, human = to_mask(["lk", "z8", "cm"]), to_mask(["l8", "zs", "c9"])
+        searcher = search.Searcher(chance_samples=8)
+        self.assertEqual(
+            searcher.solve(comp, human, top_index("l9"), False),
+            search.Searcher().solve(comp, human, top_index("l9"), False),
+        )
+        self.assertEqual(searcher.chance_samples, 8)
@@ -0,0 +1,122 @@
+import unittest as u
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+import random
+import threading
+import time
+from unittest.mock import patch
+from client import PrsiClient
+import server
+from server import PrsiServer, Session, computer_move
+from settings import AISettings
+
+
+class ServerTests(u.IsolatedAsyncioTestCase):
+    """Testcase containing the asyncio game server and its client."""
+
+    async def asyncSetUp(self):
+        self.server = PrsiServer(
+            workers=2, executor=ThreadPoolExecutor(2), session_timeout=5, seed=1
+        )
+        self.listener = await self.server.start()
+        self.port = self.listener.sockets[0].getsockname()[1]
+
+    async def asyncTearDown(self):
+        self.listener.close()
+        await self.listener.wait_closed()
+        self.server.close()
+
+    async def test_game(self):
+        """Testing that a taken card is answered by the computer's turn."""
+        client = await PrsiClient.connect(port=self.port)
+        self.assertEqual(client.greeting, "HELLO prsi 1")
+        self.assertEqual(
+            await client.command("STATE"), ["ERR no game, start one with NEW easy|hard"]
+        )
+        reply = await client.command("NEW hard")
+        self.assertTrue(reply[0].startswith("STATE "))
+        self.assertEqual(reply[-1], "OK")
+        reply = await client.command("TAKE")
+        self.assertEqual(reply[-1], "OK")
+        self.assertTrue(reply[0].startswith("COMPUTER "))
+        self.assertEqual(await client.command("PLAY xx"), ["ERR unknown command"])
+        self.assertEqual(await client.command("QUIT"), ["BYE"])
+        await client.close()
+
+    async def test_play_until_over(self):
+        """Testing that games run to their end through the protocol."""
+        client = await PrsiClient.connect(port=self.port)
+        reply = await client.command("NEW easy")
+        for _ in range(200):
+            state = dict(
+                word.split("=") for word in reply[-2].split()[1:] if "=" in word
+            )
+            reply = None
+            for card in state["hand"].split(","):
+                attempt = await client.command(f"PLAY {card} l")
+                if attempt[-1] == "OK":
+                    reply = attempt
+                    break
+            if reply is None:
+                reply = await client.command("TAKE")
+                if reply[-1] != "OK":
+                    reply = await client.command("STAND")
+            self.assertEqual(reply[-1], "OK")
+            if reply[-2].startswith("OVER"):
+                break
+        self.assertTrue(reply[-2].startswith("OVER"))
+        self.assertTrue((await client.command("TAKE"))[-1].startswith("ERR game over"))
+        await client.close()
+
+    async def test_concurrent_sessions(self):
+        """Testing that many sessions are served at once."""
+        clients = await asyncio.gather(
+            *(PrsiClient.connect(port=self.port) for _ in range(50))
+        )
+        replies = await asyncio.gather(
+            *(client.command("NEW hard") for client in clients)
+        )
+        self.assertTrue(all(reply[-1] == "OK" for reply in replies))
+        self.assertEqual(self.server.sessions, 50)
+        for client in clients:
+            await client.close()
+
+    async def test_session_timeout(self):
+        """Testing that silent clients are disconnected."""
+        self.server.session_timeout = 0.05
+        client = await PrsiClient.connect(port=self.port)
+        self.assertEqual(await client.read_reply(), ["TIMEOUT"])
+        await client.close()
+
+    async def test_turn_timeout(self):
+        """Testing that a timed out turn keeps its slot until the search finishes."""
+        self.server.turn_timeout = 0.05
+        release = threading.Event()
+
+        def blocked_move(*arguments):
+            release.wait(5)
+            return None, None
+
+        client = await PrsiClient.connect(port=self.port)
+        await client.command("NEW hard")
+        with patch.object(server, "computer_move", blocked_move):
+            reply = await client.command("TAKE")
+            self.assertEqual(reply[-1], "OK")
+            self.assertEqual(self.server.fallbacks["timeout"], 1)
+            self.assertEqual(self.server._slots._value, 1)
+            release.set()
+            for _ in range(100):
+                if self.server._slots._value == 2:
+                    break
+                await asyncio.sleep(0.01)
+            self.assertEqual(self.server._slots._value, 2)
+        await client.close()
+
+    def test_deadline_bounds_search(self):
+        """Testing that the turn deadline becomes the time budget of the search."""
+        session = Session(False, random.Random(3))
+        arguments = session.computer_arguments(AISettings(solver_cards=0, depth=12))
+        start = time.time()
+        move, _ = computer_move(*arguments, time.time() - 1)
+        self.assertLess(time.time() - start, 0.5)
+        self.assertIn(move, session.game.legal_moves() + [None])
@@ -0,0 +1,64 @@
+import unittest as u
+import random
+from bitcards import CARD_INDEX, FULL_MASK
+from simulation import HeadlessGame, Simulator, greedy_policy, random_policy
+
+
+class SimulationTests(u.TestCase):
+    """Testcase containing the headless self-play engine."""
+
+    def test_deal(self):
+        """Testing that both seats get 4 cards and one card is on top."""
+        game = HeadlessGame(random.Random(1))
+        self.assertEqual([hand.bit_count() for hand in game.hands], [4, 4])
+        self.assertEqual(len(game.deck), 23)
+        self.assertEqual(len(game.pile), 1)
+
+    def test_cards_are_kept(self):
+        """Testing that no card is lost or duplicated during a game."""
+        game = HeadlessGame(random.Random(2))
+        rng = random.Random(3)
+        while game.winner is None and game.plies < 500:
+            game.apply(random_policy(game, rng))
+            cards = game.hands[0] | game.hands[1]
+            for card in list(game.deck) + game.pile:
+                cards |= 1 << card
+            self.assertEqual(cards, FULL_MASK)
+            self.assertEqual(
+                game.hands[0].bit_count()
+                + game.hands[1].bit_count()
+                + len(game.deck)
+                + len(game.pile),
+                32,
+            )
+
+    def test_take_after_seven(self):
+        """Testing that taking after an active seven takes the stacked cards."""
+        game = HeadlessGame(random.Random(1))
+        game.pile.append(CARD_INDEX["l7"])
+        game.active = True
+        game.stacking = 4
+        before = game.hands[0].bit_count()
+        game.apply(None)
+        self.assertEqual(game.hands[0].bit_count(), before + 4)
+        self.assertFalse(game.active)
+        self.assertEqual(game.stacking, 0)
+
+    def test_stand_after_ace(self):
+        """Testing that passing on an active ace stands a round."""
+        game = HeadlessGame(random.Random(1))
+        game.pile.append(CARD_INDEX["la"])
+        game.active = True
+        before = game.hands[0]
+        game.apply(None)
+        self.assertEqual(game.hands[0], before, "Standing should not take a card.")
+        self.assertEqual(game.turn, 1)
+
+    def test_reproducible(self):
+        """Testing that the same seed plays the same games."""
+        first = Simulator((random_policy, greedy_policy), seed=4).run(50)
+        second = Simulator((random_policy, greedy_policy), seed=4).run(50)
+        self.assertEqual(first.lengths, second.lengths)
+        self.assertEqual(first.wins, second.wins)
+        self.assertEqual(sum(first.wins) + first.unfinished, 50)
+        self.assertEqual(len(first.as_dict()["latency"]), 2)
@@ -0,0 +1,91 @@
+import unittest as u
+from collections import deque
+import random
+from bitcards import CARD_BITS, to_mask, top_index
+from game_runner import GameRunner
+from search import Searcher
+from state import GameState
+from transposition import zobrist_key
+
+
+class StateTests(u.TestCase):
+    """Testcase containing the compact game state."""
+
+    def test_make_unmake(self):
+        """Testing that moves are taken back exactly and the key stays up to date."""
+        rng = random.Random(2)
+        for _ in range(50):
+            cards = rng.sample(range(32), 11)
+            state = GameState(
+                sum(CARD_BITS[card] for card in cards[:5]),
+                sum(CARD_BITS[card] for card in cards[5:10]),
+                cards[10],
+            )
+            snapshots = []
+            while state.comp_hand and state.human_hand:
+                moves = state.moves()
+                if not moves and not state.must_stand():
+                    break
+                snapshots.append((state.snapshot(), state.key))
+                state.make_move(rng.choice(moves) if moves else None)
+                self.assertEqual(
+                    state.key,
+                    zobrist_key(
+                        state.comp_hand,
+                        state.human_hand,
+                        state.top,
+                        state.active,
+                        state.computer,
+                        state.stacking,
+                    ),
+                )
+            while snapshots:
+                state.unmake_move()
+                self.assertEqual((state.snapshot(), state.key), snapshots.pop())
+
+    def test_stacking(self):
+        """Testing that stacking is kept only while a "*7" is active."""
+        self.assertEqual(GameState(1, 2, top_index("l7"), True).stacking, 2)
+        self.assertEqual(GameState(1, 2, top_index("l7"), False, 4).stacking, 0)
+        state = GameState(
+            to_mask(["k7", "z8"]), to_mask(["c7", "c8"]), top_index("l7"), True, 2
+        )
+        state.make_move((top_index("k7"), top_index("k7")))
+        self.assertEqual(state.stacking, 4)
+        state.make_move((top_index("c7"), top_index("c7")))
+        self.assertEqual(state.stacking, 6)
+        self.assertEqual(state.penalty(), 15)
+
+    def test_search_counts_stacked_cards(self):
+        """Testing that the search scores taking stacked cards."""
+        comp = to_mask(["l8", "k9"])
+        human = to_mask(["z8"])
+        for stacking in (2, 4, 6):
+            score, move = Searcher().minimax(
+                comp, human, top_index("c7"), True, 2, True, stacking=stacking
+            )
+            self.assertEqual((score, move), (1 - 2 - 9 - stacking, None))
+
+    def test_runner_game_state(self):
+        """Testing that the runner's state includes the desired color and stacking."""
+        runner = GameRunner()
+        runner.computer_player.card_hand.cards = ["lk", "z8"]
+        runner.human_player.card_hand.cards = ["c8"]
+        runner.played_card_pack.cards = deque(["zm"])
+        runner.desired_color = "k"
+        self.assertEqual(
+            runner.game_state().snapshot(),
+            (
+                to_mask(["lk", "z8"]),
+                to_mask(["c8"]),
+                top_index(("k", "m")),
+                False,
+                0,
+                True,
+            ),
+        )
+        runner.played_card_pack.cards = deque(["k7", "l7"])
+        runner.desired_color = None
+        runner.active_card = True
+        runner.stacking = 4
+        self.assertEqual(runner.game_state().stacking, 4)
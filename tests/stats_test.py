@@ -0,0 +1,68 @@
+import unittest as u
+import json
+import os
+import tempfile
+from ai import ComputerAI
+from bitcards import to_mask, top_index
+from search import Searcher
+from settings import AISettings
+from stats import SearchStats
+
+
+class StatsTests(u.TestCase):
+    """Testcase containing the search statistics."""
+
+    def test_merge(self):
+        """Testing that merged counters are added ply by ply."""
+        stats = SearchStats()
+        stats.add_node(0)
+        other = SearchStats()
+        other.add_node(0)
+        other.add_node(2)
+        other.cutoffs = 3
+        other.determinizations = 2
+        stats.merge(other)
+        self.assertEqual(stats.nodes, [2, 0, 1])
+        self.assertEqual(stats.cutoffs, 3)
+        self.assertEqual(stats.determinizations, 2)
+
+    def test_searcher_counts(self):
+        """Testing that statistics do not change the search and count its nodes."""
+        args = (
+            to_mask(["l7", "k8", "z9", "cs", "lm", "z10"]),
+            to_mask(["la", "k9", "lk", "c8", "zs", "k7"]),
+            top_index("l8"),
+            False,
+            5,
+        )
+        stats = SearchStats()
+        searcher = Searcher.from_settings(AISettings(), stats=stats)
+        self.assertEqual(
+            searcher.search_root(*args), Searcher.from_settings(AISettings()).search_root(*args)
+        )
+        self.assertEqual(stats.nodes[0], 1)
+        self.assertEqual(sum(stats.nodes[1:]), searcher.nodes)
+        self.assertEqual(stats.depth, 5)
+        self.assertGreater(stats.cutoffs, 0)
+
+    def test_disabled(self):
+        """Testing that no statistics are kept by default."""
+        ai = ComputerAI()
+        ai.choose_move(to_mask(["l7", "k8"]), top_index("l8"), False, to_mask(["la"]))
+        self.assertIsNone(ai.stats)
+
+    def test_log(self):
+        """Testing that every computer turn appends one JSON line."""
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "stats.jsonl")
+            ai = ComputerAI(AISettings(stats_log=path))
+            unseen = ["la", "k9", "lk", "z7", "c8"]
+            for _ in range(2):
+                ai.choose_move(to_mask(["l7", "k8", "z9"]), top_index("l8"), False, None, unseen, 2)
+            self.assertEqual(ai.stats.determinizations, 10)
+            with open(path) as file:
+                records = [json.loads(line) for line in file]
+        self.assertEqual(len(records), 2)
+        self.assertEqual(records[-1]["determinizations"], 10)
+        self.assertEqual(records[-1]["nodes"], sum(ai.stats.nodes))
+        self.assertGreaterEqual(records[-1]["seconds"], 0)
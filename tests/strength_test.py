@@ -0,0 +1,84 @@
+import unittest as u
+import itertools as i
+import os
+import random
+import tempfile
+from bitcards import CARD_BITS, to_mask, top_index
+from ordering import MoveOrdering
+from rules import valid_moves
+from search import Searcher
+from settings import AISettings
+from strength import MAX_STRENGTH, HandStrength, hand_strength, write_table
+
+
+class StrengthTests(u.TestCase):
+    """Testcase containing the hand strength table."""
+
+    @classmethod
+    def setUpClass(cls):
+        cls.directory = tempfile.TemporaryDirectory()
+        cls.path = os.path.join(cls.directory.name, "strength.tbl")
+        write_table(cls.path, 3)
+        cls.table = HandStrength(cls.path)
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.directory.cleanup()
+
+    def test_stored_strengths(self):
+        """Testing that every hand of the table has its computed strength."""
+        for count in range(1, 4):
+            for indices in i.islice(i.combinations(range(32), count), 0, None, 7):
+                hand = sum(CARD_BITS[index] for index in indices)
+                self.assertEqual(self.table.strength(hand), hand_strength(hand))
+        self.assertEqual(self.table.strength(0), MAX_STRENGTH)
+
+    def test_features(self):
+        """Testing that changers, active cards and colors make a hand stronger."""
+        weak = hand_strength(to_mask(["l8"]))
+        self.assertGreater(hand_strength(to_mask(["lm"])), weak)
+        self.assertGreater(hand_strength(to_mask(["l7"])), weak)
+        self.assertGreater(
+            hand_strength(to_mask(["l8", "k8"])), hand_strength(to_mask(["l8", "l9"]))
+        )
+        self.assertLessEqual(hand_strength((1 << 32) - 1), MAX_STRENGTH)
+
+    def test_leaf_scores(self):
+        """Testing that hand strengths only break ties between card counts."""
+        rng = random.Random(6)
+        searcher = Searcher(strength=self.table)
+        fractional = False
+        for _ in range(100):
+            cards = rng.sample(range(32), 7)
+            comp = sum(CARD_BITS[card] for card in cards[:3])
+            human = sum(CARD_BITS[card] for card in cards[3:6])
+            state = (comp, human, cards[6], False, 2, True)
+            score, _ = searcher.minimax(*state)
+            plain, _ = Searcher().minimax(*state)
+            self.assertLess(abs(score - plain), 0.5)
+            fractional = fractional or score != plain
+        self.assertTrue(fractional)
+
+    def test_ordering(self):
+        """Testing that moves of equal history leaving the stronger hand go first."""
+        hand = to_mask(["km", "z8"])
+        top = top_index("z10")
+        moves = valid_moves(hand, top, False, True)
+        self.assertNotEqual(moves[0][0], top_index("z8"))
+        order = MoveOrdering(self.table).order(moves, 0, None, True, hand)
+        self.assertEqual(order[0][0], top_index("z8"))
+        self.assertEqual(sorted(order), sorted(moves))
+
+    def test_search_uses_table(self):
+        """Testing that searchers created from settings load the table."""
+        searcher = Searcher.from_settings(AISettings(strength_table=self.path))
+        self.assertIs(searcher.strength, searcher.ordering.strength)
+        self.assertEqual(searcher.strength.max_cards, 3)
+
+    def test_not_a_table(self):
+        """Testing that other files are refused."""
+        path = os.path.join(self.directory.name, "other.tbl")
+        with open(path, "wb") as file:
+            file.write(b"\0" * 16)
+        with self.assertRaises(ValueError):
+            HandStrength(path)
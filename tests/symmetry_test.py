@@ -0,0 +1,70 @@
+import unittest as u
+from ai import ComputerAI
+from bitcards import CARDS, to_mask, top_index
+from determinization import enumerate_hands
+from settings import AISettings
+from stats import SearchStats
+from symmetry import MEMO_ENTRIES, ColorSymmetry
+
+
+class SymmetryTests(u.TestCase):
+    """Testcase containing the color symmetry of hypothetical hands."""
+
+    def test_free_colors(self):
+        """Testing that colors in computer player's hand and on top are not swapped."""
+        symmetry = ColorSymmetry(to_mask(["l7", "km"]), top_index("c8"))
+        self.assertEqual(symmetry.free_mask, to_mask(c for c in CARDS if c[0] == "z"))
+        self.assertIsNone(ColorSymmetry.of(to_mask(["l7", "km"]), top_index("c8")))
+        # Only color changers in hand can switch to any color.
+        self.assertIsNone(ColorSymmetry.of(to_mask(["lm"]), top_index("l8")))
+
+    def test_canonical(self):
+        """Testing that hands equal up to swapping free colors share a canonical hand."""
+        symmetry = ColorSymmetry.of(to_mask(["l7"]), top_index("l8"))
+        hands = [
+            to_mask(["k9", "ca", "z9"]),
+            to_mask(["c9", "ka", "z9"]),
+            to_mask(["z9", "c9", "ka"]),
+        ]
+        self.assertEqual(len({symmetry.canonical(hand) for hand in hands}), 1)
+        self.assertNotEqual(
+            symmetry.canonical(to_mask(["k9", "ca"])), symmetry.canonical(to_mask(["k9", "k8"]))
+        )
+        self.assertEqual(
+            symmetry.canonical(to_mask(["l9", "k9"])) & to_mask(["l9"]), to_mask(["l9"])
+        )
+
+    def test_votes_unchanged(self):
+        """Testing that the symmetry gives the same votes with fewer searches."""
+        comp = to_mask(["l7", "l9", "l10"])
+        unseen = [card for card in CARDS if card[0] != "l"][:14]
+        votes = []
+        searches = []
+        for color_symmetry in (False, True):
+            ai = ComputerAI(AISettings(color_symmetry=color_symmetry, stats=True))
+            ai.stats = SearchStats()
+            hands = enumerate_hands(unseen, 3)
+            votes.append(list(ai.vote(comp, hands, top_index("lk"), False, 4).items()))
+            searches.append(ai.stats.determinizations)
+        self.assertEqual(votes[0], votes[1])
+        self.assertLess(searches[1], searches[0])
+
+    def test_off_with_card_draws(self):
+        """Testing that chance nodes and rollouts search every hand."""
+        self.assertTrue(ColorSymmetry.usable(AISettings()))
+        self.assertFalse(ColorSymmetry.usable(AISettings(chance_samples=4)))
+        self.assertFalse(ColorSymmetry.usable(AISettings(rollouts=16)))
+        comp = to_mask(["l7", "l9", "l10"])
+        unseen = [card for card in CARDS if card[0] != "l"][:10]
+        ai = ComputerAI(AISettings(chance_samples=4, stats=True))
+        ai.stats = SearchStats()
+        ai.vote(comp, enumerate_hands(unseen, 2), top_index("lk"), False, 2)
+        self.assertEqual(ai.stats.determinizations, 45)
+
+    def test_bounded_memo(self):
+        """Testing that remembered moves never exceed MEMO_ENTRIES."""
+        symmetry = ColorSymmetry.of(to_mask(["l7"]), top_index("l8"))
+        for hand in range(1, 3 * MEMO_ENTRIES):
+            symmetry.remember(hand, None)
+            self.assertLessEqual(len(symmetry.moves), MEMO_ENTRIES)
+        self.assertIn(3 * MEMO_ENTRIES - 1, symmetry.moves)
@@ -0,0 +1,89 @@
+import unittest as u
+import itertools as i
+import os
+import random
+import tempfile
+from bitcards import CARD_BITS, to_mask, top_index
+from search import Searcher, max_useful_depth
+from settings import AISettings
+from stats import SearchStats
+from tablebase import PairRanks, Tablebase, write_tablebase
+
+
+class TablebaseTests(u.TestCase):
+    """Testcase containing the endgame tablebase."""
+
+    @classmethod
+    def setUpClass(cls):
+        cls.directory = tempfile.TemporaryDirectory()
+        cls.path = os.path.join(cls.directory.name, "endgame.tb")
+        write_tablebase(cls.path, 1)
+        cls.tablebase = Tablebase(cls.path)
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.tablebase.close()
+        cls.directory.cleanup()
+
+    def test_exact_scores(self):
+        """Testing that stored scores equal a search to the end."""
+        rng = random.Random(4)
+        for _ in range(300):
+            comp, human, top = rng.sample(range(32), 3)
+            state = (CARD_BITS[comp], CARD_BITS[human], top, rng.random() < 0.5)
+            is_maximizing = rng.random() < 0.5
+            score, _ = Searcher().minimax(*state, max_useful_depth(2), is_maximizing)
+            self.assertEqual(self.tablebase.probe(*state, is_maximizing), score)
+
+    def test_stacking_scores(self):
+        """Testing that active "*7" positions are stored for every stacking."""
+        rng = random.Random(5)
+        sevens = [top_index(f"{color}7") for color in "lkcz"]
+        for _ in range(100):
+            top = rng.choice(sevens)
+            comp, human = rng.sample([card for card in range(32) if card != top], 2)
+            stacking = rng.choice((2, 4, 6, 8))
+            is_maximizing = rng.random() < 0.5
+            state = (CARD_BITS[comp], CARD_BITS[human], top, True)
+            score, _ = Searcher().minimax(
+                *state, max_useful_depth(2), is_maximizing, stacking=stacking
+            )
+            self.assertEqual(
+                self.tablebase.probe(*state, is_maximizing, stacking), score
+            )
+
+    def test_search_uses_tablebase(self):
+        """Testing that the search reads small positions from the tablebase."""
+        comp = to_mask(["l7", "k8"])
+        human = to_mask(["za"])
+        stats = SearchStats()
+        searcher = Searcher.from_settings(AISettings(tablebase=self.path), stats=stats)
+        self.assertEqual(
+            searcher.search_root(comp, human, top_index("l9"), False, 1),
+            Searcher().search_root(comp, human, top_index("l9"), False, 10),
+        )
+        self.assertGreater(stats.tablebase_hits, 0)
+
+    def test_pair_ranks(self):
+        """Testing that disjoint pairs of hands get distinct ranks below the count."""
+        pairs = PairRanks(2)
+        ranks = set()
+        ranked = 0
+        for comp_count, human_count in i.product((1, 2), repeat=2):
+            for comp in i.combinations(range(32), comp_count):
+                rest = [card for card in range(32) if card not in comp]
+                comp_hand = sum(CARD_BITS[card] for card in comp)
+                for human in i.islice(i.combinations(rest, human_count), 0, None, 5):
+                    human_hand = sum(CARD_BITS[card] for card in human)
+                    ranks.add(pairs.rank(comp_hand, human_hand))
+                    ranked += 1
+        self.assertEqual(len(ranks), ranked)
+        self.assertLess(max(ranks), pairs.count)
+
+    def test_not_a_tablebase(self):
+        """Testing that other files are refused."""
+        path = os.path.join(self.directory.name, "other.tb")
+        with open(path, "wb") as file:
+            file.write(b"\0" * 16)
+        with self.assertRaises(ValueError):
+            Tablebase(path)
@@ -0,0 +1,65 @@
+import unittest as u
+import random
+from bitcards import CARDS, to_mask, top_index
+from search import Searcher
+from transposition import EXACT, TranspositionTable, zobrist_key
+
+
+class TranspositionTests(u.TestCase):
+    """Testcase containing the transposition table and Zobrist hashing."""
+
+    def test_key_ignores_inactive_flag(self):
+        """Testing that the active flag only matters for sevens and aces."""
+        hand = to_mask(["lk"])
+        self.assertEqual(
+            zobrist_key(hand, hand, top_index("l8"), True, True),
+            zobrist_key(hand, hand, top_index("l8"), False, True),
+            "An active l8 should hash the same as an inactive one.",
+        )
+        self.assertNotEqual(
+            zobrist_key(hand, hand, top_index("l7"), True, True),
+            zobrist_key(hand, hand, top_index("l7"), False, True),
+            "An active l7 should hash differently than an inactive one.",
+        )
+
+    def test_probe_requires_same_depth(self):
+        """Testing that entries are reused only at the same depth."""
+        table = TranspositionTable(16)
+        table.store(5, 3, 10, EXACT, None)
+        self.assertIsNotNone(table.probe(5, 3))
+        self.assertIsNone(table.probe(5, 2))
+        self.assertIsNone(table.probe(21, 3))
+
+    def test_depth_replacement(self):
+        """Testing the depth-preferred replacement policy."""
+        table = TranspositionTable(16, "depth")
+        table.store(5, 3, 10, EXACT, None)
+        table.store(21, 1, 0, EXACT, None)
+        self.assertIsNotNone(
+            table.probe(5, 3), "A shallower entry should not replace a deeper one."
+        )
+        table = TranspositionTable(16, "always")
+        table.store(5, 3, 10, EXACT, None)
+        table.store(21, 1, 0, EXACT, None)
+        self.assertIsNone(
+            table.probe(5, 3), "The always policy should replace the old entry."
+        )
+
+    def test_unknown_replacement(self):
+        """Testing that an unknown replacement policy is refused."""
+        with self.assertRaises(ValueError):
+            TranspositionTable(16, "random")
+
+    def test_search_results_unchanged(self):
+        """Testing that a shared table does not change search results."""
+        rng = random.Random(7)
+        searcher = Searcher(TranspositionTable(1 << 12))
+        for _ in range(200):
+            cards = rng.sample(CARDS, 11)
+            comp, human = to_mask(cards[:5]), to_mask(cards[5:10])
+            top, active = top_index(cards[10]), rng.random() < 0.5
+            self.assertEqual(
+                searcher.minimax(comp, human, top, active, 5, True),
+                Searcher().minimax(comp, human, top, active, 5, True),
+            )
+        self.assertGreater(searcher.table.hits, 0, "The table should be used.")
@@ -0,0 +1,167 @@
+import random
+from bitcards import CARDS
+
+EXACT = 0
+LOWER = 1
+UPPER = 2
+
+# Fixed seed, so the same position hashes to the same key in every process.
+_rng = random.Random(0x50525349)
+COMP_KEYS = tuple(_rng.getrandbits(64) for _ in CARDS)
+HUMAN_KEYS = tuple(_rng.getrandbits(64) for _ in CARDS)
+# STATE_KEYS[top][is_active], the active flag only changes the key of "*7" and "*a" cards
+# because it has no effect on any other top card.
+ACTIVE_KEY = _rng.getrandbits(64)
+STATE_KEYS = tuple(
+    (key, key ^ ACTIVE_KEY if card[1] in ("7", "a") else key)
+    for card, key in zip(CARDS, [_rng.getrandbits(64) for _ in CARDS])
+)
+SIDE_KEY = _rng.getrandbits(64)
+# STACK_KEYS[stacking // 2], stacking is 0 unless a "*7" is active and at least 2 then,
+# so the first two share the zero key.
+STACK_KEYS = (0, 0) + tuple(_rng.getrandbits(64) for _ in range(3))
+PACK_KEYS = tuple(_rng.getrandbits(64) for _ in CARDS)
+
+
+def zobrist_key(
+    comp_hand: int,
+    human_hand: int,
+    top: int,
+    is_active: bool,
+    is_maximizing: bool,
+    stacking: int = 0,
+) -> int:
+    """
+    Computes the Zobrist key of a search position from scratch.
+
+    The search then updates the key incrementally with a few XORs per move.
+
+    Args:
+        comp_hand (int): Bitmask of computer player's cards.
+        human_hand (int): Bitmask of human player's cards.
+        top (int): Index of the top card.
+        is_active (bool): Was last card an active card? True if yes.
+        is_maximizing (bool): Who is currently playing. True if computer.
+        stacking (int, optional): Cards to take against an active "*7". Defaults to 0.
+
+    Returns:
+        int: 64-bit key of the position.
+    """
+    key = STATE_KEYS[top][is_active] ^ STACK_KEYS[stacking >> 1]
+    while comp_hand:
+        low = comp_hand & -comp_hand
+        key ^= COMP_KEYS[low.bit_length() - 1]
+        comp_hand ^= low
+    while human_hand:
+        low = human_hand & -human_hand
+        key ^= HUMAN_KEYS[low.bit_length() - 1]
+        human_hand ^= low
+    if is_maximizing:
+        key ^= SIDE_KEY
+    return key
+
+
+def pack_key(pack: int) -> int:
+    """
+    Computes the key of the card pack chance nodes of a root search draw from.
+
+    Args:
+        pack (int): Bitmask of the card pack.
+
+    Returns:
+        int: 64-bit key, XORed into the keys of every position of the search.
+    """
+    key = 0
+    while pack:
+        low = pack & -pack
+        key ^= PACK_KEYS[low.bit_length() - 1]
+        pack ^= low
+    return key
+
+
+class TranspositionTable:
+    """
+    Fixed size transposition table for the minimax search.
+
+    Entries are only reused at the same remaining depth, so the table never changes the
+    result of a search, it only makes it faster.
+
+    Attributes:
+        size (int): Maximum amount of stored entries.
+        replacement (str): "depth" keeps the deeper entry on a collision, "always" keeps the newest one.
+        entries (list[tuple | None]): Slots with (key, depth, score, flag, best_move) entries.
+        hits (int): Amount of successful probes.
+    """
+
+    def __init__(self, size: int = 1 << 16, replacement: str = "depth") -> None:
+        """
+        Initialize the TranspositionTable object with empty slots.
+
+        Args:
+            size (int, optional): Maximum amount of stored entries. Defaults to 1 << 16.
+            replacement (str, optional): Replacement policy, "depth" or "always". Defaults to "depth".
+        """
+        if replacement not in ("depth", "always"):
+            raise ValueError(f"Unknown replacement policy: {replacement}")
+        self.size = size
+        self.replacement = replacement
+        self.entries = [None] * size
+        self.hits = 0
+
+    def probe(self, key: int, depth: int) -> tuple | None:
+        """
+        Looks up a position.
+
+        Args:
+            key (int): Zobrist key of the position.
+            depth (int): Remaining depth of the search.
+
+        Returns:
+            (tuple | None): The (key, depth, score, flag, best_move) entry if stored for this depth else None.
+        """
+        entry = self.entries[key % self.size]
+        if entry is not None and entry[0] == key and entry[1] == depth:
+            self.hits += 1
+            return entry
+        return None
+
+    def probe_move(self, key: int):
+        """
+        Looks up the best move of a position searched to any depth, used for move ordering.
+
+        Args:
+            key (int): Zobrist key of the position.
+
+        Returns:
+            (tuple[int, int] | None): Best move if the position is stored else None.
+        """
+        entry = self.entries[key % self.size]
+        if entry is not None and entry[0] == key:
+            return entry[4]
+        return None
+
+    def store(self, key: int, depth: int, score: int, flag: int, best_move) -> None:
+        """
+        Stores a searched position according to the replacement policy.
+
+        Args:
+            key (int): Zobrist key of the position.
+            depth (int): Remaining depth of the search.
+            score (int): Score of the position.
+            flag (int): EXACT, LOWER or UPPER bound type of the score.
+            best_move (tuple[int, int] | None): Best move found in the position.
+        """
+        slot = key % self.size
+        entry = self.entries[slot]
+        if (
+            entry is None
+            or self.replacement == "always"
+            or entry[0] == key
+            or depth >= entry[1]
+        ):
+            self.entries[slot] = (key, depth, score, flag, best_move)
+
+    def clear(self) -> None:
+        """Removes all entries from the table."""
+        self.entries = [None] * self.size
+        self.hits = 0